@@ -8,7 +8,9 @@ for FastAPI to inject database sessions into route handlers.
 import os
 
 from loguru import logger
+from sqlalchemy import Connection
 from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.env import get_database_url
@@ -25,6 +27,21 @@ logger.info("Database Engine Running.")
 async def get_session():
     """
     Generator dependency that yields an asynchronous database session.
+
+    Objects are not expired on commit, so loaded rows can still be serialized
+    after the transaction ends without triggering implicit async IO.
     """
-    async with AsyncSession(engine) as session:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
+
+
+def create_missing_indexes(connection: Connection) -> None:
+    """
+    Creates any declared index that an existing database does not have yet.
+
+    `SQLModel.metadata.create_all` only emits indexes for tables it creates, so
+    databases created before an index was declared would otherwise never get it.
+    """
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
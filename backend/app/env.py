@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 import dotenv
 from loguru import logger
@@ -11,6 +12,10 @@ _SUPER_USER_EMAIL = os.getenv("SUPER_USER_EMAIL")
 _SUPER_USER_PASSWORD = os.getenv("SUPER_USER_PASSWORD")
 _JWT_SECRET = os.getenv("JWT_SECRET")
 _DATABASE_URL = os.getenv("DATABASE_URL")
+_HOLD_TTL_HOURS = float(os.getenv("HOLD_TTL_HOURS", "72"))
+_HOLD_SWEEP_INTERVAL_SECONDS = float(os.getenv("HOLD_SWEEP_INTERVAL_SECONDS", "300"))
+_IDEMPOTENCY_TTL_HOURS = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+_IDEMPOTENCY_LEASE_SECONDS = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", "60"))
 
 assert _SUPER_USER_NAME is not None
 assert _SUPER_USER_EMAIL is not None
@@ -39,3 +44,19 @@ def get_jwt_secret() -> str:
 
 def get_database_url() -> str:
     return _DATABASE_URL  # type: ignore
+
+
+def get_hold_ttl() -> timedelta:
+    return timedelta(hours=_HOLD_TTL_HOURS)
+
+
+def get_hold_sweep_interval() -> float:
+    return _HOLD_SWEEP_INTERVAL_SECONDS
+
+
+def get_idempotency_ttl() -> timedelta:
+    return timedelta(hours=_IDEMPOTENCY_TTL_HOURS)
+
+
+def get_idempotency_lease() -> timedelta:
+    return timedelta(seconds=_IDEMPOTENCY_LEASE_SECONDS)
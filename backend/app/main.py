@@ -11,15 +11,18 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette.responses import FileResponse
 
 import app.models  # noqa: F401 - ensures all models are registered with SQLModel metadata
-from app.database import engine
+from app.database import create_missing_indexes, engine
 from app.routes.auth import router as auth_router
 from app.routes.rooms import router as rooms_router
 from app.routes.bookings import router as bookings_router
 from app.routes.notifications import router as notifications_router
 from app.seed import seed_rooms_and_slots
+from app.services.day_summary import ensure_day_summary
+from app.services.hold_sweeper import start_hold_sweeper, stop_hold_sweeper
 from app.services.user_manager import register_superuser
 
 
@@ -27,9 +30,14 @@ from app.services.user_manager import register_superuser
 async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(create_missing_indexes)
+    async with AsyncSession(engine) as session:
+        await ensure_day_summary(session)
     await register_superuser()
     await seed_rooms_and_slots()
+    sweeper = start_hold_sweeper()
     yield
+    await stop_hold_sweeper(sweeper)
 
 
 app = FastAPI(lifespan=lifespan)
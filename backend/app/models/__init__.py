@@ -13,15 +13,21 @@ initialization.
 - `TimeSlot`: Represents a specific bookable time window for a room.
 - `Booking`: Represents a confirmed reservation.
 - `Notification`: Represents a system alert or message.
+- `IdempotencyKey`: Represents a stored response for a retried client request.
+- `DaySummary`: Represents the number of available time slots on one date.
 """
 
 from .booking import (
+    WEEKDAY_NAMES,
     Booking,
     BookingStatus,
     RecurrenceFrequency,
+    RecurrenceRule,
     TimeSlot,
     TimeslotStatus,
 )
+from .day_summary import DaySummary
+from .idempotency import IdempotencyKey
 from .notification import Notification, NotificationType
 from .room import Room
 from .user import User, UserRole
@@ -33,8 +39,12 @@ __all__ = [
     "TimeSlot",
     "TimeslotStatus",
     "RecurrenceFrequency",
+    "RecurrenceRule",
+    "WEEKDAY_NAMES",
     "BookingStatus",
     "Booking",
     "NotificationType",
     "Notification",
+    "IdempotencyKey",
+    "DaySummary",
 ]
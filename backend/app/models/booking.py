@@ -1,18 +1,21 @@
 """
 Booking Model - Issue 04
 Represents the user request to book one or more time slots in a room
-Pending -> Approved/Denied/Cancelled
-Supports WEEKLY recurring bookings
+Pending -> Approved/Denied/Cancelled, or Expired if never acted on
+Supports weekly, bi-weekly and monthly-by-weekday recurring bookings
 Traces to: UC-3, UC-4
 Domain Class: Booking
 """
 
-from datetime import date, datetime, time, timezone
+import calendar
+from datetime import MAXYEAR, date, datetime, time, timedelta, timezone
 from enum import Enum
-from typing import List, Optional
+from itertools import count
+from typing import Iterator, List, NamedTuple, Optional
 from uuid import UUID
 
 from pydantic import field_validator, model_validator
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 from .user import UserRole
@@ -27,6 +30,7 @@ class BookingStatus(str, Enum):
     APPROVED = "approved"
     DENIED = "denied"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
 
 
 class RecurrenceFrequency(str, Enum):
@@ -36,6 +40,78 @@ class RecurrenceFrequency(str, Enum):
 
     NONE = "none"
     WEEKLY = "weekly"
+    BIWEEKLY = "biweekly"
+    MONTHLY_BY_WEEKDAY = "monthly_by_weekday"
+    """The same weekday of the same week of each month, e.g. every 2nd Tuesday."""
+
+
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+"""Weekday names, indexed like `date.weekday()`."""
+
+
+class RecurrenceRule(NamedTuple):
+    """
+    An RRULE-style description of when a recurring booking repeats.
+    """
+
+    frequency: RecurrenceFrequency
+    """How often the booking repeats."""
+    until: Optional[date] = None
+    """The last date an occurrence may fall on."""
+    weekdays: frozenset[int] = frozenset()
+    """Weekdays (`date.weekday()` numbers) a weekly or bi-weekly rule repeats on.
+    Empty means the anchor's own weekday."""
+    exclusions: frozenset[date] = frozenset()
+    """Dates that are skipped, e.g. a reading week."""
+
+    def occurrences(self, anchor: date) -> Iterator[date]:
+        """
+        Lazily yields every date the rule produces from `anchor`, in order.
+
+        The anchor itself is always the first occurrence; later occurrences stop
+        after `until` and skip `exclusions`.
+        """
+        yield anchor
+        if self.frequency == RecurrenceFrequency.NONE or self.until is None:
+            return
+        for occurrence in self._following(anchor):
+            if occurrence > self.until:
+                return
+            if occurrence not in self.exclusions:
+                yield occurrence
+
+    def _following(self, anchor: date) -> Iterator[date]:
+        if self.frequency == RecurrenceFrequency.MONTHLY_BY_WEEKDAY:
+            yield from _monthly_by_weekday(anchor)
+            return
+
+        step = 2 if self.frequency == RecurrenceFrequency.BIWEEKLY else 1
+        weekdays = sorted(self.weekdays or {anchor.weekday()})
+        week_start = anchor - timedelta(days=anchor.weekday())
+        for week in count(0, step):
+            start = week_start + timedelta(weeks=week)
+            for weekday in weekdays:
+                occurrence = start + timedelta(days=weekday)
+                if occurrence > anchor:
+                    yield occurrence
+
+
+def _monthly_by_weekday(anchor: date) -> Iterator[date]:
+    """
+    Yields the anchor's weekday in the anchor's week of each following month.
+
+    Months without that week (e.g. no 5th Friday) are skipped.
+    """
+    week = (anchor.day - 1) // 7
+    year, month = anchor.year, anchor.month
+    while True:
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        if year > MAXYEAR:
+            return
+        first_weekday, days = calendar.monthrange(year, month)
+        day = 1 + (anchor.weekday() - first_weekday) % 7 + 7 * week
+        if day <= days:
+            yield date(year, month, day)
 
 
 class Booking(SQLModel, table=True):
@@ -43,6 +119,11 @@ class Booking(SQLModel, table=True):
     Represents the room booking request made by a given user.
     """
 
+    __table_args__ = (
+        Index("ix_booking_user_created", "userID", "createdAt", "id"),
+        Index("ix_booking_status_created", "status", "createdAt", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     userID: UUID = Field(foreign_key="user.id", nullable=False)
     submittedByRole: UserRole = Field(default=UserRole.STUDENT, nullable=False)
@@ -102,14 +183,15 @@ class Booking(SQLModel, table=True):
     @model_validator(mode="after")
     def validate_recurrence_end_date(self) -> "Booking":
         """
-        Weekly bookings must supply a recurrenceEndDate.
+        Recurring bookings must supply a recurrenceEndDate.
         """
         if (
-            self.recurrenceFrequency == RecurrenceFrequency.WEEKLY
+            self.recurrenceFrequency != RecurrenceFrequency.NONE
             and self.recurrenceEndDate is None
         ):
             raise ValueError(
-                "recurrenceEndDate must not be None when recurrenceFrequency is 'weekly'."
+                "recurrenceEndDate must not be None when recurrenceFrequency is "
+                f"'{self.recurrenceFrequency.value}'."
             )
         return self
 
@@ -132,6 +214,18 @@ class TimeSlot(SQLModel, table=True):
     Represents any room request or timeslot unit in the system.
     """
 
+    __table_args__ = (
+        Index(
+            "ix_timeslot_room_date_time",
+            "room_id",
+            "slot_date",
+            "start_time",
+            "end_time",
+        ),
+        Index("ix_timeslot_date_status", "slot_date", "status"),
+        Index("ix_timeslot_booking", "booking_id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     """The primary key for the timeslot."""
     room_id: int = Field(foreign_key="room.id", nullable=False)
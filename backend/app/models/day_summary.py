@@ -0,0 +1,23 @@
+"""
+Day Summary Model.
+Stores how many time slots are still available on each date, so the booking
+calendar reads one small row per day instead of scanning `TimeSlot`.
+Rows are maintained by `app.services.day_summary`; dates with no available
+slot have no row.
+Domain Class: DaySummary
+"""
+
+from datetime import date
+
+from sqlmodel import Field, SQLModel
+
+
+class DaySummary(SQLModel, table=True):
+    """
+    Represents the number of available time slots, across all rooms, on one date.
+    """
+
+    slot_date: date = Field(primary_key=True)
+    """The date being summarized."""
+    available_count: int = Field(nullable=False)
+    """How many slots on `slot_date` are currently available."""
@@ -0,0 +1,29 @@
+"""
+Idempotency Key Model.
+Remembers the first response to a client request that carried an
+`Idempotency-Key` header, so retries of the same request are answered from
+this table instead of re-running the workflow. Rows expire after a TTL.
+Domain Class: IdempotencyKey
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class IdempotencyKey(SQLModel, table=True):
+    """
+    Represents one client-supplied idempotency key and the response it produced.
+    """
+
+    __table_args__ = (Index("ix_idempotencykey_created", "createdAt"),)
+
+    userID: UUID = Field(foreign_key="user.id", primary_key=True)
+    key: str = Field(primary_key=True, max_length=255)
+    requestHash: str = Field(nullable=False)
+    statusCode: Optional[int] = Field(default=None)
+    responseBody: Optional[str] = Field(default=None)
+    createdAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
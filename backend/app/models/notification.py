@@ -1,7 +1,7 @@
 """
 Notifications Model - Issue 05
 In-app message delivered to a user when their booking request is either
-approved, denied, or cancelled. Notifications are stored and can be retrieved
+approved, denied, cancelled, or expired. Notifications are stored and can be retrieved
 via API. Email delivery is a future possible feature.
 Traces to: UC-4, UC-6
 Domain Class: Notification
@@ -13,6 +13,7 @@ from typing import Optional
 from uuid import UUID
 
 from pydantic import field_validator
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -24,6 +25,7 @@ class NotificationType(str, enum.Enum):
     APPROVED = "approved"
     DENIED = "denied"
     CANCELLED = "cancelled"
+    EXPIRED = "expired"
 
 
 class Notification(SQLModel, table=True):
@@ -31,6 +33,11 @@ class Notification(SQLModel, table=True):
     Represents an in-app notification sent to a user about their booking.
     """
 
+    __table_args__ = (
+        Index("ix_notification_user_read_created", "userID", "isRead", "createdAt"),
+        Index("ix_notification_user_id", "userID", "id"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     userID: UUID = Field(foreign_key="user.id", nullable=False)
     bookingID: int = Field(foreign_key="booking.id", nullable=False)
@@ -7,31 +7,91 @@ and administering booking lifecycle transitions.
 
 from __future__ import annotations
 
-from datetime import date, datetime, time
-from typing import Literal, cast
+import asyncio
+import csv
+import io
+import json
+from collections import Counter
+from datetime import date, datetime, time, timedelta, timezone
+from enum import Enum
+from typing import Any, AsyncIterator, Literal, Sequence
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
-from pydantic import BaseModel, ConfigDict
-from sqlmodel import Session
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
-from app.models import Booking, BookingStatus, RecurrenceFrequency, User
+from app.env import get_idempotency_lease, get_idempotency_ttl
+from app.models import Booking, BookingStatus, Room, User
+from app.schemas.room import RoomBasicRead
 from app.services.auth import current_active_user, require_admin
-from app.services.booking_service import (
+from app.services.async_booking_service import (
+    get_all_bookings_page,
+    get_booking,
+    get_user_bookings_page,
+    process_booking_action,
+    process_booking_actions,
+    stream_booking_export,
+    submit_booking,
+)
+from app.services.availability_versions import etag_matches
+from app.services.booking_workflow import (
+    EXPORT_FIELDS,
+    BookingActionOutcome,
     BookingConflictError,
     BookingNotFoundError,
     BookingServiceError,
     BookingStateError,
-    get_all_bookings,
-    get_user_bookings,
-    process_booking_action,
-    submit_booking,
+    booking_etag,
+)
+from app.services.idempotency_service import (
+    MAX_KEY_LENGTH,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    StoredResponse,
+    claim_key,
+    complete_key,
+    release_key,
+    request_fingerprint,
 )
 
 router = APIRouter(prefix="/api/bookings", tags=["bookings"])
 
+MAX_PAGE_SIZE = 100
+"""Largest `limit` accepted by the booking listing."""
+
+DEFAULT_ADMIN_PAGE_SIZE = 50
+"""Page size of the all-users listing when no `limit` is given."""
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+"""Response header carrying the cursor of the next listing page."""
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+"""Request header that makes booking submission safe to retry."""
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+"""Response header set when a stored idempotent response is replayed."""
+
+MAX_BATCH_ACTIONS = 500
+"""Most items accepted by one `POST /api/bookings/actions` request."""
+
+MAX_RECURRENCE_EXCLUSIONS = 366
+"""Most exclusion dates accepted with one recurring booking."""
+
+_REVALIDATE = "private, no-cache"
+"""Lets clients keep a booking but forces them to revalidate via ETag."""
+
 
 class TimeSlotRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -57,27 +117,72 @@ class BookingRead(BaseModel):
     recurrenceEndDate: date | None
     createdAt: datetime
     timeSlots: list[TimeSlotRead]
+    room: RoomBasicRead | None = None
 
 
 class BookingCreate(BaseModel):
     room_id: int
     date: date
     slot_ids: list[int]
-    recurrence_freq: Literal["none", "weekly"] = "none"
+    recurrence_freq: Literal["none", "weekly", "biweekly", "monthly_by_weekday"] = (
+        "none"
+    )
     recurrence_end_date: date | None = None
+    recurrence_weekdays: list[
+        Literal["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+    ] = Field(default_factory=list, max_length=7)
+    recurrence_exclusions: list[date] = Field(
+        default_factory=list, max_length=MAX_RECURRENCE_EXCLUSIONS
+    )
 
 
 class BookingActionUpdate(BaseModel):
     action: Literal["approve", "deny", "cancel"]
 
 
-def _to_read(booking: Booking) -> BookingRead:
-    """Convert an ORM Booking to a Pydantic model inside the sync context."""
-    return BookingRead.model_validate(booking)
+class BookingActionItem(BaseModel):
+    booking_id: int
+    action: Literal["approve", "deny", "cancel"]
+
+
+class BookingActionResult(BaseModel):
+    booking_id: int
+    action: str
+    status_code: int
+    detail: str | None = None
+    booking: BookingRead | None = None
 
 
-def _to_read_list(bookings: list[Booking]) -> list[BookingRead]:
-    return [_to_read(b) for b in bookings]
+def _to_read(booking: Booking, room: Room | None = None) -> BookingRead:
+    """Convert an ORM Booking to a Pydantic model while its slots are loaded."""
+    read = BookingRead.model_validate(booking)
+    if room is not None:
+        read.room = RoomBasicRead.model_validate(room)
+    return read
+
+
+def _to_read_list(
+    bookings: list[Booking], rooms: dict[int, Room] | None = None
+) -> list[BookingRead]:
+    rooms = rooms or {}
+    return [_to_read(b, rooms.get(b.roomID)) for b in bookings]
+
+
+def _to_action_result(outcome: BookingActionOutcome) -> BookingActionResult:
+    if outcome.error is not None:
+        error = _translate_booking_error(outcome.error)
+        return BookingActionResult(
+            booking_id=outcome.booking_id,
+            action=outcome.action,
+            status_code=error.status_code,
+            detail=error.detail,
+        )
+    return BookingActionResult(
+        booking_id=outcome.booking_id,
+        action=outcome.action,
+        status_code=status.HTTP_200_OK,
+        booking=_to_read(outcome.booking),  # type: ignore[arg-type]
+    )
 
 
 def _translate_booking_error(exc: Exception) -> HTTPException:
@@ -90,57 +195,306 @@ def _translate_booking_error(exc: Exception) -> HTTPException:
     raise exc
 
 
-@router.post("", response_model=BookingRead, status_code=status.HTTP_201_CREATED)
+async def _submit(
+    booking_in: BookingCreate, user: User, session: AsyncSession
+) -> BookingRead:
+    try:
+        return _to_read(
+            await submit_booking(
+                user=user,
+                room_id=booking_in.room_id,
+                slot_ids=booking_in.slot_ids,
+                recurrence_freq=booking_in.recurrence_freq,
+                recurrence_end_date=booking_in.recurrence_end_date,
+                session=session,
+                recurrence_weekdays=booking_in.recurrence_weekdays,
+                recurrence_exclusions=booking_in.recurrence_exclusions,
+            )
+        )
+    except Exception as exc:
+        raise _translate_booking_error(exc) from exc
+
+
+@router.post(
+    "",
+    response_model=BookingRead,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_409_CONFLICT: {
+            "description": "Slot unavailable, or the original request for the "
+            "Idempotency-Key is still in progress."
+        },
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {
+            "description": "Idempotency-Key reused with a different request body."
+        },
+    },
+)
 async def create_booking(
     booking_in: BookingCreate,
-    response: Response,
+    idempotency_key: str | None = Header(
+        default=None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        min_length=1,
+        max_length=MAX_KEY_LENGTH,
+    ),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
+    """
+    Submit a booking request.
+
+    Clients that may retry should send an ``Idempotency-Key`` header. The first
+    response for a key is stored and replayed verbatim for retries with the
+    same body, marked with ``Idempotent-Replayed: true``, without submitting
+    the booking again. While the original request is running, retries get
+    ``409``; a claim left behind by a request that never finished is taken
+    over by a retry once its short lease has run out.
+    """
+    if idempotency_key is None:
+        return await _submit(booking_in, user, session)
+
+    fingerprint = request_fingerprint(booking_in.model_dump(mode="json"))
+    claimed_at = datetime.now(timezone.utc)
     try:
-        booking = await session.run_sync(
-            lambda sync_session: _to_read(
-                submit_booking(
-                    user=user,
-                    room_id=booking_in.room_id,
-                    slot_ids=booking_in.slot_ids,
-                    recurrence_freq=booking_in.recurrence_freq,
-                    recurrence_end_date=booking_in.recurrence_end_date,
-                    session=cast(Session, sync_session),
-                )
-            )
+        replay = await claim_key(
+            user.id,
+            idempotency_key,
+            fingerprint,
+            get_idempotency_ttl(),
+            session,
+            get_idempotency_lease(),
+            claimed_at,
         )
-    except Exception as exc:
-        raise _translate_booking_error(exc) from exc
+    except IdempotencyKeyReusedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc)
+        ) from exc
+    except IdempotencyInProgressError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(exc)
+        ) from exc
+    if replay is not None:
+        return Response(
+            content=replay.body,
+            status_code=replay.status_code,
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"},
+        )
+
+    try:
+        booking = await _submit(booking_in, user, session)
+    except HTTPException as exc:
+        stored = StoredResponse(exc.status_code, json.dumps({"detail": exc.detail}))
+        await complete_key(user.id, idempotency_key, stored, session)
+        raise
+    except BaseException:
+        # Also runs when the request is cancelled, e.g. by a client disconnect;
+        # the shield lets the release finish even if the task is cancelled again.
+        await asyncio.shield(
+            release_key(user.id, idempotency_key, fingerprint, claimed_at, session)
+        )
+        raise
 
-    response.status_code = status.HTTP_201_CREATED
+    stored = StoredResponse(status.HTTP_201_CREATED, booking.model_dump_json())
+    await complete_key(user.id, idempotency_key, stored, session)
     return booking
 
 
 @router.get("", response_model=list[BookingRead])
 async def list_bookings(
+    response: Response,
     status_filter: str | None = Query(default=None, alias="status"),
+    limit: int | None = Query(default=None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None),
+    include: Literal["room"] | None = Query(default=None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
+    """
+    Lists bookings newest first, optionally one keyset page at a time.
+
+    When more bookings remain after a page, the cursor for the next page is
+    returned in the `X-Next-Cursor` response header; pass it back as `cursor`
+    to continue. The body stays a plain list so existing clients keep working
+    unchanged. The admin listing of all users' bookings (a `status` filter
+    from an admin) is always paginated, `DEFAULT_ADMIN_PAGE_SIZE` bookings at
+    a time unless `limit` says otherwise; a user's own bookings are only
+    paginated when `limit` is given.
+
+    With `include=room`, each booking embeds its room's `id`, `name` and
+    `capacity`, joined into the listing query, so no per-room fetch is needed.
+    """
+    include_room = include == "room"
     try:
         # Admins see all bookings ONLY when explicitly filtering by status
         # (e.g., for the admin review queue). Otherwise they see their own.
         if user.role == "admin" and status_filter is not None:
-            return await session.run_sync(
-                lambda sync_session: _to_read_list(
-                    get_all_bookings(cast(Session, sync_session), status_filter)
-                )
+            page = await get_all_bookings_page(
+                session,
+                status_filter,
+                limit or DEFAULT_ADMIN_PAGE_SIZE,
+                cursor,
+                include_room,
             )
-
-        # For everyone else (or admin with no status filter), only show personal bookings
-        return await session.run_sync(
-            lambda sync_session: _to_read_list(
-                get_user_bookings(user.id, cast(Session, sync_session), status_filter)
+        else:
+            # For everyone else (or admin with no status filter), only show personal bookings
+            page = await get_user_bookings_page(
+                user.id, session, status_filter, limit, cursor, include_room
             )
+    except Exception as exc:
+        raise _translate_booking_error(exc) from exc
+
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return _to_read_list(page.items, page.rooms)
+
+
+def _export_value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+async def _ndjson_lines(chunks: AsyncIterator[Sequence]) -> AsyncIterator[str]:
+    async for rows in chunks:
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row)))) + "\n"
+            for row in rows
+        )
+
+
+async def _csv_lines(chunks: AsyncIterator[Sequence]) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+_EXPORT_FORMATS = {
+    "ndjson": (_ndjson_lines, "application/x-ndjson"),
+    "csv": (_csv_lines, "text/csv"),
+}
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_bookings(
+    export_format: Literal["ndjson", "csv"] = Query(default="ndjson", alias="format"),
+    status_filter: str | None = Query(default=None, alias="status"),
+    date_from: date | None = Query(default=None, alias="from"),
+    date_to: date | None = Query(default=None, alias="to"),
+    admin_user: User = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Streams every booking created between `from` and `to` (inclusive, UTC dates)
+    as NDJSON or CSV, one row per booking slot.
+
+    Rows are read from a server-side cursor in fixed-size chunks and written
+    out as they arrive, so memory use does not grow with the size of the export.
+    """
+    del admin_user
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'.",
+        )
+    try:
+        booking_status = BookingStatus(status_filter) if status_filter else None
+    except ValueError as exc:
+        raise _translate_booking_error(exc) from exc
+
+    created_from = created_before = None
+    if date_from is not None:
+        created_from = datetime.combine(date_from, time(), timezone.utc)
+    if date_to is not None:
+        created_before = datetime.combine(
+            date_to + timedelta(days=1), time(), timezone.utc
+        )
+
+    encode, media_type = _EXPORT_FORMATS[export_format]
+    chunks = stream_booking_export(
+        session, booking_status, created_from, created_before
+    )
+    return StreamingResponse(
+        encode(chunks),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="bookings.{export_format}"'
+        },
+    )
+
+
+@router.post("/actions", response_model=list[BookingActionResult])
+async def update_bookings(
+    items: list[BookingActionItem] = Body(max_length=MAX_BATCH_ACTIONS),
+    admin_user: User = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Applies many approve/deny/cancel actions in a single transaction.
+
+    Each item gets its own result with the HTTP status it would have received
+    from `PATCH /api/bookings/{booking_id}`; failed items do not affect the
+    rest of the batch. A request may hold at most `MAX_BATCH_ACTIONS` items,
+    each for a different booking.
+    """
+    del admin_user
+    counts = Counter(item.booking_id for item in items)
+    duplicates = sorted(booking_id for booking_id, n in counts.items() if n > 1)
+    if duplicates:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Each booking may appear only once; repeated: "
+            + ", ".join(str(booking_id) for booking_id in duplicates),
+        )
+    try:
+        outcomes = await process_booking_actions(
+            [(item.booking_id, item.action) for item in items], session
         )
     except Exception as exc:
         raise _translate_booking_error(exc) from exc
+    return [_to_action_result(outcome) for outcome in outcomes]
+
+
+@router.get(
+    "/{booking_id}",
+    response_model=BookingRead,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "Booking unchanged."}},
+)
+async def read_booking(
+    booking_id: int,
+    response: Response,
+    if_none_match: str | None = Header(None),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Return one booking owned by the current user, or any booking for admins.
+
+    Bookings of other users are reported as not found. The response carries
+    an `ETag` of the booking's state; sending it back in `If-None-Match`
+    yields `304 Not Modified` while the booking is unchanged.
+    """
+    try:
+        booking = await get_booking(booking_id, user, session)
+    except Exception as exc:
+        raise _translate_booking_error(exc) from exc
+
+    etag = booking_etag(booking)
+    headers = {"ETag": etag, "Cache-Control": _REVALIDATE}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return _to_read(booking)
 
 
 @router.patch("/{booking_id}", response_model=BookingRead)
@@ -152,11 +506,8 @@ async def update_booking(
 ):
     del admin_user
     try:
-        action = booking_update.action
-        booking = await session.run_sync(
-            lambda sync_session, _bid=booking_id, _action=action: _to_read(
-                process_booking_action(_bid, _action, cast(Session, sync_session))
-            )
+        booking = _to_read(
+            await process_booking_action(booking_id, booking_update.action, session)
         )
     except Exception as exc:
         raise _translate_booking_error(exc) from exc
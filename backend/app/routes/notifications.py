@@ -2,16 +2,18 @@
 Notification routing module.
 
 Provides authenticated endpoints for retrieving notifications, checking the
-unread badge count, and marking a notification as read.
+unread badge count, marking a notification as read, and streaming new
+notifications as server-sent events.
 """
 
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import cast
+from typing import AsyncIterator, cast
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ConfigDict
 from sqlmodel import Session
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -19,16 +21,40 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.database import get_session
 from app.models import Notification, User
 from app.services.auth import current_active_user
+from app.services.notification_hub import (
+    NotificationMessage,
+    notification_hub,
+    stream_notifications,
+)
 from app.services.notification_service import (
     NotificationNotFoundError,
-    get_notification_for_user,
     get_notifications,
+    get_notifications_after,
     get_unread_count,
-    mark_read,
+    mark_read_for_user,
+    peek_unread_count,
 )
 
 router = APIRouter(prefix="/api/notifications", tags=["notifications"])
 
+HEARTBEAT_SECONDS = 15.0
+"""Idle time after which a stream sends a keep-alive comment."""
+
+STREAM_LIFETIME_SECONDS = 300.0
+"""How long a stream stays open before the client must reconnect."""
+
+RECONNECT_MILLISECONDS = 3000
+"""Reconnection delay advertised to clients in the stream's `retry` field."""
+
+REPLAY_BATCH = 100
+"""Notifications loaded per query when a stream catches up."""
+
+MAX_FEED_SIZE = 100
+"""Largest `limit` accepted by the notification listing."""
+
+MAX_WAIT_SECONDS = 30.0
+"""Longest a listing with `after_id` may wait for a new notification."""
+
 
 class NotificationRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -56,14 +82,49 @@ def _to_notif_list(notifications: list[Notification]) -> list[NotificationRead]:
 
 @router.get("", response_model=list[NotificationRead])
 async def list_notifications(
+    after_id: int | None = Query(default=None, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=MAX_FEED_SIZE),
+    wait: float = Query(default=0, ge=0, le=MAX_WAIT_SECONDS),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
-    return await session.run_sync(
-        lambda sync_session: _to_notif_list(
-            get_notifications(user.id, cast(Session, sync_session))
+    """
+    Returns the user's notifications, newest first.
+
+    With `after_id`, returns only the notifications created after that id,
+    oldest first, so a client passes the largest id it has seen to receive
+    just the new ones. With `wait`, an empty result is held for up to that
+    many seconds and returned as soon as a new notification is committed.
+    """
+    user_id = user.id
+    if after_id is None:
+        return await session.run_sync(
+            lambda sync_session: _to_notif_list(
+                get_notifications(user_id, cast(Session, sync_session), limit)
+            )
         )
-    )
+
+    async def feed() -> list[NotificationRead]:
+        return await session.run_sync(
+            lambda sync_session: _to_notif_list(
+                get_notifications_after(
+                    user_id, after_id, cast(Session, sync_session), limit
+                )
+            )
+        )
+
+    if not wait:
+        return await feed()
+    # Subscribe before reading, so a notification committed in between wakes us.
+    with notification_hub.subscribe(user_id) as subscription:
+        items = await feed()
+        if items:
+            return items
+        # Waiting requests must not hold a database connection.
+        await session.commit()
+        if await subscription.next(wait) is None:
+            return []
+    return await feed()
 
 
 @router.get("/unread-count", response_model=UnreadCountRead)
@@ -71,20 +132,24 @@ async def unread_count(
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
-    count = await session.run_sync(
-        lambda sync_session: get_unread_count(user.id, cast(Session, sync_session))
-    )
+    count = peek_unread_count(user.id)
+    if count is None:
+        count = await session.run_sync(
+            lambda sync_session: get_unread_count(user.id, cast(Session, sync_session))
+        )
     return UnreadCountRead(count=count)
 
 
-@router.get("/recent", response_model=list[NotificationRead])
+@router.get("/recent", response_model=list[NotificationRead], deprecated=True)
 async def recent_notifications(
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
     """
     Returns unread notifications created in the last 60 seconds.
-    Used for real-time toast notifications.
+
+    Deprecated: repeated polls return the same notifications again. Use
+    `GET /api/notifications?after_id=` or the event stream instead.
     """
     one_minute_ago = datetime.utcnow() - timedelta(seconds=60)
 
@@ -101,21 +166,83 @@ async def recent_notifications(
     return await session.run_sync(_get_recent)
 
 
+def _sse_event(message: NotificationMessage | None) -> str:
+    if message is None:
+        return ": keep-alive\n\n"
+    data = NotificationRead.model_validate(message).model_dump_json()
+    return f"id: {message.id}\nevent: notification\ndata: {data}\n\n"
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream(
+    after_id: int | None = Query(default=None, ge=0),
+    last_event_id: int | None = Header(default=None, ge=0),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Streams the user's new notifications as server-sent events.
+
+    Each event carries the notification's id, so a client that reconnects
+    with `Last-Event-ID` (or `after_id`) first receives everything it missed.
+    Idle streams send a keep-alive comment every `HEARTBEAT_SECONDS`, and
+    every stream closes after `STREAM_LIFETIME_SECONDS` so the client
+    reconnects and is authenticated again.
+    """
+    user_id = user.id
+    # Idle streams must not hold the connection the authentication opened.
+    await session.commit()
+
+    async def replay(after: int) -> list[NotificationMessage]:
+        messages: list[NotificationMessage] = []
+        while True:
+            batch = await session.run_sync(
+                lambda sync_session: [
+                    NotificationMessage.of(notification)
+                    for notification in get_notifications_after(
+                        user_id, after, cast(Session, sync_session), REPLAY_BATCH
+                    )
+                ]
+            )
+            await session.commit()
+            messages.extend(batch)
+            if len(batch) < REPLAY_BATCH:
+                return messages
+            after = batch[-1].id
+
+    async def events() -> AsyncIterator[str]:
+        yield f"retry: {RECONNECT_MILLISECONDS}\n\n"
+        async for message in stream_notifications(
+            user_id,
+            last_event_id if last_event_id is not None else after_id,
+            replay,
+            HEARTBEAT_SECONDS,
+            STREAM_LIFETIME_SECONDS,
+        ):
+            yield _sse_event(message)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{notification_id}/read", response_model=NotificationRead)
 async def read_notification(
     notification_id: int,
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
+    """
+    Marks one of the user's notifications as read with a single conditional
+    update; notifications of other users are reported as not found.
+    """
+    user_id = user.id
     try:
-        await session.run_sync(
-            lambda sync_session: get_notification_for_user(
-                notification_id, user.id, cast(Session, sync_session)
-            )
-        )
-        return await session.run_sync(
-            lambda sync_session: _to_notif(
-                mark_read(notification_id, cast(Session, sync_session))
+        notification = await session.run_sync(
+            lambda sync_session: mark_read_for_user(
+                notification_id, user_id, cast(Session, sync_session)
             )
         )
     except NotificationNotFoundError as exc:
@@ -123,3 +250,4 @@ async def read_notification(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(exc),
         ) from exc
+    return NotificationRead.model_validate(notification)
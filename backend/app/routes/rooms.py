@@ -1,39 +1,100 @@
 """
 Rooms Routing Module.
 
-Provides the two room-browsing endpoints used by the portal page:
-  - GET /api/rooms?date={date}  — list all rooms with slot availability
-  - GET /api/rooms/{id}         — fetch a single room by primary key
+Provides the room-browsing endpoints used by the portal page:
+  - GET /api/rooms?date={date}            — list all rooms with slot availability
+  - GET /api/rooms/availability?from=&to= — compact multi-day availability matrix
+  - GET /api/rooms/search?duration=&from=&to= — rooms with enough contiguous free time
+  - GET /api/rooms/{id}                   — fetch a single room by primary key
+  - POST /api/rooms/lookup                — fetch many rooms by primary key at once
 
-Both endpoints require a valid authenticated user (401 if missing).
+These endpoints require a valid authenticated user (401 if missing).
+The listing and ``/dates`` carry a strong ``ETag``; a matching
+``If-None-Match`` is answered with 304 before any query runs.
+
+Admins can also inspect the in-memory availability state:
+  - POST /api/rooms/availability-index/verify — check the index against the database
+  - GET  /api/rooms/cache/stats               — room listing cache counters
+  - GET  /api/rooms/coalescing/stats          — coalesced concurrent read counters
 Business logic is fully delegated to the room_service layer.
 
 Traces to: UC-2
 """
 
-from datetime import date
+from datetime import date, time
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from pydantic import BaseModel, Field
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.models.user import User
-from app.schemas.room import RoomBasicRead, RoomRead
-from app.services.auth import current_active_user
+from app.schemas.room import (
+    AvailabilityIndexReport,
+    AvailabilityMatrixRead,
+    CoalescingStatsRead,
+    RoomBasicRead,
+    RoomCacheStatsRead,
+    RoomRead,
+    RoomSearchResult,
+)
+from app.services.auth import current_active_user, require_admin
+from app.services.availability_versions import etag_matches
 from app.services.room_service import (
+    InvalidDateRangeError,
     RoomNotFoundError,
     get_available_dates,
+    get_available_dates_etag,
+    get_coalescing_stats,
+    get_availability_matrix,
     get_room,
-    get_rooms_with_availability,
+    get_room_cache_stats,
+    get_rooms_by_ids,
+    get_rooms_etag,
+    get_rooms_with_availability_json,
+    search_rooms,
+    verify_availability_index,
 )
 
 router = APIRouter(prefix="/api/rooms", tags=["rooms"])
 
+MAX_SEARCH_RESULTS = 100
+"""Largest ``limit`` accepted by ``GET /api/rooms/search``."""
+
+MAX_LOOKUP_IDS = 500
+"""Most room ids accepted by one ``POST /api/rooms/lookup``."""
+
+
+class RoomLookup(BaseModel):
+    ids: list[int] = Field(max_length=MAX_LOOKUP_IDS)
+
+
+_REVALIDATE = "private, no-cache"
+"""Lets clients keep responses but forces them to revalidate via ETag."""
+
+
+def _not_modified(if_none_match: str | None, etag: str) -> Response | None:
+    if not etag_matches(if_none_match, etag):
+        return None
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": _REVALIDATE},
+    )
+
 
 @router.get("", response_model=List[RoomRead])
 async def list_rooms(
     target_date: date = Query(..., alias="date"),
+    if_none_match: str | None = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -45,15 +106,31 @@ async def list_rooms(
     ``start_time``, ``end_time``, and ``status``).  Rooms that have no slots
     on the given date are still returned but with an empty ``time_slots`` list.
 
+    Responses are served from a per-date cache that is invalidated whenever
+    a slot on that date changes. The ``ETag`` changes with the same events,
+    so a request whose ``If-None-Match`` still matches gets 304 without
+    touching the cache or the database.
+
     Requires a valid authenticated user — unauthenticated requests receive 401.
     """
-    return await get_rooms_with_availability(target_date, session)
+    # Taken before the query: a change racing it only makes the tag stale.
+    etag = get_rooms_etag(target_date)
+    if (not_modified := _not_modified(if_none_match, etag)) is not None:
+        return not_modified
+    payload = await get_rooms_with_availability_json(target_date, session)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": _REVALIDATE},
+    )
 
 
 @router.get("/dates", response_model=List[date])
 async def list_available_dates(
+    response: Response,
     year: int = Query(...),
     month: int = Query(..., ge=1, le=12),
+    if_none_match: str | None = Header(None),
     user: User = Depends(current_active_user),
     session: AsyncSession = Depends(get_session),
 ):
@@ -61,11 +138,151 @@ async def list_available_dates(
     Return a list of dates in the given year/month that have at least one
     available time slot across any room.
 
+    Carries a per-month ``ETag``; a matching ``If-None-Match`` gets 304.
     Requires a valid authenticated user — unauthenticated requests receive 401.
     """
+    etag = get_available_dates_etag(year, month)
+    if (not_modified := _not_modified(if_none_match, etag)) is not None:
+        return not_modified
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = _REVALIDATE
     return await get_available_dates(year, month, session)
 
 
+@router.get("/availability", response_model=AvailabilityMatrixRead)
+async def availability_matrix(
+    first: date = Query(..., alias="from"),
+    last: date = Query(..., alias="to"),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Return the availability of every room for each date from ``from`` to
+    ``to`` inclusive, in one response built from a single range query.
+
+    ``slot_times`` lists each distinct ``[start, end]`` pair in the range.
+    Every room carries one string per date, with one character per slot
+    time: ``a`` available, ``h`` held, ``b`` booked, ``-`` no such slot.
+    Slot ids are not included; booking still uses ``GET /api/rooms?date=``.
+
+    Raises 400 if ``to`` precedes ``from`` or the range is longer than
+    ``MAX_MATRIX_DAYS``.
+    Requires a valid authenticated user — unauthenticated requests receive 401.
+    """
+    try:
+        return await get_availability_matrix(first, last, session)
+    except InvalidDateRangeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+
+@router.get("/search", response_model=List[RoomSearchResult])
+async def search_free_rooms(
+    duration: int = Query(..., ge=1, le=24 * 60),
+    first: date = Query(..., alias="from"),
+    last: date = Query(..., alias="to"),
+    capacity_min: int = Query(1, ge=1),
+    start_after: time | None = Query(None),
+    end_before: time | None = Query(None),
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Find rooms seating at least ``capacity_min`` people with ``duration``
+    minutes of back-to-back available slots on any date from ``from`` to
+    ``to``, optionally starting no earlier than ``start_after`` and ending no
+    later than ``end_before``.
+
+    Returns each room's earliest fit per date, ranked by date then start time,
+    with the ``slot_ids`` to submit as a booking. Answered from the in-memory
+    availability index.
+
+    Raises 400 if the date range is reversed or too long, or the time window
+    is empty.
+    Requires a valid authenticated user — unauthenticated requests receive 401.
+    """
+    try:
+        return await search_rooms(
+            first,
+            last,
+            capacity_min,
+            duration,
+            start_after,
+            end_before,
+            limit,
+            session,
+        )
+    except InvalidDateRangeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)
+        ) from exc
+
+
+@router.post("/lookup", response_model=List[RoomBasicRead])
+async def lookup_rooms(
+    lookup: RoomLookup,
+    user: User = Depends(current_active_user),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Return the id, name and capacity of each requested room in one call,
+    in request order. Ids that match no room are left out.
+
+    Used by the booking details page to resolve the room name, instead of
+    ``GET /api/rooms/{id}``, which queries the database on every call.
+    Served from an in-memory room cache that is refreshed when a room changes.
+    Requires a valid authenticated user — unauthenticated requests receive 401.
+    """
+    return await get_rooms_by_ids(lookup.ids, session)
+
+
+@router.post("/availability-index/verify", response_model=AvailabilityIndexReport)
+async def verify_index(
+    admin_user: User = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+):
+    """
+    Compare every day held by the availability index against the database.
+
+    Returns the number of days checked and each slot whose indexed status
+    disagrees with the stored one. Mismatched days are dropped from the index
+    and reloaded on their next request.
+
+    Restricted to admins — other users receive 403.
+    """
+    checked_days, mismatches = await verify_availability_index(session)
+    return AvailabilityIndexReport(
+        checked_days=checked_days,
+        mismatches=[mismatch._asdict() for mismatch in mismatches],
+    )
+
+
+@router.get("/cache/stats", response_model=RoomCacheStatsRead)
+async def room_cache_stats(admin_user: User = Depends(require_admin)):
+    """
+    Return the hit, miss, eviction and invalidation counters of the room
+    listing cache, with its current size and capacity.
+
+    Restricted to admins — other users receive 403.
+    """
+    return RoomCacheStatsRead(**get_room_cache_stats()._asdict())
+
+
+@router.get("/coalescing/stats", response_model=CoalescingStatsRead)
+async def coalescing_stats(admin_user: User = Depends(require_admin)):
+    """
+    Return, for the room listing and available-dates reads, how many queries
+    ran and how many concurrent identical requests shared an in-flight one.
+
+    Restricted to admins — other users receive 403.
+    """
+    return CoalescingStatsRead(
+        **{name: stats._asdict() for name, stats in get_coalescing_stats().items()}
+    )
+
+
 @router.get("/{id}", response_model=RoomBasicRead)
 async def retrieve_room(
     id: int,
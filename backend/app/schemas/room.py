@@ -1,5 +1,5 @@
 from datetime import date, time
-from typing import List
+from typing import List, Tuple
 
 from sqlmodel import SQLModel
 
@@ -26,3 +26,59 @@ class RoomBasicRead(SQLModel):
     id: int
     name: str
     capacity: int
+
+
+class RoomAvailabilityRow(SQLModel):
+    id: int
+    name: str
+    capacity: int
+    days: List[str] = []
+
+
+class AvailabilityMatrixRead(SQLModel):
+    start: date
+    end: date
+    slot_times: List[Tuple[time, time]] = []
+    rooms: List[RoomAvailabilityRow] = []
+
+
+class RoomSearchResult(SQLModel):
+    room_id: int
+    room_name: str
+    capacity: int
+    slot_date: date
+    start_time: time
+    end_time: time
+    slot_ids: List[int] = []
+
+
+class IndexMismatchRead(SQLModel):
+    slot_id: int
+    slot_date: date
+    indexed: TimeslotStatus | None
+    actual: TimeslotStatus | None
+
+
+class AvailabilityIndexReport(SQLModel):
+    checked_days: int
+    mismatches: List[IndexMismatchRead] = []
+
+
+class RoomCacheStatsRead(SQLModel):
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+    capacity: int
+
+
+class FlightStatsRead(SQLModel):
+    executed: int
+    coalesced: int
+    in_flight: int
+
+
+class CoalescingStatsRead(SQLModel):
+    rooms: FlightStatsRead
+    dates: FlightStatsRead
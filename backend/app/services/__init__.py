@@ -8,26 +8,43 @@ business workflows.
 """
 
 from .booking_service import (
+    BookingActionOutcome,
     BookingConflictError,
     BookingNotFoundError,
+    BookingPage,
     BookingServiceError,
     BookingStateError,
     approve_booking,
     cancel_booking,
     deny_booking,
+    expire_stale_bookings,
     get_all_bookings,
+    get_all_bookings_page,
     get_pending_bookings,
     get_user_bookings,
+    get_user_bookings_page,
     process_booking_action,
+    process_booking_actions,
     submit_booking,
 )
+from .idempotency_service import (
+    IdempotencyError,
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    claim_key,
+    complete_key,
+    release_key,
+)
 from .notification_service import (
     NotificationNotFoundError,
     NotificationServiceError,
     get_notification_for_user,
     get_notifications,
+    get_notifications_after,
     get_unread_count,
     mark_read,
+    mark_read_for_user,
+    peek_unread_count,
     send_notification,
 )
 
@@ -41,21 +58,36 @@ __all__ = [
     "BookingNotFoundError",
     "BookingConflictError",
     "BookingStateError",
+    "BookingActionOutcome",
+    "BookingPage",
     "submit_booking",
     "approve_booking",
     "deny_booking",
     "cancel_booking",
+    "expire_stale_bookings",
     "get_user_bookings",
     "get_all_bookings",
+    "get_user_bookings_page",
+    "get_all_bookings_page",
     "get_pending_bookings",
     "process_booking_action",
+    "process_booking_actions",
+    "IdempotencyError",
+    "IdempotencyKeyReusedError",
+    "IdempotencyInProgressError",
+    "claim_key",
+    "complete_key",
+    "release_key",
     "NotificationServiceError",
     "NotificationNotFoundError",
     "RoomServiceError",
     "RoomNotFoundError",
     "send_notification",
     "get_notifications",
+    "get_notifications_after",
     "get_notification_for_user",
     "mark_read",
+    "mark_read_for_user",
     "get_unread_count",
+    "peek_unread_count",
 ]
@@ -0,0 +1,398 @@
+"""
+Async booking service workflow.
+
+Runs the booking workflow natively on an `AsyncSession`, so route handlers can
+await each statement instead of bridging through `AsyncSession.run_sync`. The
+statement builders and lifecycle checks come from
+`app.services.booking_workflow`; this module only sequences them against the
+session. `app.services.booking_service` sequences the same steps on a
+synchronous `Session`.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import AsyncIterator, Iterable, Sequence
+
+from sqlalchemy import Row
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    Booking,
+    BookingStatus,
+    RecurrenceFrequency,
+    RecurrenceRule,
+    TimeSlot,
+    User,
+)
+from app.services.booking_workflow import (
+    TRANSITIONS,
+    BookingActionOutcome,
+    BookingPage,
+    BookingTransition,
+    all_bookings_statement,
+    batch_target_dates,
+    booking_statement,
+    bookings_by_ids_statement,
+    changed_concurrently,
+    check_actions,
+    check_transition,
+    conflict_error,
+    decode_cursor,
+    expire_statement,
+    expiry_notifications,
+    export_statement,
+    hold_statement,
+    look_ahead,
+    mark_held,
+    mark_transitioned,
+    match_batch,
+    matched_recurrence,
+    new_booking,
+    occurrence_batches,
+    order_slots,
+    pending_bookings_statement,
+    precheck_available,
+    recurrence_rule,
+    recurrence_statement,
+    release_holds_statement,
+    released_changes,
+    require_available,
+    require_found,
+    require_slot_ids,
+    require_visible,
+    settle_actions,
+    slots_changed_concurrently,
+    slots_statement,
+    taken_statement,
+    to_page,
+    transition_slots_statement,
+    transition_statement,
+    unmoved_slots,
+    user_bookings_statement,
+    validate_submission,
+)
+from app.services.notification_service import build_notification
+from app.services.slot_events import changes_for, record_slot_changes
+
+
+async def _get_booking(session: AsyncSession, booking_id: int) -> Booking:
+    booking = (await session.exec(booking_statement(booking_id))).unique().first()
+    return require_found(booking, booking_id)
+
+
+async def _get_slots_by_id(
+    session: AsyncSession, slot_ids: list[int]
+) -> list[TimeSlot]:
+    require_slot_ids(slot_ids)
+    slots = list(await session.exec(slots_statement(slot_ids)))
+    return order_slots(slot_ids, slots)
+
+
+async def _resolve_recurrence(
+    session: AsyncSession, anchor_slots: list[TimeSlot], rule: RecurrenceRule
+) -> list[TimeSlot]:
+    """
+    Expands the anchor slots into every occurrence of `rule`.
+
+    Occurrences are generated lazily and resolved one batch of dates at a
+    time, with a single query per batch, so long rules with many exclusions
+    run in bounded memory.
+
+    Raises:
+        BookingNotFoundError: If any occurrence has no matching `TimeSlot`.
+    """
+    if rule.frequency == RecurrenceFrequency.NONE:
+        return anchor_slots
+
+    target_slots: dict[int, TimeSlot] = {}
+    missing: list[str] = []
+    for batch in occurrence_batches(anchor_slots, rule):
+        target_dates = batch_target_dates(batch)
+        candidates: list[TimeSlot] = []
+        if target_dates:
+            candidates = list(
+                await session.exec(recurrence_statement(anchor_slots, target_dates))
+            )
+        match_batch(batch, candidates, target_slots, missing)
+    return matched_recurrence(target_slots, missing)
+
+
+async def _hold_slots(session: AsyncSession, slots: list[TimeSlot]) -> None:
+    """
+    Atomically moves `slots` from available to held with one conditional UPDATE.
+
+    The availability check and the write happen in the same statement, so two
+    concurrent submissions can never both hold the same slot. If any slot was
+    taken in the meantime the transaction is rolled back.
+
+    Raises:
+        BookingConflictError: If not every slot was still available.
+    """
+    slot_ids = {slot.id for slot in slots}
+    result = await session.exec(hold_statement(slot_ids))
+    if result.rowcount != len(slot_ids):
+        await session.rollback()
+        raise conflict_error((await session.exec(taken_statement(slot_ids))).all())
+
+    mark_held(slots)
+    record_slot_changes(session, changes_for(slots))
+
+
+async def submit_booking(
+    user: User,
+    room_id: int,
+    slot_ids: list[int],
+    recurrence_freq: str | RecurrenceFrequency,
+    recurrence_end_date,
+    session: AsyncSession,
+    recurrence_weekdays: Iterable[str] = (),
+    recurrence_exclusions: Iterable[date] = (),
+) -> Booking:
+    recurrence_frequency = RecurrenceFrequency(recurrence_freq)
+    rule = recurrence_rule(
+        recurrence_frequency,
+        recurrence_end_date,
+        recurrence_weekdays,
+        recurrence_exclusions,
+    )
+    precheck_available(slot_ids)
+    anchor_slots = await _get_slots_by_id(session, slot_ids)
+    validate_submission(room_id, anchor_slots, rule)
+
+    target_slots = await _resolve_recurrence(session, anchor_slots, rule)
+    require_available(target_slots)
+    await _hold_slots(session, target_slots)
+
+    booking = new_booking(
+        user, room_id, recurrence_frequency, recurrence_end_date, target_slots
+    )
+    session.add(booking)
+    await session.commit()
+    await session.refresh(booking)
+    return await _get_booking(session, booking.id)
+
+
+async def _write_transition(
+    session: AsyncSession, bookings: list[Booking], transition: BookingTransition
+) -> set[int]:
+    """
+    Writes `transition` for bookings whose loaded state already passed its checks.
+
+    Each booking moves only if it is still in `transition.booking_from`, and
+    its slots only if they are still in `transition.slot_from`, so a booking
+    the hold sweeper or another admin changed after it was loaded is left
+    alone. One UPDATE covers all the bookings and one covers their slots.
+
+    Returns:
+        set[int]: The ids of the bookings that were moved.
+
+    Raises:
+        BookingStateError: If a moved booking's slots were changed by another
+        request; the transaction is rolled back.
+    """
+    booking_ids = [booking.id for booking in bookings]
+    result = await session.exec(transition_statement(booking_ids, transition))  # type: ignore[arg-type]
+    moved_ids = set(result.scalars())
+    moved = [booking for booking in bookings if booking.id in moved_ids]
+    if not moved:
+        return moved_ids
+
+    slots = await session.exec(transition_slots_statement(list(moved_ids), transition))
+    unmoved = unmoved_slots(moved, slots.scalars())
+    if unmoved:
+        await session.rollback()
+        raise slots_changed_concurrently(unmoved)
+
+    record_slot_changes(session, mark_transitioned(moved, transition))
+    return moved_ids
+
+
+async def _transition(
+    session: AsyncSession, booking_id: int, transition: BookingTransition
+) -> Booking:
+    """
+    Applies a lifecycle transition and records its notification in one commit.
+
+    The booking is loaded with its slots in a single query and returned as is,
+    so callers get the updated booking without a refresh or a re-query.
+
+    Raises:
+        BookingStateError: If the booking is not in the required state, or
+        another request changed it after it was loaded.
+    """
+    booking = await _get_booking(session, booking_id)
+    check_transition(booking, transition)
+    if not await _write_transition(session, [booking], transition):
+        await session.rollback()
+        raise changed_concurrently(booking_id)
+
+    session.add(
+        build_notification(booking.userID, booking.id, transition.notification_type)
+    )
+    await session.commit()
+    return booking
+
+
+async def approve_booking(booking_id: int, session: AsyncSession) -> Booking:
+    return await _transition(session, booking_id, TRANSITIONS["approve"])
+
+
+async def deny_booking(booking_id: int, session: AsyncSession) -> Booking:
+    return await _transition(session, booking_id, TRANSITIONS["deny"])
+
+
+async def cancel_booking(booking_id: int, session: AsyncSession) -> Booking:
+    return await _transition(session, booking_id, TRANSITIONS["cancel"])
+
+
+async def get_pending_bookings(session: AsyncSession) -> list[Booking]:
+    return list(await session.exec(pending_bookings_statement()))
+
+
+async def get_booking(booking_id: int, user: User, session: AsyncSession) -> Booking:
+    """
+    Returns one booking with its slots, if `user` owns it or is an admin.
+    """
+    return require_visible(await _get_booking(session, booking_id), user)
+
+
+async def get_user_bookings(
+    user_id, session: AsyncSession, status: str | BookingStatus | None = None
+) -> list[Booking]:
+    return list(await session.exec(user_bookings_statement(user_id, status)))
+
+
+async def get_all_bookings(
+    session: AsyncSession, status: str | BookingStatus | None = None
+) -> list[Booking]:
+    return list(await session.exec(all_bookings_statement(status)))
+
+
+async def get_user_bookings_page(
+    user_id,
+    session: AsyncSession,
+    status: str | BookingStatus | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_room: bool = False,
+) -> BookingPage:
+    """
+    Returns one page of a user's bookings, newest first, after `cursor`.
+
+    Pages are keyed on `(createdAt, id)`, so reading page N costs the same
+    index seek as reading the first page. With `include_room`, the bookings'
+    rooms are joined into the same query and returned in `BookingPage.rooms`.
+    """
+    statement = user_bookings_statement(
+        user_id, status, look_ahead(limit), decode_cursor(cursor), include_room
+    )
+    return to_page(list(await session.exec(statement)), limit, include_room)
+
+
+async def get_all_bookings_page(
+    session: AsyncSession,
+    status: str | BookingStatus | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_room: bool = False,
+) -> BookingPage:
+    """
+    Returns one page of all bookings, newest first, after `cursor`,
+    optionally with their rooms joined in.
+    """
+    statement = all_bookings_statement(
+        status, look_ahead(limit), decode_cursor(cursor), include_room
+    )
+    return to_page(list(await session.exec(statement)), limit, include_room)
+
+
+_ACTION_MAP = {
+    "approve": approve_booking,
+    "deny": deny_booking,
+    "cancel": cancel_booking,
+}
+
+
+async def process_booking_action(
+    booking_id: int, action: str, session: AsyncSession
+) -> Booking:
+    """Execute a booking lifecycle action, which also records its notification."""
+    return await _ACTION_MAP[action](booking_id, session)
+
+
+async def process_booking_actions(
+    actions: list[tuple[int, str]], session: AsyncSession
+) -> list[BookingActionOutcome]:
+    """
+    Applies many booking lifecycle actions in a single transaction.
+
+    Every target booking is loaded together with its slots in one query and
+    checked in memory. Each action is then written with one conditional
+    UPDATE for its bookings and one for their slots, the notifications are
+    inserted in bulk and the whole batch is committed once. Items that fail,
+    including bookings another request changed after they were loaded, are
+    reported in their outcome without affecting the rest of the batch.
+
+    Raises:
+        BookingStateError: If a booking's slots were changed by another
+        request while the booking itself was not; nothing is committed.
+    """
+    booking_ids = {booking_id for booking_id, _ in actions}
+    result = await session.exec(bookings_by_ids_statement(booking_ids))
+    outcomes, passed = check_actions(list(result.unique()), actions)
+    moved = {
+        action: await _write_transition(session, bookings, TRANSITIONS[action])
+        for action, bookings in passed.items()
+    }
+    outcomes, notifications = settle_actions(outcomes, moved)
+    session.add_all(notifications)
+    await session.commit()
+    return outcomes
+
+
+async def expire_stale_bookings(
+    cutoff: datetime, session: AsyncSession, batch_size: int = 500
+) -> list[int]:
+    """
+    Expires pending bookings created before `cutoff` and releases their held slots.
+
+    One indexed UPDATE marks the bookings expired, one bulk UPDATE releases
+    their slots and the notifications are inserted together, all in a single
+    commit. At most `batch_size` bookings are handled per call.
+
+    Returns:
+        list[int]: The ids of the bookings that were expired.
+    """
+    expired = list(await session.exec(expire_statement(cutoff, batch_size)))
+    if not expired:
+        await session.rollback()
+        return []
+
+    booking_ids = [booking_id for booking_id, _ in expired]
+    released = await session.exec(release_holds_statement(booking_ids))
+    record_slot_changes(session, released_changes(released))
+    session.add_all(expiry_notifications(expired))
+    await session.commit()
+    return booking_ids
+
+
+async def stream_booking_export(
+    session: AsyncSession,
+    status: str | BookingStatus | None = None,
+    created_from: datetime | None = None,
+    created_before: datetime | None = None,
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Streams booking export rows in chunks from a server-side cursor.
+
+    Each row carries the `booking_workflow.EXPORT_FIELDS` columns. At most
+    `booking_workflow.EXPORT_CHUNK_SIZE` rows are held in memory at a time.
+    """
+    statement = export_statement(status, created_from, created_before)
+    result = await session.stream(statement)
+    try:
+        async for chunk in result.partitions():
+            yield chunk
+    finally:
+        await result.close()
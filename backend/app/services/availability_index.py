@@ -0,0 +1,432 @@
+"""
+Availability Index Module.
+
+Keeps an in-memory bitmap of slot states per `(room_id, slot_date)`, so the
+common "is it free?" questions asked by room browsing and booking submission
+are answered without loading and comparing `TimeSlot` rows.
+
+Days are loaded lazily, with one query per batch of missing dates; at most
+`INDEX_CACHE_DAYS` dates are kept, evicting the least recently used. They are
+kept in sync by `app.services.slot_events`, which publishes every committed
+slot change. `AvailabilityIndex.verify` compares the loaded days against the
+database on demand and drops any day that disagrees.
+
+The index lives in process memory and only sees writes committed through this
+process, so it assumes a single application worker owns the database.
+"""
+
+from collections import OrderedDict, defaultdict
+from datetime import date, timedelta
+from typing import Iterable, NamedTuple
+
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.booking import TimeSlot, TimeslotStatus
+from app.models.room import Room
+from app.schemas.room import RoomRead, TimeSlotRead
+from app.services.change_versions import ChangeVersions
+from app.services.slot_events import SlotChange, on_reset, on_slot_changes
+
+INDEX_CACHE_DAYS = 366
+"""Maximum number of dates whose slot bitmaps are kept."""
+
+VERIFY_BATCH_DAYS = 366
+"""Maximum number of dates compared per query by `AvailabilityIndex.verify`."""
+
+
+class IndexMismatch(NamedTuple):
+    """
+    One slot whose indexed state disagrees with the database.
+    """
+
+    slot_id: int
+    """The primary key of the slot."""
+    slot_date: date
+    """The date the slot is indexed or stored under."""
+    indexed: TimeslotStatus | None
+    """The indexed status, or `None` if the index does not know the slot."""
+    actual: TimeslotStatus | None
+    """The stored status, or `None` if the slot no longer exists."""
+
+
+class IndexVerification(NamedTuple):
+    """
+    Result of comparing the index against the database.
+    """
+
+    checked_days: int
+    """The number of loaded dates that were compared."""
+    mismatches: list[IndexMismatch]
+    """Every disagreement found; the affected dates are dropped from the index."""
+
+
+class DayAvailability:
+    """
+    Slot states of one room on one date, ordered by start time.
+
+    Bit `n` of `available` is set when the `n`-th slot is available and bit `n`
+    of `held` when it is held; a slot with neither bit set is booked.
+
+    The maximal runs of back-to-back available slots are kept as an interval
+    list, rebuilt lazily after a status change touches this day only.
+    """
+
+    __slots__ = (
+        "room_id",
+        "slot_date",
+        "slot_ids",
+        "starts",
+        "ends",
+        "available",
+        "held",
+        "_runs",
+    )
+
+    def __init__(
+        self, room_id: int, slot_date: date, slots: Iterable[SlotChange]
+    ) -> None:
+        ordered = sorted(slots, key=lambda slot: (slot.start_time, slot.slot_id))
+        self.room_id = room_id
+        self.slot_date = slot_date
+        self.slot_ids = [slot.slot_id for slot in ordered]
+        self.starts = [slot.start_time for slot in ordered]
+        self.ends = [slot.end_time for slot in ordered]
+        self.available = 0
+        self.held = 0
+        self._runs: list[tuple[int, int]] | None = None
+        for position, slot in enumerate(ordered):
+            self.set(position, slot.status)
+
+    def set(self, position: int, status: TimeslotStatus | None) -> None:
+        """
+        Records `status` for the slot at `position`.
+        """
+        bit = 1 << position
+        self._runs = None
+        self.available &= ~bit
+        self.held &= ~bit
+        if status == TimeslotStatus.AVAILABLE:
+            self.available |= bit
+        elif status == TimeslotStatus.HELD:
+            self.held |= bit
+
+    def status(self, position: int) -> TimeslotStatus:
+        """
+        Returns the status of the slot at `position`.
+        """
+        bit = 1 << position
+        if self.available & bit:
+            return TimeslotStatus.AVAILABLE
+        if self.held & bit:
+            return TimeslotStatus.HELD
+        return TimeslotStatus.BOOKED
+
+    def runs(self) -> list[tuple[int, int]]:
+        """
+        Returns the first and last position of every maximal run of available
+        slots in which each slot ends exactly when the next one starts.
+        """
+        if self._runs is None:
+            runs: list[tuple[int, int]] = []
+            for position in range(len(self.slot_ids)):
+                if not self.available >> position & 1:
+                    continue
+                if runs and runs[-1][1] == position - 1:
+                    if self.ends[position - 1] == self.starts[position]:
+                        runs[-1] = (runs[-1][0], position)
+                        continue
+                runs.append((position, position))
+            self._runs = runs
+        return self._runs
+
+    def slots(self) -> list[SlotChange]:
+        """
+        Expands the bitmap back into one record per slot.
+        """
+        return [
+            SlotChange(
+                slot_id,
+                self.room_id,
+                self.slot_date,
+                self.starts[position],
+                self.ends[position],
+                self.status(position),
+            )
+            for position, slot_id in enumerate(self.slot_ids)
+        ]
+
+
+def _day_statement(first: date, last: date):
+    return select(
+        TimeSlot.id,
+        TimeSlot.room_id,
+        TimeSlot.slot_date,
+        TimeSlot.start_time,
+        TimeSlot.end_time,
+        TimeSlot.status,
+    ).where(TimeSlot.slot_date >= first, TimeSlot.slot_date <= last)
+
+
+def _group_by_room(
+    slot_date: date, slots: Iterable[SlotChange]
+) -> dict[int, DayAvailability]:
+    grouped: dict[int, list[SlotChange]] = defaultdict(list)
+    for slot in slots:
+        grouped[slot.room_id].append(slot)
+    return {
+        room_id: DayAvailability(room_id, slot_date, room_slots)
+        for room_id, room_slots in grouped.items()
+    }
+
+
+def _slot_reads(day: DayAvailability | None) -> list[TimeSlotRead]:
+    if day is None:
+        return []
+    return [
+        TimeSlotRead(
+            id=slot.slot_id,
+            room_id=slot.room_id,
+            slot_date=slot.slot_date,
+            start_time=slot.start_time,
+            end_time=slot.end_time,
+            status=slot.status,  # type: ignore[arg-type]
+        )
+        for slot in day.slots()
+    ]
+
+
+class AvailabilityIndex:
+    """
+    Lazily loaded, change-driven bitmap of slot states for every room.
+
+    Holds at most `capacity` dates, evicting the least recently used one.
+    """
+
+    def __init__(self, capacity: int = INDEX_CACHE_DAYS) -> None:
+        self.capacity = capacity
+        self._epoch = 0
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drops every loaded day and the cached room list.
+        """
+        self._epoch += 1
+        self._days: OrderedDict[date, dict[int, DayAvailability]] = OrderedDict()
+        self._positions: dict[int, tuple[date, int, int]] = {}
+        self._versions: ChangeVersions[date] = ChangeVersions(self.capacity)
+        self._rooms: list[tuple[int, str, int]] | None = None
+
+    @property
+    def loaded_days(self) -> int:
+        """The number of dates currently held in memory."""
+        return len(self._days)
+
+    def _install(self, slot_date: date, rooms: dict[int, DayAvailability]) -> None:
+        self._drop(slot_date)
+        self._days[slot_date] = rooms
+        for room_id, day in rooms.items():
+            for position, slot_id in enumerate(day.slot_ids):
+                self._positions[slot_id] = (slot_date, room_id, position)
+        while len(self._days) > self.capacity:
+            evicted = next(iter(self._days))
+            self._drop(evicted)
+            self._versions.forget(evicted)
+
+    def _drop(self, slot_date: date) -> None:
+        for day in self._days.pop(slot_date, {}).values():
+            for slot_id in day.slot_ids:
+                self._positions.pop(slot_id, None)
+
+    def apply(self, changes: list[SlotChange]) -> None:
+        """
+        Folds committed slot changes into the loaded days.
+
+        Status changes flip bits in place; inserted, deleted or moved slots
+        rebuild the affected room's day.
+        """
+        rebuild: dict[tuple[date, int], dict[int, SlotChange | None]]
+        rebuild = defaultdict(dict)
+        for change in changes:
+            self._bump(change.slot_date)
+            located = self._positions.get(change.slot_id)
+            if located is not None:
+                slot_date, room_id, position = located
+                day = self._days[slot_date][room_id]
+                in_place = (
+                    change.status is not None
+                    and (slot_date, room_id) == (change.slot_date, change.room_id)
+                    and day.starts[position] == change.start_time
+                    and day.ends[position] == change.end_time
+                )
+                if in_place:
+                    day.set(position, change.status)
+                    continue
+                self._bump(slot_date)
+                rebuild[(slot_date, room_id)][change.slot_id] = None
+
+            if change.status is not None and change.slot_date in self._days:
+                rebuild[(change.slot_date, change.room_id)][change.slot_id] = change
+
+        for (slot_date, room_id), updates in rebuild.items():
+            rooms = dict(self._days[slot_date])
+            previous = rooms.pop(room_id, None)
+            current: dict[int, SlotChange | None] = {}
+            if previous is not None:
+                current = {slot.slot_id: slot for slot in previous.slots()}
+            current.update(updates)
+            remaining = [slot for slot in current.values() if slot is not None]
+            if remaining:
+                rooms[room_id] = DayAvailability(room_id, slot_date, remaining)
+            self._install(slot_date, rooms)
+
+    def _bump(self, slot_date: date) -> None:
+        self._versions.bump(slot_date)
+
+    async def load_days(
+        self, dates: list[date], session: AsyncSession
+    ) -> dict[date, dict[int, DayAvailability]]:
+        """
+        Returns the slot bitmaps for `dates`, querying only the dates not loaded.
+
+        A date that received changes while its query was in flight is answered
+        from the query but not installed, so a stale snapshot never sticks.
+        """
+        days = {}
+        for slot_date in dates:
+            if slot_date in self._days:
+                self._days.move_to_end(slot_date)
+                days[slot_date] = self._days[slot_date]
+        missing = sorted(slot_date for slot_date in dates if slot_date not in days)
+        if not missing:
+            return days
+
+        epoch = self._epoch
+        versions = {slot_date: self._versions.get(slot_date) for slot_date in missing}
+        rows = await session.exec(_day_statement(missing[0], missing[-1]))
+        grouped: dict[date, list[SlotChange]] = defaultdict(list)
+        for row in rows:
+            grouped[row[2]].append(SlotChange(*row))
+
+        for slot_date in missing:
+            loaded = _group_by_room(slot_date, grouped.get(slot_date, []))
+            days[slot_date] = loaded
+            unchanged = self._versions.get(slot_date) == versions[slot_date]
+            if epoch == self._epoch and unchanged and slot_date not in self._days:
+                self._install(slot_date, loaded)
+        return days
+
+    async def load_range(
+        self, first: date, last: date, session: AsyncSession
+    ) -> dict[date, dict[int, DayAvailability]]:
+        """
+        Returns the slot bitmaps of every date from `first` to `last` inclusive,
+        loading the missing dates with a single range query.
+        """
+        dates = [first + timedelta(days=day) for day in range((last - first).days + 1)]
+        return await self.load_days(dates, session)
+
+    async def load_rooms(self, session: AsyncSession) -> list[tuple[int, str, int]]:
+        """
+        Returns the `(id, name, capacity)` of every room, ordered by id.
+
+        The list is cached until a room changes, so repeated calls run no query.
+        """
+        if self._rooms is not None:
+            return self._rooms
+
+        epoch = self._epoch
+        statement = select(Room.id, Room.name, Room.capacity).order_by(Room.id)
+        rooms = [tuple(row) for row in await session.exec(statement)]
+        if epoch == self._epoch:
+            self._rooms = rooms  # type: ignore[assignment]
+        return rooms  # type: ignore[return-value]
+
+    def unavailable(self, slot_ids: Iterable[int]) -> list[int]:
+        """
+        Returns the ids among `slot_ids` that the index knows are not available.
+
+        Slots on dates that are not loaded are not reported; callers must still
+        rely on the database for the authoritative check.
+        """
+        taken = []
+        for slot_id in slot_ids:
+            located = self._positions.get(slot_id)
+            if located is None:
+                continue
+            slot_date, room_id, position = located
+            if not self._days[slot_date][room_id].available >> position & 1:
+                taken.append(slot_id)
+        return taken
+
+    async def rooms_on(
+        self, target_date: date, session: AsyncSession
+    ) -> list[RoomRead]:
+        """
+        Returns every room with its slots and their statuses on `target_date`.
+        """
+        days = (await self.load_days([target_date], session))[target_date]
+        rooms = await self.load_rooms(session)
+        return [
+            RoomRead(
+                id=room_id,
+                name=name,
+                capacity=capacity,
+                time_slots=_slot_reads(days.get(room_id)),
+            )
+            for room_id, name, capacity in rooms
+        ]
+
+    async def verify(self, session: AsyncSession) -> IndexVerification:
+        """
+        Compares every loaded day against the database.
+
+        Dates that disagree are dropped so the next read reloads them.
+        """
+        loaded = sorted(self._days)
+        mismatches: list[IndexMismatch] = []
+        checked = 0
+        for start in range(0, len(loaded), VERIFY_BATCH_DAYS):
+            batch = loaded[start : start + VERIFY_BATCH_DAYS]
+            epoch = self._epoch
+            versions = {slot_date: self._versions.get(slot_date) for slot_date in batch}
+            rows = await session.exec(_day_statement(batch[0], batch[-1]))
+            actual: dict[date, dict[int, SlotChange]] = defaultdict(dict)
+            for row in rows:
+                actual[row[2]][row[0]] = SlotChange(*row)
+            if epoch != self._epoch:
+                break
+
+            for slot_date in batch:
+                changed = self._versions.get(slot_date) != versions[slot_date]
+                if changed or slot_date not in self._days:
+                    continue
+                checked += 1
+                indexed = {
+                    slot.slot_id: slot
+                    for day in self._days[slot_date].values()
+                    for slot in day.slots()
+                }
+                stored = actual.get(slot_date, {})
+                found = [
+                    IndexMismatch(
+                        slot_id,
+                        slot_date,
+                        indexed[slot_id].status if slot_id in indexed else None,
+                        stored[slot_id].status if slot_id in stored else None,
+                    )
+                    for slot_id in sorted(indexed.keys() | stored.keys())
+                    if indexed.get(slot_id) != stored.get(slot_id)
+                ]
+                if found:
+                    mismatches.extend(found)
+                    self._drop(slot_date)
+        return IndexVerification(checked, mismatches)
+
+
+availability_index = AvailabilityIndex()
+"""The process-wide index, kept current by `app.services.slot_events`."""
+
+on_slot_changes(availability_index.apply)
+on_reset(availability_index.reset)
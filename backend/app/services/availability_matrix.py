@@ -0,0 +1,68 @@
+"""
+Availability Matrix Module.
+
+Encodes the availability of every room over a range of dates as one compact
+string per room and date, read from the bitmaps of
+`app.services.availability_index`, so a multi-day view needs one request and
+at most one slot query instead of one room listing per date.
+"""
+
+from datetime import date
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.booking import TimeslotStatus
+from app.schemas.room import AvailabilityMatrixRead, RoomAvailabilityRow
+from app.services.availability_index import availability_index
+
+MATRIX_CODES = {
+    TimeslotStatus.AVAILABLE: "a",
+    TimeslotStatus.HELD: "h",
+    TimeslotStatus.BOOKED: "b",
+}
+"""Character encoding each slot status in `build_availability_matrix` rows."""
+
+MATRIX_NO_SLOT = "-"
+"""Matrix character for a slot time the room does not offer on that date."""
+
+
+async def build_availability_matrix(
+    first: date, last: date, session: AsyncSession
+) -> AvailabilityMatrixRead:
+    """
+    Returns the availability of every room from `first` to `last` inclusive.
+
+    `slot_times` lists every distinct slot time in the range; each room
+    has one string per date whose `n`-th character is the `MATRIX_CODES`
+    entry for the `n`-th slot time, or `MATRIX_NO_SLOT`. Dates not yet in
+    the index are loaded with a single range query.
+    """
+    days = await availability_index.load_range(first, last, session)
+    dates = sorted(days)
+    rooms = await availability_index.load_rooms(session)
+    slot_times = sorted(
+        {
+            span
+            for by_room in days.values()
+            for day in by_room.values()
+            for span in zip(day.starts, day.ends)
+        }
+    )
+    columns = {span: column for column, span in enumerate(slot_times)}
+
+    rows = []
+    for room_id, name, capacity in rooms:
+        encoded = []
+        for slot_date in dates:
+            cells = [MATRIX_NO_SLOT] * len(slot_times)
+            day = days[slot_date].get(room_id)
+            if day is not None:
+                for position, span in enumerate(zip(day.starts, day.ends)):
+                    cells[columns[span]] = MATRIX_CODES[day.status(position)]
+            encoded.append("".join(cells))
+        rows.append(
+            RoomAvailabilityRow(id=room_id, name=name, capacity=capacity, days=encoded)
+        )
+    return AvailabilityMatrixRead(
+        start=first, end=last, slot_times=slot_times, rooms=rows
+    )
@@ -0,0 +1,93 @@
+"""
+Availability Versions Module.
+
+Keeps a version counter per date and per month, bumped by
+`app.services.slot_events` whenever a committed change touches a slot on that
+date. The room endpoints expose them as strong `ETag` values, so a client that
+already holds the current payload gets a `304 Not Modified` without any query
+or serialization.
+
+Every tag also carries a token generated at start-up and an epoch bumped on
+each reset, so counters that restart from zero never reproduce an old tag.
+Only the most recently changed dates and months keep their own counter; see
+`app.services.change_versions` for why forgetting the rest is safe.
+"""
+
+import secrets
+from datetime import date
+
+from app.services.change_versions import ChangeVersions
+from app.services.slot_events import SlotChange, on_reset, on_slot_changes
+
+DATE_VERSIONS_SIZE = 4096
+"""Maximum number of dates whose change counter is kept."""
+
+MONTH_VERSIONS_SIZE = 256
+"""Maximum number of months whose change counter is kept."""
+
+
+class AvailabilityVersions:
+    """
+    Per-date and per-month change counters for slot availability.
+    """
+
+    def __init__(self) -> None:
+        self._instance = secrets.token_hex(4)
+        self._epoch = 0
+        self._dates: ChangeVersions[date] = ChangeVersions(DATE_VERSIONS_SIZE)
+        self._months: ChangeVersions[tuple[int, int]] = ChangeVersions(
+            MONTH_VERSIONS_SIZE
+        )
+
+    def bump(self, changes: list[SlotChange]) -> None:
+        """
+        Advances the counters of every date and month touched by `changes`.
+        """
+        dates = {change.slot_date for change in changes}
+        for slot_date in dates:
+            self._dates.bump(slot_date)
+        for month in {(slot_date.year, slot_date.month) for slot_date in dates}:
+            self._months.bump(month)
+
+    def reset(self) -> None:
+        """
+        Invalidates every tag issued so far.
+        """
+        self._epoch += 1
+        self._dates.clear()
+        self._months.clear()
+
+    def date_etag(self, target_date: date) -> str:
+        """
+        Returns the strong entity tag of the availability on `target_date`.
+        """
+        version = self._dates.get(target_date)
+        return f'"{self._instance}-{self._epoch}-d{target_date.isoformat()}-{version}"'
+
+    def month_etag(self, year: int, month: int) -> str:
+        """
+        Returns the strong entity tag of the availability in `year`/`month`.
+        """
+        version = self._months.get((year, month))
+        return f'"{self._instance}-{self._epoch}-m{year:04d}-{month:02d}-{version}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Returns whether an `If-None-Match` header value matches `etag`.
+
+    Uses the weak comparison RFC 9110 prescribes for `If-None-Match`.
+    """
+    if if_none_match is None:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+availability_versions = AvailabilityVersions()
+"""The process-wide version counters."""
+
+on_slot_changes(availability_versions.bump)
+on_reset(availability_versions.reset)
@@ -2,104 +2,167 @@
 Booking service workflow.
 
 Handles booking submission, approval, denial, cancellation, and admin queue lookup.
+
+The functions here are the synchronous entry points. They sequence the same
+statement builders and lifecycle checks from `app.services.booking_workflow`
+as `app.services.async_booking_service`, on a synchronous `Session`. The error
+types and result tuples are defined in `app.services.booking_workflow` and
+re-exported here.
 """
 
 from __future__ import annotations
 
-from datetime import timedelta
+from datetime import date, datetime
+from typing import Iterable
 
-from sqlalchemy.orm import selectinload
-from sqlmodel import Session, select
+from sqlmodel import Session
 
 from app.models import (
     Booking,
     BookingStatus,
-    NotificationType,
     RecurrenceFrequency,
+    RecurrenceRule,
     TimeSlot,
-    TimeslotStatus,
     User,
 )
-from app.services.notification_service import send_notification
-
-
-class BookingServiceError(ValueError):
-    """Base booking workflow error."""
-
-
-class BookingNotFoundError(BookingServiceError):
-    """Raised when a booking or timeslot cannot be found."""
-
-
-class BookingConflictError(BookingServiceError):
-    """Raised when a slot cannot be booked because it is unavailable."""
-
-
-class BookingStateError(BookingServiceError):
-    """Raised when a booking lifecycle transition is invalid."""
+from app.services.booking_workflow import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FIELDS,
+    MAX_RECURRENCE_OCCURRENCES,
+    RECURRENCE_BATCH_DAYS,
+    TRANSITIONS,
+    BookingActionOutcome,
+    BookingConflictError,
+    BookingNotFoundError,
+    BookingPage,
+    BookingServiceError,
+    BookingStateError,
+    BookingTransition,
+    all_bookings_statement,
+    batch_target_dates,
+    booking_etag,
+    booking_statement,
+    bookings_by_ids_statement,
+    changed_concurrently,
+    check_actions,
+    check_transition,
+    conflict_error,
+    decode_cursor,
+    expire_statement,
+    expiry_notifications,
+    hold_statement,
+    look_ahead,
+    mark_held,
+    mark_transitioned,
+    match_batch,
+    matched_recurrence,
+    new_booking,
+    occurrence_batches,
+    order_slots,
+    pending_bookings_statement,
+    precheck_available,
+    recurrence_rule,
+    recurrence_statement,
+    release_holds_statement,
+    released_changes,
+    require_available,
+    require_found,
+    require_slot_ids,
+    require_visible,
+    settle_actions,
+    slots_changed_concurrently,
+    slots_statement,
+    taken_statement,
+    to_page,
+    transition_slots_statement,
+    transition_statement,
+    unmoved_slots,
+    user_bookings_statement,
+    validate_submission,
+)
+from app.services.notification_service import build_notification
+from app.services.slot_events import changes_for, record_slot_changes
+
+__all__ = [
+    "EXPORT_CHUNK_SIZE",
+    "EXPORT_FIELDS",
+    "MAX_RECURRENCE_OCCURRENCES",
+    "RECURRENCE_BATCH_DAYS",
+    "BookingActionOutcome",
+    "BookingConflictError",
+    "BookingNotFoundError",
+    "BookingPage",
+    "BookingServiceError",
+    "BookingStateError",
+    "booking_etag",
+    "submit_booking",
+    "approve_booking",
+    "deny_booking",
+    "cancel_booking",
+    "get_pending_bookings",
+    "get_booking",
+    "get_user_bookings",
+    "get_all_bookings",
+    "get_user_bookings_page",
+    "get_all_bookings_page",
+    "process_booking_action",
+    "process_booking_actions",
+    "expire_stale_bookings",
+]
 
 
 def _get_booking(session: Session, booking_id: int) -> Booking:
-    statement = (
-        select(Booking)
-        .where(Booking.id == booking_id)
-        .options(selectinload(Booking.timeSlots))
-    )
-    booking = session.exec(statement).first()
-    if booking is None:
-        raise BookingNotFoundError(f"Booking {booking_id} was not found.")
-    return booking
+    booking = session.exec(booking_statement(booking_id)).unique().first()
+    return require_found(booking, booking_id)
 
 
 def _get_slots_by_id(session: Session, slot_ids: list[int]) -> list[TimeSlot]:
-    if not slot_ids:
-        raise BookingServiceError("At least one slot id is required.")
-
-    slots = list(session.exec(select(TimeSlot).where(TimeSlot.id.in_(slot_ids))))
-    slots_by_id = {slot.id: slot for slot in slots}
-    missing_ids = [slot_id for slot_id in slot_ids if slot_id not in slots_by_id]
-    if missing_ids:
-        missing = ", ".join(str(slot_id) for slot_id in missing_ids)
-        raise BookingNotFoundError(f"TimeSlot(s) not found: {missing}")
-
-    return [slots_by_id[slot_id] for slot_id in slot_ids]
+    require_slot_ids(slot_ids)
+    return order_slots(slot_ids, list(session.exec(slots_statement(slot_ids))))
 
 
 def _resolve_recurrence(
-    session: Session,
-    anchor_slots: list[TimeSlot],
-    recurrence_frequency: RecurrenceFrequency,
-    recurrence_end_date,
+    session: Session, anchor_slots: list[TimeSlot], rule: RecurrenceRule
 ) -> list[TimeSlot]:
-    if recurrence_frequency != RecurrenceFrequency.WEEKLY:
+    """
+    Expands the anchor slots into every occurrence of `rule`, one query per
+    batch of dates.
+
+    Raises:
+        BookingNotFoundError: If any occurrence has no matching `TimeSlot`.
+    """
+    if rule.frequency == RecurrenceFrequency.NONE:
         return anchor_slots
 
-    target_slots: list[TimeSlot] = []
-
-    for slot in anchor_slots:
-        current_date = slot.slot_date
-        while current_date <= recurrence_end_date:
-            if current_date == slot.slot_date:
-                target_slots.append(slot)
-            else:
-                recurring_slot = session.exec(
-                    select(TimeSlot).where(
-                        TimeSlot.room_id == slot.room_id,
-                        TimeSlot.slot_date == current_date,
-                        TimeSlot.start_time == slot.start_time,
-                        TimeSlot.end_time == slot.end_time,
-                    )
-                ).first()
-                if recurring_slot is None:
-                    raise BookingNotFoundError(
-                        "Recurring timeslot not found for "
-                        f"{current_date.isoformat()} {slot.start_time}-{slot.end_time}."
-                    )
-                target_slots.append(recurring_slot)
-
-            current_date += timedelta(days=7)
-
-    return target_slots
+    target_slots: dict[int, TimeSlot] = {}
+    missing: list[str] = []
+    for batch in occurrence_batches(anchor_slots, rule):
+        target_dates = batch_target_dates(batch)
+        candidates: list[TimeSlot] = []
+        if target_dates:
+            candidates = list(
+                session.exec(recurrence_statement(anchor_slots, target_dates))
+            )
+        match_batch(batch, candidates, target_slots, missing)
+    return matched_recurrence(target_slots, missing)
+
+
+def _hold_slots(session: Session, slots: list[TimeSlot]) -> None:
+    """
+    Atomically moves `slots` from available to held with one conditional UPDATE.
+
+    Raises:
+        BookingConflictError: If not every slot was still available; the
+        transaction is rolled back.
+    """
+    slot_ids = {slot.id for slot in slots}
+    result = session.exec(hold_statement(slot_ids))
+    if result.rowcount != len(slot_ids):
+        session.rollback()
+        raise conflict_error(session.exec(taken_statement(slot_ids)).all())
+
+    mark_held(slots)
+    record_slot_changes(session, changes_for(slots))
 
 
 def submit_booking(
@@ -109,171 +172,211 @@ def submit_booking(
     recurrence_freq: str | RecurrenceFrequency,
     recurrence_end_date,
     session: Session,
+    recurrence_weekdays: Iterable[str] = (),
+    recurrence_exclusions: Iterable[date] = (),
 ) -> Booking:
     recurrence_frequency = RecurrenceFrequency(recurrence_freq)
+    rule = recurrence_rule(
+        recurrence_frequency,
+        recurrence_end_date,
+        recurrence_weekdays,
+        recurrence_exclusions,
+    )
+    precheck_available(slot_ids)
     anchor_slots = _get_slots_by_id(session, slot_ids)
+    validate_submission(room_id, anchor_slots, rule)
 
-    for slot in anchor_slots:
-        if slot.room_id != room_id:
-            raise BookingConflictError(
-                f"TimeSlot {slot.id} does not belong to room {room_id}."
-            )
-
-    if recurrence_frequency == RecurrenceFrequency.WEEKLY:
-        if recurrence_end_date is None:
-            raise BookingServiceError(
-                "recurrence_end_date is required when recurrence_freq is weekly."
-            )
-        earliest_date = min(slot.slot_date for slot in anchor_slots)
-        if recurrence_end_date < earliest_date:
-            raise BookingServiceError(
-                "recurrence_end_date must be on or after the anchor slot date."
-            )
-    elif recurrence_end_date is not None:
-        raise BookingStateError(
-            "recurrence_end_date can only be provided for weekly recurrence."
-        )
-
-    target_slots = _resolve_recurrence(
-        session, anchor_slots, recurrence_frequency, recurrence_end_date
-    )
+    target_slots = _resolve_recurrence(session, anchor_slots, rule)
+    require_available(target_slots)
+    _hold_slots(session, target_slots)
 
-    unavailable_slots = [
-        slot.id for slot in target_slots if slot.status != TimeslotStatus.AVAILABLE
-    ]
-    if unavailable_slots:
-        slot_list = ", ".join(str(slot_id) for slot_id in unavailable_slots)
-        raise BookingConflictError(f"TimeSlot(s) unavailable: {slot_list}")
-
-    for slot in target_slots:
-        slot.hold()
-
-    booking = Booking(
-        userID=user.id,
-        submittedByRole=user.role,
-        roomID=room_id,
-        status=BookingStatus.PENDING,
-        recurrenceFrequency=recurrence_frequency,
-        recurrenceEndDate=recurrence_end_date,
-        timeSlots=target_slots,
+    booking = new_booking(
+        user, room_id, recurrence_frequency, recurrence_end_date, target_slots
     )
     session.add(booking)
     session.commit()
     session.refresh(booking)
-    return _get_booking(session, booking.id)
-
+    return _get_booking(session, booking.id)  # type: ignore[arg-type]
+
+
+def _write_transition(
+    session: Session, bookings: list[Booking], transition: BookingTransition
+) -> set[int]:
+    """
+    Writes `transition` for bookings whose loaded state already passed its checks,
+    moving only bookings and slots still in the expected state.
+
+    Returns:
+        set[int]: The ids of the bookings that were moved.
+
+    Raises:
+        BookingStateError: If a moved booking's slots were changed by another
+        request; the transaction is rolled back.
+    """
+    booking_ids = [booking.id for booking in bookings]
+    result = session.exec(transition_statement(booking_ids, transition))  # type: ignore[arg-type]
+    moved_ids = set(result.scalars())
+    moved = [booking for booking in bookings if booking.id in moved_ids]
+    if not moved:
+        return moved_ids
+
+    slots = session.exec(transition_slots_statement(list(moved_ids), transition))
+    unmoved = unmoved_slots(moved, slots.scalars())
+    if unmoved:
+        session.rollback()
+        raise slots_changed_concurrently(unmoved)
+
+    record_slot_changes(session, mark_transitioned(moved, transition))
+    return moved_ids
+
+
+def _transition(
+    session: Session, booking_id: int, transition: BookingTransition
+) -> Booking:
+    """
+    Applies a lifecycle transition and records its notification in one commit.
 
-def approve_booking(booking_id: int, session: Session) -> Booking:
+    Raises:
+        BookingStateError: If the booking is not in the required state, or
+        another request changed it after it was loaded.
+    """
     booking = _get_booking(session, booking_id)
-    if booking.status != BookingStatus.PENDING:
-        raise BookingStateError("Only pending bookings can be approved.")
-
-    invalid_slots = [
-        slot.id for slot in booking.timeSlots if slot.status != TimeslotStatus.HELD
-    ]
-    if invalid_slots:
-        slot_list = ", ".join(str(slot_id) for slot_id in invalid_slots)
-        raise BookingStateError(f"Booking slots are not held: {slot_list}")
+    check_transition(booking, transition)
+    if not _write_transition(session, [booking], transition):
+        session.rollback()
+        raise changed_concurrently(booking_id)
 
-    for slot in booking.timeSlots:
-        slot.book()
-
-    booking.status = BookingStatus.APPROVED
-    session.add(booking)
+    session.add(
+        build_notification(booking.userID, booking.id, transition.notification_type)
+    )
     session.commit()
-    session.refresh(booking)
-    return _get_booking(session, booking.id)
-
+    return booking
 
-def deny_booking(booking_id: int, session: Session) -> Booking:
-    booking = _get_booking(session, booking_id)
-    if booking.status != BookingStatus.PENDING:
-        raise BookingStateError("Only pending bookings can be denied.")
 
-    invalid_slots = [
-        slot.id for slot in booking.timeSlots if slot.status != TimeslotStatus.HELD
-    ]
-    if invalid_slots:
-        slot_list = ", ".join(str(slot_id) for slot_id in invalid_slots)
-        raise BookingStateError(f"Booking slots cannot be denied: {slot_list}")
+def approve_booking(booking_id: int, session: Session) -> Booking:
+    return _transition(session, booking_id, TRANSITIONS["approve"])
 
-    for slot in booking.timeSlots:
-        slot.release()
 
-    booking.status = BookingStatus.DENIED
-    session.add(booking)
-    session.commit()
-    session.refresh(booking)
-    return _get_booking(session, booking.id)
+def deny_booking(booking_id: int, session: Session) -> Booking:
+    return _transition(session, booking_id, TRANSITIONS["deny"])
 
 
 def cancel_booking(booking_id: int, session: Session) -> Booking:
-    booking = _get_booking(session, booking_id)
-    if booking.status != BookingStatus.APPROVED:
-        raise BookingStateError("Only approved bookings can be cancelled.")
+    return _transition(session, booking_id, TRANSITIONS["cancel"])
 
-    invalid_slots = [
-        slot.id for slot in booking.timeSlots if slot.status != TimeslotStatus.BOOKED
-    ]
-    if invalid_slots:
-        slot_list = ", ".join(str(slot_id) for slot_id in invalid_slots)
-        raise BookingStateError(f"Booking slots cannot be cancelled: {slot_list}")
 
-    for slot in booking.timeSlots:
-        slot.release()
+def get_pending_bookings(session: Session) -> list[Booking]:
+    return list(session.exec(pending_bookings_statement()))
 
-    booking.status = BookingStatus.CANCELLED
-    session.add(booking)
-    session.commit()
-    session.refresh(booking)
-    return _get_booking(session, booking.id)
 
+def get_booking(booking_id: int, user: User, session: Session) -> Booking:
+    """
+    Returns one booking with its slots, if `user` owns it or is an admin.
 
-def get_pending_bookings(session: Session) -> list[Booking]:
-    statement = (
-        select(Booking)
-        .where(Booking.status == BookingStatus.PENDING)
-        .options(selectinload(Booking.timeSlots))
-    )
-    return list(session.exec(statement))
+    Raises:
+        BookingNotFoundError: If the booking does not exist or belongs to
+        another user.
+    """
+    return require_visible(_get_booking(session, booking_id), user)
 
 
 def get_user_bookings(
     user_id, session: Session, status: str | BookingStatus | None = None
 ) -> list[Booking]:
-    statement = (
-        select(Booking)
-        .where(Booking.userID == user_id)
-        .options(selectinload(Booking.timeSlots))
-    )
-    if status is not None:
-        statement = statement.where(Booking.status == BookingStatus(status))
-
-    statement = statement.order_by(Booking.createdAt.desc(), Booking.id.desc())
-    return list(session.exec(statement))
+    return list(session.exec(user_bookings_statement(user_id, status)))
 
 
 def get_all_bookings(
     session: Session, status: str | BookingStatus | None = None
 ) -> list[Booking]:
-    statement = select(Booking).options(selectinload(Booking.timeSlots))
-    if status is not None:
-        statement = statement.where(Booking.status == BookingStatus(status))
+    return list(session.exec(all_bookings_statement(status)))
+
+
+def get_user_bookings_page(
+    user_id,
+    session: Session,
+    status: str | BookingStatus | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_room: bool = False,
+) -> BookingPage:
+    """
+    Returns one page of a user's bookings, newest first, after `cursor`.
+    """
+    statement = user_bookings_statement(
+        user_id, status, look_ahead(limit), decode_cursor(cursor), include_room
+    )
+    return to_page(list(session.exec(statement)), limit, include_room)
 
-    statement = statement.order_by(Booking.createdAt.desc(), Booking.id.desc())
-    return list(session.exec(statement))
+
+def get_all_bookings_page(
+    session: Session,
+    status: str | BookingStatus | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
+    include_room: bool = False,
+) -> BookingPage:
+    """
+    Returns one page of all bookings, newest first, after `cursor`.
+    """
+    statement = all_bookings_statement(
+        status, look_ahead(limit), decode_cursor(cursor), include_room
+    )
+    return to_page(list(session.exec(statement)), limit, include_room)
 
 
-_ACTION_MAP: dict[str, tuple] = {
-    "approve": (approve_booking, NotificationType.APPROVED),
-    "deny": (deny_booking, NotificationType.DENIED),
-    "cancel": (cancel_booking, NotificationType.CANCELLED),
+_ACTION_MAP = {
+    "approve": approve_booking,
+    "deny": deny_booking,
+    "cancel": cancel_booking,
 }
 
 
 def process_booking_action(booking_id: int, action: str, session: Session) -> Booking:
-    """Execute a booking lifecycle action and send the corresponding notification."""
-    action_fn, notification_type = _ACTION_MAP[action]
-    booking = action_fn(booking_id, session)
-    send_notification(booking.userID, booking.id, notification_type, session)
-    return booking
+    """Execute a booking lifecycle action, which also records its notification."""
+    return _ACTION_MAP[action](booking_id, session)
+
+
+def process_booking_actions(
+    actions: list[tuple[int, str]], session: Session
+) -> list[BookingActionOutcome]:
+    """
+    Applies many booking lifecycle actions in a single transaction.
+
+    Raises:
+        BookingStateError: If a booking's slots were changed by another
+        request while the booking itself was not; nothing is committed.
+    """
+    booking_ids = {booking_id for booking_id, _ in actions}
+    result = session.exec(bookings_by_ids_statement(booking_ids))
+    outcomes, passed = check_actions(list(result.unique()), actions)
+    moved = {
+        action: _write_transition(session, bookings, TRANSITIONS[action])
+        for action, bookings in passed.items()
+    }
+    outcomes, notifications = settle_actions(outcomes, moved)
+    session.add_all(notifications)
+    session.commit()
+    return outcomes
+
+
+def expire_stale_bookings(
+    cutoff: datetime, session: Session, batch_size: int = 500
+) -> list[int]:
+    """
+    Expires pending bookings created before `cutoff` and releases their held slots.
+
+    Returns:
+        list[int]: The ids of the bookings that were expired.
+    """
+    expired = list(session.exec(expire_statement(cutoff, batch_size)))
+    if not expired:
+        session.rollback()
+        return []
+
+    booking_ids = [booking_id for booking_id, _ in expired]
+    released = session.exec(release_holds_statement(booking_ids))
+    record_slot_changes(session, released_changes(released))
+    session.add_all(expiry_notifications(expired))
+    session.commit()
+    return booking_ids
@@ -0,0 +1,793 @@
+"""
+Booking workflow steps.
+
+Holds the parts of the booking workflow that do not perform I/O: the error
+types, the statement builders, and the checks and in-memory transitions
+applied between statements. `app.services.async_booking_service` runs these
+steps on an `AsyncSession`, and `app.services.booking_service` exposes the same
+workflow synchronously.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import heapq
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator, NamedTuple
+
+from sqlalchemy import tuple_, update
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+
+from app.models import (
+    WEEKDAY_NAMES,
+    Booking,
+    BookingStatus,
+    Notification,
+    NotificationType,
+    RecurrenceFrequency,
+    RecurrenceRule,
+    Room,
+    TimeSlot,
+    TimeslotStatus,
+    User,
+    UserRole,
+)
+from app.services.availability_index import availability_index
+from app.services.notification_service import build_notification
+from app.services.slot_events import SlotChange, changes_for
+
+
+class BookingServiceError(ValueError):
+    """Base booking workflow error."""
+
+
+class BookingNotFoundError(BookingServiceError):
+    """Raised when a booking or timeslot cannot be found."""
+
+
+class BookingConflictError(BookingServiceError):
+    """Raised when a slot cannot be booked because it is unavailable."""
+
+
+class BookingStateError(BookingServiceError):
+    """Raised when a booking lifecycle transition is invalid."""
+
+
+class BookingActionOutcome(NamedTuple):
+    """
+    Result of one item in a bulk booking action request.
+    """
+
+    booking_id: int
+    """The booking the action targeted."""
+    action: str
+    """The requested action (`approve`, `deny` or `cancel`)."""
+    booking: Booking | None
+    """The updated booking, or `None` if the action failed."""
+    error: BookingServiceError | None
+    """Why the action failed, or `None` if it succeeded."""
+
+
+class BookingPage(NamedTuple):
+    """
+    One page of a keyset-paginated booking listing.
+    """
+
+    items: list[Booking]
+    """The bookings on this page, newest first."""
+    next_cursor: str | None
+    """Opaque cursor for the following page, or `None` on the last page."""
+    rooms: dict[int, Room] | None = None
+    """The rooms of the bookings by id, when the listing joined them in."""
+
+
+# ── Statement builders ─────────────────────────────────────────────────────
+
+
+def booking_statement(booking_id: int):
+    return (
+        select(Booking)
+        .where(Booking.id == booking_id)
+        .options(joinedload(Booking.timeSlots))
+    )
+
+
+def slots_statement(slot_ids: list[int]):
+    return select(TimeSlot).where(TimeSlot.id.in_(slot_ids))
+
+
+def recurrence_statement(anchor_slots: list[TimeSlot], target_dates: set[date]):
+    return select(TimeSlot).where(
+        TimeSlot.room_id.in_({slot.room_id for slot in anchor_slots}),
+        TimeSlot.slot_date.in_(target_dates),
+        TimeSlot.start_time.in_({slot.start_time for slot in anchor_slots}),
+    )
+
+
+def hold_statement(slot_ids: set[int]):
+    return (
+        update(TimeSlot)
+        .where(
+            TimeSlot.id.in_(slot_ids),
+            TimeSlot.status == TimeslotStatus.AVAILABLE,
+        )
+        .values(status=TimeslotStatus.HELD)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def taken_statement(slot_ids: set[int]):
+    return select(TimeSlot.id).where(
+        TimeSlot.id.in_(slot_ids),
+        TimeSlot.status != TimeslotStatus.AVAILABLE,
+    )
+
+
+def bookings_by_ids_statement(booking_ids: set[int]):
+    return (
+        select(Booking)
+        .where(Booking.id.in_(booking_ids))
+        .options(joinedload(Booking.timeSlots))
+    )
+
+
+def expire_statement(cutoff: datetime, batch_size: int):
+    """
+    Marks up to `batch_size` pending bookings created before `cutoff` as expired.
+
+    The candidates come from the `(status, createdAt)` index, and the `RETURNING`
+    clause hands back `(id, userID)` so no separate lookup is needed.
+    """
+    stale = (
+        select(Booking.id)
+        .where(Booking.status == BookingStatus.PENDING, Booking.createdAt < cutoff)
+        .order_by(Booking.createdAt)
+        .limit(batch_size)
+    )
+    return (
+        update(Booking)
+        .where(Booking.id.in_(stale), Booking.status == BookingStatus.PENDING)
+        .values(status=BookingStatus.EXPIRED)
+        .returning(Booking.id, Booking.userID)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_holds_statement(booking_ids: list[int]):
+    return (
+        update(TimeSlot)
+        .where(
+            TimeSlot.booking_id.in_(booking_ids),
+            TimeSlot.status == TimeslotStatus.HELD,
+        )
+        .values(status=TimeslotStatus.AVAILABLE)
+        .returning(
+            TimeSlot.id,
+            TimeSlot.room_id,
+            TimeSlot.slot_date,
+            TimeSlot.start_time,
+            TimeSlot.end_time,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def released_changes(rows) -> list[SlotChange]:
+    return [SlotChange(*row, TimeslotStatus.AVAILABLE) for row in rows]
+
+
+def pending_bookings_statement():
+    return (
+        select(Booking)
+        .where(Booking.status == BookingStatus.PENDING)
+        .options(selectinload(Booking.timeSlots))
+    )
+
+
+def user_bookings_statement(
+    user_id,
+    status: str | BookingStatus | None,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+    include_room: bool = False,
+):
+    statement = _booking_select(include_room).where(Booking.userID == user_id)
+    return _listing(statement, status, limit, after)
+
+
+def all_bookings_statement(
+    status: str | BookingStatus | None,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+    include_room: bool = False,
+):
+    return _listing(_booking_select(include_room), status, limit, after)
+
+
+def _booking_select(include_room: bool):
+    """
+    Selects bookings, or `(Booking, Room)` rows with the room joined in.
+    """
+    if include_room:
+        return select(Booking, Room).join(Room, Room.id == Booking.roomID)
+    return select(Booking)
+
+
+def _listing(
+    statement,
+    status: str | BookingStatus | None,
+    limit: int | None,
+    after: tuple[datetime, int] | None,
+):
+    """
+    Applies the status filter, the `(createdAt, id)` keyset and the newest-first order.
+    """
+    statement = statement.options(selectinload(Booking.timeSlots))
+    if status is not None:
+        statement = statement.where(Booking.status == BookingStatus(status))
+    if after is not None:
+        statement = statement.where(tuple_(Booking.createdAt, Booking.id) < after)
+
+    statement = statement.order_by(Booking.createdAt.desc(), Booking.id.desc())
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+RECURRENCE_BATCH_DAYS = 200
+"""Distinct occurrence dates resolved per recurrence query."""
+
+MAX_RECURRENCE_OCCURRENCES = 520
+"""Most occurrences a single anchor slot may expand into (ten years of weeks)."""
+
+EXPORT_CHUNK_SIZE = 1000
+"""Rows fetched per round trip when streaming a booking export."""
+
+_EXPORT_COLUMNS = {
+    "booking_id": Booking.id,
+    "user_id": Booking.userID,
+    "room_id": Booking.roomID,
+    "booking_status": Booking.status,
+    "submitted_by_role": Booking.submittedByRole,
+    "recurrence_frequency": Booking.recurrenceFrequency,
+    "recurrence_end_date": Booking.recurrenceEndDate,
+    "created_at": Booking.createdAt,
+    "slot_id": TimeSlot.id,
+    "slot_date": TimeSlot.slot_date,
+    "start_time": TimeSlot.start_time,
+    "end_time": TimeSlot.end_time,
+    "slot_status": TimeSlot.status,
+}
+
+EXPORT_FIELDS = tuple(_EXPORT_COLUMNS)
+"""Column names of a booking export row, one row per booking slot."""
+
+
+def export_statement(
+    status: str | BookingStatus | None,
+    created_from: datetime | None,
+    created_before: datetime | None,
+):
+    """
+    Selects one flat row per booking slot, oldest booking first.
+
+    Only plain columns are selected, so rows can be streamed without building
+    ORM objects. Bookings without slots still produce one row.
+    """
+    statement = select(
+        *(column.label(name) for name, column in _EXPORT_COLUMNS.items())
+    ).outerjoin(TimeSlot, TimeSlot.booking_id == Booking.id)
+    if status is not None:
+        statement = statement.where(Booking.status == BookingStatus(status))
+    if created_from is not None:
+        statement = statement.where(Booking.createdAt >= created_from)
+    if created_before is not None:
+        statement = statement.where(Booking.createdAt < created_before)
+    return statement.order_by(
+        Booking.createdAt, Booking.id, TimeSlot.slot_date, TimeSlot.start_time
+    ).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+
+
+# ── In-memory workflow steps ───────────────────────────────────────────────
+
+
+def _as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def _encode_cursor(booking: Booking) -> str:
+    raw = f"{_as_utc(booking.createdAt).isoformat()}|{booking.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """
+    Decodes a cursor produced by `_encode_cursor` back into its `(createdAt, id)` key.
+
+    Raises:
+        BookingServiceError: If the cursor is malformed.
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, booking_id = (
+            base64.urlsafe_b64decode(padded).decode().split("|")
+        )
+        return _as_utc(datetime.fromisoformat(created_at)), int(booking_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise BookingServiceError("Invalid pagination cursor.") from exc
+
+
+def to_page(rows: list, limit: int | None, include_room: bool = False) -> BookingPage:
+    """
+    Trims the look-ahead row fetched past `limit` and derives the next cursor.
+
+    With `include_room`, `rows` are `(Booking, Room)` pairs and the rooms are
+    returned alongside the bookings.
+    """
+    rooms = None
+    if include_room:
+        rooms = {room.id: room for _, room in rows}
+        rows = [booking for booking, _ in rows]
+    if limit is None or len(rows) <= limit:
+        return BookingPage(rows, None, rooms)
+    page = rows[:limit]
+    return BookingPage(page, _encode_cursor(page[-1]), rooms)
+
+
+def look_ahead(limit: int | None) -> int | None:
+    return None if limit is None else limit + 1
+
+
+def require_found(booking: Booking | None, booking_id: int) -> Booking:
+    if booking is None:
+        raise BookingNotFoundError(f"Booking {booking_id} was not found.")
+    return booking
+
+
+def require_visible(booking: Booking, user: User) -> Booking:
+    """
+    Hides other users' bookings from non-admins as if they did not exist.
+    """
+    if user.role != UserRole.ADMIN and booking.userID != user.id:
+        raise BookingNotFoundError(f"Booking {booking.id} was not found.")
+    return booking
+
+
+def booking_etag(booking: Booking) -> str:
+    """
+    Returns the strong entity tag of a booking's current state.
+
+    Only the status of a booking changes after submission, and its slots
+    follow that status, so the id, creation time and status identify it.
+    """
+    created = _as_utc(booking.createdAt).timestamp()
+    return f'"b{booking.id}-{created:.6f}-{booking.status.value}"'
+
+
+def require_slot_ids(slot_ids: list[int]) -> None:
+    if not slot_ids:
+        raise BookingServiceError("At least one slot id is required.")
+
+
+def order_slots(slot_ids: list[int], slots: list[TimeSlot]) -> list[TimeSlot]:
+    slots_by_id = {slot.id: slot for slot in slots}
+    missing_ids = [slot_id for slot_id in slot_ids if slot_id not in slots_by_id]
+    if missing_ids:
+        missing = ", ".join(str(slot_id) for slot_id in missing_ids)
+        raise BookingNotFoundError(f"TimeSlot(s) not found: {missing}")
+
+    return [slots_by_id[slot_id] for slot_id in slot_ids]
+
+
+def recurrence_rule(
+    recurrence_frequency: RecurrenceFrequency,
+    recurrence_end_date: date | None,
+    recurrence_weekdays: Iterable[str],
+    recurrence_exclusions: Iterable[date],
+) -> RecurrenceRule:
+    weekdays = set()
+    for name in recurrence_weekdays:
+        if name not in WEEKDAY_NAMES:
+            allowed = ", ".join(WEEKDAY_NAMES)
+            raise BookingServiceError(
+                f"Invalid weekday '{name}'. Must be one of: {allowed}"
+            )
+        weekdays.add(WEEKDAY_NAMES.index(name))
+    return RecurrenceRule(
+        recurrence_frequency,
+        recurrence_end_date,
+        frozenset(weekdays),
+        frozenset(recurrence_exclusions),
+    )
+
+
+def validate_submission(
+    room_id: int,
+    anchor_slots: list[TimeSlot],
+    rule: RecurrenceRule,
+) -> None:
+    for slot in anchor_slots:
+        if slot.room_id != room_id:
+            raise BookingConflictError(
+                f"TimeSlot {slot.id} does not belong to room {room_id}."
+            )
+
+    if rule.frequency == RecurrenceFrequency.NONE:
+        if rule.until is not None:
+            raise BookingStateError(
+                "recurrence_end_date can only be provided for recurring bookings."
+            )
+        if rule.weekdays or rule.exclusions:
+            raise BookingServiceError(
+                "recurrence_weekdays and recurrence_exclusions can only be "
+                "provided for recurring bookings."
+            )
+        return
+
+    if rule.until is None:
+        raise BookingServiceError(
+            "recurrence_end_date is required when recurrence_freq is "
+            f"{rule.frequency.value}."
+        )
+    earliest_date = min(slot.slot_date for slot in anchor_slots)
+    if rule.until < earliest_date:
+        raise BookingServiceError(
+            "recurrence_end_date must be on or after the anchor slot date."
+        )
+    if rule.weekdays and rule.frequency == RecurrenceFrequency.MONTHLY_BY_WEEKDAY:
+        raise BookingServiceError(
+            "recurrence_weekdays can only be provided for weekly or biweekly "
+            "recurrence."
+        )
+
+
+def _anchor_occurrences(
+    position: int, slot: TimeSlot, rule: RecurrenceRule
+) -> Iterator[tuple[date, int, TimeSlot]]:
+    for index, occurrence in enumerate(rule.occurrences(slot.slot_date)):
+        if index == MAX_RECURRENCE_OCCURRENCES:
+            raise BookingServiceError(
+                f"Recurrence produces more than {MAX_RECURRENCE_OCCURRENCES} "
+                f"occurrences of TimeSlot {slot.id}."
+            )
+        yield occurrence, position, slot
+
+
+def occurrence_batches(
+    anchor_slots: list[TimeSlot], rule: RecurrenceRule
+) -> Iterator[list[tuple[date, TimeSlot]]]:
+    """
+    Lazily merges every anchor slot's occurrences into date order and cuts the
+    stream into batches spanning at most `RECURRENCE_BATCH_DAYS` dates.
+
+    Only one batch of occurrences is materialized at a time, and each batch is
+    resolved with a single query.
+    """
+    merged = heapq.merge(
+        *(
+            _anchor_occurrences(position, slot, rule)
+            for position, slot in enumerate(anchor_slots)
+        )
+    )
+    batch: list[tuple[date, TimeSlot]] = []
+    dates: set[date] = set()
+    for occurrence, _, slot in merged:
+        if occurrence not in dates and len(dates) == RECURRENCE_BATCH_DAYS:
+            yield batch
+            batch, dates = [], set()
+        dates.add(occurrence)
+        batch.append((occurrence, slot))
+    if batch:
+        yield batch
+
+
+def batch_target_dates(batch: list[tuple[date, TimeSlot]]) -> set[date]:
+    return {occurrence for occurrence, slot in batch if occurrence != slot.slot_date}
+
+
+def match_batch(
+    batch: list[tuple[date, TimeSlot]],
+    candidates: list[TimeSlot],
+    target_slots: dict[int, TimeSlot],
+    missing: list[str],
+) -> None:
+    """
+    Matches one batch of occurrences against the candidate slots fetched for it.
+
+    Matched slots are added to `target_slots` (keyed by id, so an occurrence
+    that lands on another anchor slot is held once) and unmatched occurrences
+    are described in `missing`.
+    """
+    by_key: dict[tuple, TimeSlot] = {}
+    for candidate in candidates:
+        key = (
+            candidate.room_id,
+            candidate.slot_date,
+            candidate.start_time,
+            candidate.end_time,
+        )
+        by_key.setdefault(key, candidate)
+
+    for occurrence, slot in batch:
+        if occurrence == slot.slot_date:
+            target_slots.setdefault(slot.id, slot)  # type: ignore[arg-type]
+            continue
+
+        key = (slot.room_id, occurrence, slot.start_time, slot.end_time)
+        recurring_slot = by_key.get(key)
+        if recurring_slot is None:
+            missing.append(
+                f"{occurrence.isoformat()} {slot.start_time}-{slot.end_time}"
+            )
+        else:
+            target_slots.setdefault(recurring_slot.id, recurring_slot)  # type: ignore[arg-type]
+
+
+def matched_recurrence(
+    target_slots: dict[int, TimeSlot], missing: list[str]
+) -> list[TimeSlot]:
+    """
+    Raises:
+        BookingNotFoundError: If any occurrence had no matching `TimeSlot`.
+    """
+    if missing:
+        raise BookingNotFoundError(
+            "Recurring timeslot(s) not found for " + ", ".join(missing) + "."
+        )
+    return list(target_slots.values())
+
+
+def require_available(slots: list[TimeSlot]) -> None:
+    unavailable_slots = [
+        slot.id for slot in slots if slot.status != TimeslotStatus.AVAILABLE
+    ]
+    if unavailable_slots:
+        slot_list = ", ".join(str(slot_id) for slot_id in unavailable_slots)
+        raise BookingConflictError(f"TimeSlot(s) unavailable: {slot_list}")
+
+
+def precheck_available(slot_ids: list[int]) -> None:
+    """
+    Rejects slots the availability index already knows are taken, before any query.
+    """
+    taken = availability_index.unavailable(slot_ids)
+    if taken:
+        raise conflict_error(taken)
+
+
+def conflict_error(taken_ids) -> BookingConflictError:
+    slot_list = ", ".join(str(slot_id) for slot_id in sorted(taken_ids))
+    return BookingConflictError(f"TimeSlot(s) unavailable: {slot_list}")
+
+
+def mark_held(slots: list[TimeSlot]) -> None:
+    for slot in slots:
+        set_committed_value(slot, "status", TimeslotStatus.HELD)
+
+
+def new_booking(
+    user: User,
+    room_id: int,
+    recurrence_frequency: RecurrenceFrequency,
+    recurrence_end_date,
+    target_slots: list[TimeSlot],
+) -> Booking:
+    return Booking(
+        userID=user.id,
+        submittedByRole=user.role,
+        roomID=room_id,
+        status=BookingStatus.PENDING,
+        recurrenceFrequency=recurrence_frequency,
+        recurrenceEndDate=recurrence_end_date,
+        timeSlots=target_slots,
+    )
+
+
+class BookingTransition(NamedTuple):
+    """
+    One lifecycle transition of a booking together with its slots.
+    """
+
+    booking_from: BookingStatus
+    """The status the booking must still have when it is written."""
+    booking_to: BookingStatus
+    """The status the booking moves to."""
+    slot_from: TimeslotStatus
+    """The status every slot of the booking must still have."""
+    slot_to: TimeslotStatus
+    """The status the slots move to."""
+    notification_type: NotificationType
+    """The notification sent to the booking's owner."""
+    status_error: str
+    """Reported when the booking is not in `booking_from`."""
+    slot_error: str
+    """Reported, followed by the slot ids, when slots are not in `slot_from`."""
+
+
+TRANSITIONS: dict[str, BookingTransition] = {
+    "approve": BookingTransition(
+        BookingStatus.PENDING,
+        BookingStatus.APPROVED,
+        TimeslotStatus.HELD,
+        TimeslotStatus.BOOKED,
+        NotificationType.APPROVED,
+        "Only pending bookings can be approved.",
+        "Booking slots are not held",
+    ),
+    "deny": BookingTransition(
+        BookingStatus.PENDING,
+        BookingStatus.DENIED,
+        TimeslotStatus.HELD,
+        TimeslotStatus.AVAILABLE,
+        NotificationType.DENIED,
+        "Only pending bookings can be denied.",
+        "Booking slots cannot be denied",
+    ),
+    "cancel": BookingTransition(
+        BookingStatus.APPROVED,
+        BookingStatus.CANCELLED,
+        TimeslotStatus.BOOKED,
+        TimeslotStatus.AVAILABLE,
+        NotificationType.CANCELLED,
+        "Only approved bookings can be cancelled.",
+        "Booking slots cannot be cancelled",
+    ),
+}
+"""The admin lifecycle actions by name."""
+
+
+def transition_statement(booking_ids: list[int], transition: BookingTransition):
+    """
+    Moves the bookings that are still in `booking_from`, returning their ids.
+    """
+    return (
+        update(Booking)
+        .where(
+            Booking.id.in_(booking_ids),
+            Booking.status == transition.booking_from,
+        )
+        .values(status=transition.booking_to)
+        .returning(Booking.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def transition_slots_statement(booking_ids: list[int], transition: BookingTransition):
+    """
+    Moves the bookings' slots that are still in `slot_from`, returning their ids.
+    """
+    return (
+        update(TimeSlot)
+        .where(
+            TimeSlot.booking_id.in_(booking_ids),
+            TimeSlot.status == transition.slot_from,
+        )
+        .values(status=transition.slot_to)
+        .returning(TimeSlot.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def check_transition(booking: Booking, transition: BookingTransition) -> None:
+    """
+    Checks the loaded state of a booking before it is written.
+
+    The writes repeat these conditions, so a booking changed by another
+    transaction after it was loaded is still caught.
+    """
+    if booking.status != transition.booking_from:
+        raise BookingStateError(transition.status_error)
+
+    invalid_slots = [
+        slot.id for slot in booking.timeSlots if slot.status != transition.slot_from
+    ]
+    if invalid_slots:
+        slot_list = ", ".join(str(slot_id) for slot_id in invalid_slots)
+        raise BookingStateError(f"{transition.slot_error}: {slot_list}")
+
+
+def changed_concurrently(booking_id: int) -> BookingStateError:
+    return BookingStateError(
+        f"Booking {booking_id} was changed by another request; reload it and retry."
+    )
+
+
+def unmoved_slots(bookings: list[Booking], moved_slot_ids: Iterable[int]) -> set[int]:
+    """
+    Returns the ids of the bookings' slots that a transition did not move.
+    """
+    unmoved = {slot.id for booking in bookings for slot in booking.timeSlots}
+    unmoved.difference_update(moved_slot_ids)
+    return unmoved  # type: ignore[return-value]
+
+
+def slots_changed_concurrently(slot_ids: set[int]) -> BookingStateError:
+    slot_list = ", ".join(str(slot_id) for slot_id in sorted(slot_ids))
+    return BookingStateError(
+        f"Booking slots were changed by another request: {slot_list}"
+    )
+
+
+def mark_transitioned(
+    bookings: list[Booking], transition: BookingTransition
+) -> list[SlotChange]:
+    """
+    Records the written state on the loaded bookings and returns the slot changes.
+    """
+    for booking in bookings:
+        set_committed_value(booking, "status", transition.booking_to)
+        for slot in booking.timeSlots:
+            set_committed_value(slot, "status", transition.slot_to)
+    return changes_for(slot for booking in bookings for slot in booking.timeSlots)
+
+
+def check_actions(
+    bookings: list[Booking], actions: list[tuple[int, str]]
+) -> tuple[list[BookingActionOutcome], dict[str, list[Booking]]]:
+    """
+    Checks each `(booking_id, action)` pair against the already loaded bookings.
+
+    Returns one outcome per pair, with the error filled in for pairs that
+    failed, and the bookings that passed grouped by action so each action can
+    be written with one statement. Only the first pair for a booking is
+    applied; later pairs for the same booking fail.
+    """
+    bookings_by_id = {booking.id: booking for booking in bookings}
+    outcomes: list[BookingActionOutcome] = []
+    passed: dict[str, list[Booking]] = {}
+    seen: set[int] = set()
+
+    for booking_id, action in actions:
+        try:
+            if booking_id in seen:
+                raise BookingServiceError(
+                    f"Booking {booking_id} appears more than once in the batch."
+                )
+            seen.add(booking_id)
+            booking = require_found(bookings_by_id.get(booking_id), booking_id)
+            check_transition(booking, TRANSITIONS[action])
+        except BookingServiceError as exc:
+            outcomes.append(BookingActionOutcome(booking_id, action, None, exc))
+            continue
+
+        passed.setdefault(action, []).append(booking)
+        outcomes.append(BookingActionOutcome(booking_id, action, booking, None))
+
+    return outcomes, passed
+
+
+def settle_actions(
+    outcomes: list[BookingActionOutcome], moved: dict[str, set[int]]
+) -> tuple[list[BookingActionOutcome], list[Notification]]:
+    """
+    Fails the checked outcomes whose booking was not moved by their action,
+    and builds one unsaved notification for each outcome whose booking was.
+    """
+    settled: list[BookingActionOutcome] = []
+    notifications: list[Notification] = []
+    for outcome in outcomes:
+        booking = outcome.booking
+        if booking is not None and booking.id not in moved[outcome.action]:
+            error = changed_concurrently(outcome.booking_id)
+            outcome = outcome._replace(booking=None, error=error)
+        elif booking is not None:
+            notification_type = TRANSITIONS[outcome.action].notification_type
+            notifications.append(
+                build_notification(booking.userID, booking.id, notification_type)
+            )
+        settled.append(outcome)
+    return settled, notifications
+
+
+def expiry_notifications(expired: list[tuple[int, object]]) -> list[Notification]:
+    return [
+        build_notification(user_id, booking_id, NotificationType.EXPIRED)
+        for booking_id, user_id in expired
+    ]
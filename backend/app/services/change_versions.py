@@ -0,0 +1,66 @@
+"""
+Change Versions Module.
+
+Tracks a change version per key for the in-memory caches, so a value loaded
+from the database is only stored if its key did not change while the load was
+in flight.
+
+Versions are drawn from one sequence shared by every key, and only the most
+recently changed keys are remembered. A forgotten key reports the newest
+version forgotten so far, which is never older than any version it had, so
+pruning the map can make a load skip storing its value but never lets a stale
+value through.
+"""
+
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+
+class ChangeVersions(Generic[K]):
+    """
+    Bounded map from keys to the version of their latest change.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._versions: OrderedDict[K, int] = OrderedDict()
+        self._sequence = 0
+        self._forgotten = 0
+
+    def __len__(self) -> int:
+        return len(self._versions)
+
+    def get(self, key: K) -> int:
+        """
+        Returns the current version of `key`.
+        """
+        return self._versions.get(key, self._forgotten)
+
+    def bump(self, key: K) -> None:
+        """
+        Records a change to `key`, forgetting the least recently changed keys
+        beyond capacity.
+        """
+        self._sequence += 1
+        self._versions[key] = self._sequence
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.capacity:
+            _, version = self._versions.popitem(last=False)
+            self._forgotten = max(self._forgotten, version)
+
+    def forget(self, key: K) -> None:
+        """
+        Drops the version of `key`, for example when its cached value is evicted.
+        """
+        version = self._versions.pop(key, None)
+        if version is not None:
+            self._forgotten = max(self._forgotten, version)
+
+    def clear(self) -> None:
+        """
+        Forgets every key.
+        """
+        self._forgotten = self._sequence
+        self._versions.clear()
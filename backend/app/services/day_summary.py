@@ -0,0 +1,126 @@
+"""
+Day Summary Service Module.
+
+Maintains the `DaySummary` table, one row per date holding how many slots are
+still available, so the booking calendar is a small primary-key range read
+instead of a scan of `TimeSlot`.
+
+Every commit that changes slots recomputes the rows of the dates it touched
+inside the same transaction, using the changes `app.services.slot_events`
+collected for that session. That covers the booking lifecycle, hold expiry,
+recurring bookings and slot generation alike. Writes that bypass the session
+(raw SQL, bulk imports) are repaired with the rebuild command:
+
+    python -m app.services.day_summary
+"""
+
+import asyncio
+import calendar
+from datetime import MAXYEAR, MINYEAR, date
+from typing import Iterable
+
+from loguru import logger
+from sqlalchemy import delete, event, func, insert
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import DaySummary, TimeSlot, TimeslotStatus
+from app.services.slot_events import pending_slot_changes
+
+REFRESH_BATCH_DAYS = 500
+"""Maximum number of dates recomputed per statement."""
+
+
+def _available_counts(dates: list[date] | None = None):
+    statement = select(TimeSlot.slot_date, func.count()).where(
+        TimeSlot.status == TimeslotStatus.AVAILABLE
+    )
+    if dates is not None:
+        statement = statement.where(TimeSlot.slot_date.in_(dates))
+    return statement.group_by(TimeSlot.slot_date)
+
+
+def _refresh_statements(dates: Iterable[date]):
+    """
+    Yields the statements recomputing the summary rows of `dates`.
+    """
+    ordered = sorted(set(dates))
+    for start in range(0, len(ordered), REFRESH_BATCH_DAYS):
+        batch = ordered[start : start + REFRESH_BATCH_DAYS]
+        yield delete(DaySummary).where(DaySummary.slot_date.in_(batch))
+        yield insert(DaySummary).from_select(
+            ["slot_date", "available_count"], _available_counts(batch)
+        )
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_touched_days(session: Session) -> None:
+    session.flush()
+    dates = {change.slot_date for change in pending_slot_changes(session)}
+    if not dates:
+        return
+    connection = session.connection()
+    for statement in _refresh_statements(dates):
+        connection.execute(statement)
+
+
+async def get_summary_available_dates(
+    year: int, month: int, session: AsyncSession
+) -> list[date]:
+    """
+    Returns the dates in `year`/`month` with at least one available slot.
+    """
+    if not MINYEAR <= year <= MAXYEAR:
+        return []
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    statement = (
+        select(DaySummary.slot_date)
+        .where(DaySummary.slot_date >= first, DaySummary.slot_date <= last)
+        .where(DaySummary.available_count > 0)
+        .order_by(DaySummary.slot_date)  # type: ignore[arg-type]
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def rebuild_day_summary(session: AsyncSession) -> int:
+    """
+    Recomputes every summary row from `TimeSlot`.
+
+    Returns:
+        int: The number of dates that have at least one available slot.
+    """
+    await session.exec(delete(DaySummary))
+    result = await session.exec(
+        insert(DaySummary).from_select(
+            ["slot_date", "available_count"], _available_counts()
+        )
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def ensure_day_summary(session: AsyncSession) -> None:
+    """
+    Rebuilds the summary if it is empty while slots exist, as happens when a
+    database created before the summary table is opened for the first time.
+    """
+    summarized = (await session.exec(select(DaySummary.slot_date).limit(1))).first()
+    if summarized is not None:
+        return
+    if (await session.exec(select(TimeSlot.id).limit(1))).first() is not None:
+        rows = await rebuild_day_summary(session)
+        logger.info(f"Rebuilt the day summary for {rows} dates.")
+
+
+async def _rebuild() -> None:
+    from app.database import engine
+
+    async with AsyncSession(engine) as session:
+        rows = await rebuild_day_summary(session)
+    logger.info(f"Rebuilt the day summary for {rows} dates.")
+
+
+if __name__ == "__main__":
+    asyncio.run(_rebuild())
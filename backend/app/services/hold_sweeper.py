@@ -0,0 +1,77 @@
+"""
+Hold Expiry Sweeper Module.
+
+Runs an in-process periodic task that expires `PENDING` bookings older than
+the configured hold TTL, so slots an admin never acted on return to the pool
+of available inventory. The task is started and stopped by the application
+`lifespan` in `app.main`.
+"""
+
+import asyncio
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import engine
+from app.env import get_hold_sweep_interval, get_hold_ttl
+from app.services.async_booking_service import expire_stale_bookings
+
+SWEEP_BATCH_SIZE = 500
+"""Maximum number of bookings expired per transaction."""
+
+
+async def sweep_expired_holds(ttl: timedelta, session: AsyncSession) -> int:
+    """
+    Expires every pending booking older than `ttl`, one batch at a time.
+
+    Returns:
+        int: The number of bookings that were expired.
+    """
+    cutoff = datetime.now(timezone.utc) - ttl
+    total = 0
+    while True:
+        expired = await expire_stale_bookings(cutoff, session, SWEEP_BATCH_SIZE)
+        total += len(expired)
+        if len(expired) < SWEEP_BATCH_SIZE:
+            return total
+
+
+async def run_hold_sweeper(interval: float, ttl: timedelta) -> None:
+    """
+    Sweeps expired holds every `interval` seconds until cancelled.
+
+    Failures are logged and retried on the next tick instead of stopping the loop.
+    """
+    while True:
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                expired = await sweep_expired_holds(ttl, session)
+            if expired:
+                logger.info(f"Expired {expired} stale pending booking(s).")
+        except Exception:
+            logger.exception("Hold expiry sweep failed.")
+        await asyncio.sleep(interval)
+
+
+def start_hold_sweeper() -> asyncio.Task | None:
+    """
+    Starts the sweeper task, or returns `None` if the hold TTL is not positive.
+    """
+    ttl = get_hold_ttl()
+    if ttl <= timedelta(0):
+        logger.info("Hold expiry sweeper disabled.")
+        return None
+    return asyncio.create_task(run_hold_sweeper(get_hold_sweep_interval(), ttl))
+
+
+async def stop_hold_sweeper(task: asyncio.Task | None) -> None:
+    """
+    Cancels a task returned by `start_hold_sweeper` and waits for it to finish.
+    """
+    if task is None:
+        return
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
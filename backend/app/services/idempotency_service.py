@@ -0,0 +1,251 @@
+"""
+Idempotency Service Module.
+
+Lets clients safely retry a write by sending an `Idempotency-Key` header. The
+first request with a key claims it, runs the workflow and stores its response;
+any retry with the same key and payload replays that stored response after a
+single primary-key lookup, without running the workflow again.
+
+Keys are scoped per user and expire after `app.env.get_idempotency_ttl`. A
+claim whose request never finished (the worker crashed, or the request was
+cancelled before it could release the key) only blocks retries for the much
+shorter `app.env.get_idempotency_lease`, after which a retry takes it over.
+Each new claim also evicts at most `EVICTION_BATCH_SIZE` expired keys, so the table
+stays bounded without a background job and no request pays for a full purge.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import and_, delete, or_, tuple_, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import IdempotencyKey
+
+MAX_KEY_LENGTH = 255
+"""Longest accepted `Idempotency-Key` header value."""
+
+EVICTION_BATCH_SIZE = 100
+"""Maximum number of expired keys deleted by each new claim."""
+
+DEFAULT_CLAIM_LEASE = timedelta(seconds=60)
+"""How long an unfinished claim blocks retries unless the caller passes a lease."""
+
+
+class IdempotencyError(ValueError):
+    """Base idempotency error."""
+
+
+class IdempotencyKeyReusedError(IdempotencyError):
+    """Raised when a key is reused with a different request payload."""
+
+
+class IdempotencyInProgressError(IdempotencyError):
+    """Raised when the original request for a key has not finished yet."""
+
+
+class StoredResponse(NamedTuple):
+    """
+    A response recorded for an idempotency key.
+    """
+
+    status_code: int
+    """The HTTP status code of the original response."""
+    body: str
+    """The JSON body of the original response."""
+
+
+def request_fingerprint(payload: Any) -> str:
+    """
+    Returns a stable hash of a JSON-compatible request payload.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _as_utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+def _is_live(record: IdempotencyKey, cutoff: datetime, lease_cutoff: datetime) -> bool:
+    """
+    Tells whether `record` still holds its key: completed within the TTL, or
+    still in progress within its lease.
+    """
+    created = _as_utc(record.createdAt)
+    if record.statusCode is None:
+        return created >= max(cutoff, lease_cutoff)
+    return created >= cutoff
+
+
+def _replay(record: IdempotencyKey, fingerprint: str) -> StoredResponse:
+    if record.requestHash != fingerprint:
+        raise IdempotencyKeyReusedError(
+            "Idempotency-Key was already used with a different request."
+        )
+    if record.statusCode is None or record.responseBody is None:
+        raise IdempotencyInProgressError(
+            "A request with this Idempotency-Key is still being processed."
+        )
+    return StoredResponse(record.statusCode, record.responseBody)
+
+
+def _claim_statement(
+    user_id: UUID,
+    key: str,
+    fingerprint: str,
+    claimed_at: datetime,
+    cutoff: datetime,
+    lease_cutoff: datetime,
+):
+    """
+    Inserts a fresh claim, or takes over the row if the previous one expired
+    or was abandoned in progress past its lease.
+    """
+    statement = insert(IdempotencyKey).values(
+        userID=user_id,
+        key=key,
+        requestHash=fingerprint,
+        createdAt=claimed_at,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["userID", "key"],
+        set_={
+            "requestHash": statement.excluded.requestHash,
+            "statusCode": None,
+            "responseBody": None,
+            "createdAt": statement.excluded.createdAt,
+        },
+        where=or_(
+            IdempotencyKey.createdAt < cutoff,
+            and_(
+                IdempotencyKey.statusCode.is_(None),
+                IdempotencyKey.createdAt < lease_cutoff,
+            ),
+        ),
+    )
+
+
+def _evict_statement(cutoff: datetime):
+    expired = (
+        select(IdempotencyKey.userID, IdempotencyKey.key)
+        .where(IdempotencyKey.createdAt < cutoff)
+        .order_by(IdempotencyKey.createdAt)
+        .limit(EVICTION_BATCH_SIZE)
+    )
+    return delete(IdempotencyKey).where(
+        tuple_(IdempotencyKey.userID, IdempotencyKey.key).in_(expired)
+    )
+
+
+async def claim_key(
+    user_id: UUID,
+    key: str,
+    fingerprint: str,
+    ttl: timedelta,
+    session: AsyncSession,
+    lease: timedelta = DEFAULT_CLAIM_LEASE,
+    claimed_at: datetime | None = None,
+) -> StoredResponse | None:
+    """
+    Claims `key` for a new request, or returns the response to replay.
+
+    A stored response is replayed for `ttl`. A claim that is still in progress
+    blocks other requests with the key for `lease` only, so a claim left
+    behind by a crashed or cancelled request is taken over by the next retry.
+    The claim is stamped with `claimed_at` (default: now); pass the same value
+    to `release_key` so it only ever drops this claim.
+
+    Returns:
+        StoredResponse | None: The stored response if the key was already
+        used for this payload, or `None` if the caller now owns the key and
+        must run the workflow, then call `complete_key` or `release_key`.
+
+    Raises:
+        IdempotencyKeyReusedError: If the key was used with another payload.
+        IdempotencyInProgressError: If the original request is still running
+        within its lease.
+    """
+    now = claimed_at or datetime.now(timezone.utc)
+    cutoff, lease_cutoff = now - ttl, now - lease
+    record = await session.get(
+        IdempotencyKey, (user_id, key), populate_existing=True
+    )
+    if record is not None and _is_live(record, cutoff, lease_cutoff):
+        return _replay(record, fingerprint)
+
+    result = await session.exec(
+        _claim_statement(user_id, key, fingerprint, now, cutoff, lease_cutoff)
+    )
+    if result.rowcount == 0:
+        # Another request claimed the key between the lookup and the insert.
+        await session.commit()
+        record = await session.get(
+            IdempotencyKey, (user_id, key), populate_existing=True
+        )
+        return _replay(record, fingerprint)  # type: ignore[arg-type]
+
+    await session.exec(_evict_statement(cutoff))
+    await session.commit()
+    return None
+
+
+async def complete_key(
+    user_id: UUID,
+    key: str,
+    response: StoredResponse,
+    session: AsyncSession,
+) -> None:
+    """
+    Stores the response of a claimed request for later replays.
+
+    If the claim outlived its lease and a retry already completed the key,
+    the stored response is kept.
+    """
+    await session.exec(
+        update(IdempotencyKey)
+        .where(
+            IdempotencyKey.userID == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.statusCode.is_(None),
+        )
+        .values(statusCode=response.status_code, responseBody=response.body)
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
+
+
+async def release_key(
+    user_id: UUID,
+    key: str,
+    fingerprint: str,
+    claimed_at: datetime,
+    session: AsyncSession,
+) -> None:
+    """
+    Drops a claim whose request failed unexpectedly, so the client can retry.
+
+    Only the caller's own unfinished claim, identified by its payload
+    fingerprint and `claimed_at`, is deleted. If the request outlived its
+    lease and a retry took the key over, the retry's claim is left alone.
+    """
+    await session.rollback()
+    await session.exec(
+        delete(IdempotencyKey)
+        .where(
+            IdempotencyKey.userID == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.statusCode.is_(None),
+            IdempotencyKey.requestHash == fingerprint,
+            IdempotencyKey.createdAt == claimed_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
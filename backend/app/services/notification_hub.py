@@ -0,0 +1,236 @@
+"""
+Notification Hub Module.
+
+Pushes committed notifications to the open server-sent event streams of their
+recipients, so clients no longer poll for them.
+
+New `Notification` rows are picked up from each flush, whichever code path
+created them (`send_notification`, booking transitions, hold expiry), and
+published only once the surrounding transaction commits.
+
+Every stream owns a bounded queue. A stream whose client reads too slowly is
+marked as lagging instead of buffering without limit, and catches up from the
+database by notification id, the same way a client resumes after reconnecting
+with `Last-Event-ID`.
+
+The hub is in-process: with several workers, each worker only pushes the
+notifications committed by its own requests, and clients pick up the rest
+when they resume.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models import Notification, NotificationType
+
+_PENDING_KEY = "new_notifications"
+
+QUEUE_SIZE = 64
+"""Notifications buffered per stream before it is marked as lagging."""
+
+
+class NotificationMessage(NamedTuple):
+    """
+    Snapshot of a committed `Notification` row, named after its columns.
+    """
+
+    id: int
+    userID: UUID
+    bookingID: int
+    message: str
+    type: NotificationType
+    isRead: bool
+    createdAt: datetime
+
+    @classmethod
+    def of(cls, notification: Notification) -> "NotificationMessage":
+        """
+        Copies the columns of a flushed notification.
+        """
+        return cls(
+            notification.id,  # type: ignore[arg-type]
+            notification.userID,
+            notification.bookingID,
+            notification.message,
+            notification.type,
+            notification.isRead,
+            notification.createdAt,
+        )
+
+
+Replay = Callable[[int], Awaitable[list[NotificationMessage]]]
+"""Loads a user's notifications with an id above the given one, oldest first."""
+
+
+class Subscription:
+    """
+    One open stream's bounded queue of notifications.
+    """
+
+    def __init__(self, user_id: UUID, queue_size: int) -> None:
+        self.user_id = user_id
+        """The recipient whose notifications are delivered."""
+        self.lagged = False
+        """Set when a notification was dropped because the queue was full."""
+        self._queue: asyncio.Queue[NotificationMessage] = asyncio.Queue(queue_size)
+        self._loop = asyncio.get_running_loop()
+
+    def deliver(self, message: NotificationMessage) -> None:
+        """
+        Queues `message`, from the stream's event loop or any other thread.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._offer(message)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._offer, message)
+
+    def _offer(self, message: NotificationMessage) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    async def next(self, timeout: float) -> NotificationMessage | None:
+        """
+        Returns the next queued notification, or `None` after `timeout` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return None
+
+    def drain(self) -> list[NotificationMessage]:
+        """
+        Empties the queue and clears the lagging flag.
+        """
+        self.lagged = False
+        drained = []
+        while not self._queue.empty():
+            drained.append(self._queue.get_nowait())
+        return drained
+
+
+class NotificationHub:
+    """
+    Fans committed notifications out to the subscriptions of their recipients.
+    """
+
+    def __init__(self, queue_size: int = QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        """Capacity of each subscription's queue."""
+        self._subscriptions: dict[UUID, set[Subscription]] = {}
+
+    @contextmanager
+    def subscribe(self, user_id: UUID) -> Iterator[Subscription]:
+        """
+        Registers a subscription for `user_id` for the duration of the block.
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            subscriptions = self._subscriptions[user_id]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[user_id]
+
+    def publish(self, messages: Iterable[NotificationMessage]) -> None:
+        """
+        Delivers each message to every subscription of its recipient.
+        """
+        for message in messages:
+            for subscription in tuple(self._subscriptions.get(message.userID, ())):
+                subscription.deliver(message)
+
+    def connections(self) -> int:
+        """
+        Returns the number of open subscriptions.
+        """
+        return sum(len(group) for group in self._subscriptions.values())
+
+
+async def stream_notifications(
+    user_id: UUID,
+    after_id: int | None,
+    replay: Replay,
+    heartbeat: float,
+    lifetime: float,
+    hub: NotificationHub | None = None,
+) -> AsyncIterator[NotificationMessage | None]:
+    """
+    Yields `user_id`'s notifications as they are committed, oldest first.
+
+    With `after_id`, the notifications created after it are replayed first.
+    `None` is yielded whenever `heartbeat` seconds pass without a
+    notification, and the stream ends after `lifetime` seconds so the client
+    reconnects and is authenticated again.
+    """
+    hub = hub or notification_hub
+    deadline = time.monotonic() + lifetime
+    last_id = after_id
+    # Subscribe before replaying, so nothing committed in between is missed.
+    with hub.subscribe(user_id) as subscription:
+        pending = await replay(after_id) if after_id is not None else []
+        while True:
+            for message in pending:
+                if last_id is None or message.id > last_id:
+                    last_id = message.id
+                    yield message
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            message = await subscription.next(min(heartbeat, remaining))
+            if subscription.lagged:
+                queued = [m for m in (message, *subscription.drain()) if m]
+                if last_id is not None:
+                    pending = await replay(last_id)
+                elif queued:
+                    pending = await replay(queued[0].id - 1)
+                else:
+                    # Nothing sent or queued yet, so there is no id to resume from.
+                    pending = []
+            elif message is None:
+                pending = []
+                if remaining > heartbeat:
+                    yield None
+            else:
+                pending = [message]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_notifications(session: Session, flush_context) -> None:
+    created = [
+        NotificationMessage.of(obj)
+        for obj in session.new
+        if isinstance(obj, Notification)
+    ]
+    if created:
+        session.info.setdefault(_PENDING_KEY, []).extend(created)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    messages = session.info.pop(_PENDING_KEY, None)
+    if messages:
+        notification_hub.publish(messages)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+notification_hub = NotificationHub()
+"""The process-wide hub feeding `/api/notifications/stream`."""
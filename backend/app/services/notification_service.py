@@ -6,9 +6,16 @@ Creates and retrieves in-app notifications for booking lifecycle events.
 
 from __future__ import annotations
 
+from sqlalchemy import func, update
 from sqlmodel import Session, select
 
 from app.models import Notification, NotificationType
+from app.services.notification_hub import NotificationMessage
+from app.services.unread_counters import (
+    pending_unread_changes,
+    record_unread_changes,
+    unread_counters,
+)
 
 
 class NotificationServiceError(ValueError):
@@ -20,37 +27,70 @@ class NotificationNotFoundError(NotificationServiceError):
 
 
 def _build_message(notification_type: NotificationType, booking_id: int) -> str:
+    if notification_type == NotificationType.EXPIRED:
+        return f"Your booking #{booking_id} has expired without a decision"
     return f"Your booking #{booking_id} has been {notification_type.value}"
 
 
-def send_notification(
-    user_id,
-    booking_id: int,
-    notification_type: str | NotificationType,
-    session: Session,
+def build_notification(
+    user_id, booking_id: int, notification_type: str | NotificationType
 ) -> Notification:
+    """
+    Builds an unsaved `Notification` for a booking lifecycle event.
+    """
     normalized_type = NotificationType(notification_type)
-    notification = Notification(
+    return Notification(
         userID=user_id,
         bookingID=booking_id,
         message=_build_message(normalized_type, booking_id),
         type=normalized_type,
         isRead=False,
     )
+
+
+def send_notification(
+    user_id,
+    booking_id: int,
+    notification_type: str | NotificationType,
+    session: Session,
+) -> Notification:
+    notification = build_notification(user_id, booking_id, notification_type)
     session.add(notification)
     session.commit()
     session.refresh(notification)
     return notification
 
 
-def get_notifications(user_id, session: Session) -> list[Notification]:
+def get_notifications(
+    user_id, session: Session, limit: int | None = None
+) -> list[Notification]:
     statement = (
         select(Notification)
         .where(Notification.userID == user_id)
         .order_by(Notification.createdAt.desc(), Notification.id.desc())
+        .limit(limit)
+    )
+    return list(session.exec(statement))
+
+
+def get_notifications_after(
+    user_id, after_id: int, session: Session, limit: int | None = None
+) -> list[Notification]:
+    """
+    Returns the user's notifications with an id above `after_id`, oldest first.
+
+    Ids only grow, so passing the largest id already seen returns exactly the
+    new notifications, through a seek on the `(userID, id)` index.
+    """
+    statement = (
+        select(Notification)
+        .where(Notification.userID == user_id, Notification.id > after_id)
+        .order_by(Notification.id)
+        .limit(limit)
     )
     return list(session.exec(statement))
 
+
 def get_notification_for_user(notification_id: int, user_id, session: Session) -> Notification:
     notification = session.get(Notification, notification_id)
     if notification is None or notification.userID != user_id:
@@ -74,8 +114,86 @@ def mark_read(notification_id: int, session: Session) -> Notification:
     return notification
 
 
+def peek_unread_count(user_id) -> int | None:
+    """
+    Returns the user's cached unread count without touching the database, or
+    `None` if it has not been counted yet.
+    """
+    return unread_counters.get(user_id)
+
+
+def _mark_read_statement(notification_id: int, user_id):
+    """
+    Marks the user's notification as read if it is still unread, returning
+    every column so no separate lookup is needed.
+    """
+    return (
+        update(Notification)
+        .where(
+            Notification.id == notification_id,
+            Notification.userID == user_id,
+            Notification.isRead.is_(False),
+        )
+        .values(isRead=True)
+        .returning(
+            Notification.id,
+            Notification.userID,
+            Notification.bookingID,
+            Notification.message,
+            Notification.type,
+            Notification.isRead,
+            Notification.createdAt,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def mark_read_for_user(
+    notification_id: int, user_id, session: Session
+) -> NotificationMessage:
+    """
+    Marks one of the user's notifications as read and returns its new state.
+
+    Unread notifications take a single conditional `UPDATE ... RETURNING`;
+    only a notification that is already read needs a second statement, to
+    tell it apart from one that is missing or belongs to another user.
+
+    Raises:
+        NotificationNotFoundError: If the user has no such notification.
+    """
+    row = session.exec(_mark_read_statement(notification_id, user_id)).first()
+    if row is None:
+        notification = get_notification_for_user(notification_id, user_id, session)
+        return NotificationMessage.of(notification)
+    record_unread_changes(session, {user_id: -1})
+    session.commit()
+    return NotificationMessage(*row)
+
+
 def get_unread_count(user_id, session: Session) -> int:
-    statement = select(Notification).where(
-        Notification.userID == user_id, Notification.isRead.is_(False)
+    """
+    Returns how many unread notifications the user has.
+
+    Served from the in-memory unread counters; the first call for a user runs
+    one `COUNT(*)` over the `(userID, isRead, createdAt)` index.
+
+    Never flushes the session: changes the open transaction has flushed are
+    counted, so callers that write and then read the count flush first.
+    """
+    # Changes this transaction has not committed yet count for its own reads.
+    pending = pending_unread_changes(session).get(user_id, 0)
+    count = unread_counters.get(user_id)
+    if count is not None and pending is not None:
+        return max(0, count + pending)
+
+    token = unread_counters.token(user_id)
+    statement = (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.userID == user_id, Notification.isRead.is_(False))
     )
-    return len(list(session.exec(statement)))
+    with session.no_autoflush:
+        count = session.exec(statement).one()
+    if pending == 0:
+        unread_counters.put(user_id, count, token)
+    return count
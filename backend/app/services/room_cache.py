@@ -0,0 +1,134 @@
+"""
+Room Availability Cache Module.
+
+Holds the serialized `GET /api/rooms?date=` response for recently requested
+dates in a bounded LRU cache, so repeated dashboard loads skip both building
+`RoomRead` objects and JSON encoding them.
+
+Entries are invalidated per date by `app.services.slot_events`: any committed
+slot change drops the cached response for that slot's date, and a reset (room
+changes, schema create/drop) clears the whole cache. Like the availability
+index, the cache only sees writes made by this process.
+"""
+
+from collections import OrderedDict
+from datetime import date
+from typing import NamedTuple
+
+from app.services.change_versions import ChangeVersions
+from app.services.slot_events import SlotChange, on_reset, on_slot_changes
+
+ROOMS_CACHE_SIZE = 366
+"""Maximum number of dates whose room listing is kept."""
+
+
+class CacheStats(NamedTuple):
+    """
+    Counters describing how the cache has been used since start-up.
+    """
+
+    hits: int
+    """Lookups answered from the cache."""
+    misses: int
+    """Lookups that had to build the response."""
+    evictions: int
+    """Entries dropped to stay within capacity."""
+    invalidations: int
+    """Entries dropped because a slot on their date changed."""
+    size: int
+    """Entries currently cached."""
+    capacity: int
+    """Maximum number of entries."""
+
+
+class CacheToken(NamedTuple):
+    """
+    Identifies the state of one date when a miss started building its response.
+    """
+
+    epoch: int
+    version: int
+
+
+class RoomsCache:
+    """
+    Bounded, date-keyed LRU cache of serialized room listings.
+    """
+
+    def __init__(self, capacity: int = ROOMS_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self._entries: OrderedDict[date, bytes] = OrderedDict()
+        self._versions: ChangeVersions[date] = ChangeVersions(capacity)
+        self._epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, target_date: date) -> bytes | None:
+        """
+        Returns the cached payload for `target_date`, counting a hit or a miss.
+        """
+        payload = self._entries.get(target_date)
+        if payload is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(target_date)
+        self.hits += 1
+        return payload
+
+    def token(self, target_date: date) -> CacheToken:
+        """
+        Captures the current state of `target_date` before building its payload.
+        """
+        return CacheToken(self._epoch, self._versions.get(target_date))
+
+    def put(self, target_date: date, payload: bytes, token: CacheToken) -> None:
+        """
+        Stores `payload` unless `target_date` changed since `token` was taken.
+        """
+        if token != self.token(target_date):
+            return
+        self._entries[target_date] = payload
+        self._entries.move_to_end(target_date)
+        while len(self._entries) > self.capacity:
+            evicted, _ = self._entries.popitem(last=False)
+            self._versions.forget(evicted)
+            self.evictions += 1
+
+    def invalidate(self, changes: list[SlotChange]) -> None:
+        """
+        Drops the entries for every date touched by `changes`.
+        """
+        for slot_date in {change.slot_date for change in changes}:
+            self._versions.bump(slot_date)
+            if self._entries.pop(slot_date, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry; responses being built concurrently are not stored.
+        """
+        self._epoch += 1
+        self._entries.clear()
+        self._versions.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+        """
+        return CacheStats(
+            self.hits,
+            self.misses,
+            self.evictions,
+            self.invalidations,
+            len(self._entries),
+            self.capacity,
+        )
+
+
+rooms_cache = RoomsCache()
+"""The process-wide room listing cache."""
+
+on_slot_changes(rooms_cache.invalidate)
+on_reset(rooms_cache.clear)
@@ -0,0 +1,92 @@
+"""
+Room Search Module.
+
+Finds rooms with enough back-to-back available time on a range of dates by
+scanning the runs of available slots kept by `app.services.availability_index`,
+instead of loading and comparing `TimeSlot` rows per date.
+"""
+
+from datetime import date, time, timedelta
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas.room import RoomSearchResult
+from app.services.availability_index import DayAvailability, availability_index
+
+
+def _seconds(moment: time) -> int:
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+def earliest_fit(
+    day: DayAvailability, duration: timedelta, start_after: time, end_before: time
+) -> tuple[int, int] | None:
+    """
+    Returns the first and last position of the earliest run of contiguous
+    available slots on `day` lasting at least `duration` inside the time window.
+    """
+    needed = duration.total_seconds()
+    for first, last in day.runs():
+        for start in range(first, last + 1):
+            if day.starts[start] < start_after:
+                continue
+            opens = _seconds(day.starts[start])
+            for end in range(start, last + 1):
+                if day.ends[end] > end_before:
+                    break
+                if _seconds(day.ends[end]) - opens >= needed:
+                    return start, end
+    return None
+
+
+async def find_free_rooms(
+    first: date,
+    last: date,
+    capacity_min: int,
+    duration: timedelta,
+    start_after: time,
+    end_before: time,
+    limit: int,
+    session: AsyncSession,
+) -> list[RoomSearchResult]:
+    """
+    Finds rooms seating at least `capacity_min` with `duration` of contiguous
+    available slots between `start_after` and `end_before`, on any date from
+    `first` to `last`.
+
+    Returns the earliest fit of each room on each date, ordered by date,
+    start time and room, up to `limit` results.
+    """
+    days = await availability_index.load_range(first, last, session)
+    rooms = {
+        room_id: (name, capacity)
+        for room_id, name, capacity in await availability_index.load_rooms(session)
+        if capacity >= capacity_min
+    }
+
+    results: list[RoomSearchResult] = []
+    for slot_date in sorted(days):
+        fits = []
+        for room_id, day in days[slot_date].items():
+            if room_id not in rooms:
+                continue
+            fit = earliest_fit(day, duration, start_after, end_before)
+            if fit is not None:
+                fits.append((day.starts[fit[0]], room_id, day, fit))
+        fits.sort(key=lambda fit: fit[:2])
+        for start_time, room_id, day, (start, end) in fits:
+            name, capacity = rooms[room_id]
+            results.append(
+                RoomSearchResult(
+                    room_id=room_id,
+                    room_name=name,
+                    capacity=capacity,
+                    slot_date=slot_date,
+                    start_time=start_time,
+                    end_time=day.ends[end],
+                    slot_ids=day.slot_ids[start : end + 1],
+                )
+            )
+            if len(results) == limit:
+                return results
+    return results
@@ -3,16 +3,34 @@ Room Service Module.
 This module provides services for retrieving room information and availability.
 """
 
-from datetime import date
-from typing import List
+from datetime import date, time, timedelta
+from typing import Iterable, List
 
-from sqlalchemy import and_, extract
-from sqlalchemy.orm import contains_eager
-from sqlmodel import select
+from pydantic import TypeAdapter
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.booking import TimeSlot, TimeslotStatus
 from app.models.room import Room
+from app.schemas.room import (
+    AvailabilityMatrixRead,
+    RoomBasicRead,
+    RoomRead,
+    RoomSearchResult,
+)
+from app.services.availability_index import IndexVerification, availability_index
+from app.services.availability_matrix import build_availability_matrix
+from app.services.availability_versions import availability_versions
+from app.services.day_summary import get_summary_available_dates
+from app.services.room_cache import CacheStats, rooms_cache
+from app.services.room_search import find_free_rooms
+from app.services.single_flight import FlightStats, dates_flight, rooms_flight
+
+_ROOM_LIST = TypeAdapter(List[RoomRead])
+
+MAX_MATRIX_DAYS = 92
+"""Longest date range, in days, served by `get_availability_matrix`."""
+
+MAX_SEARCH_DAYS = 92
+"""Longest date range, in days, covered by `search_rooms`."""
 
 
 class RoomServiceError(ValueError):
@@ -23,25 +41,81 @@ class RoomNotFoundError(RoomServiceError):
     """Raised when a room cannot be found."""
 
 
+class InvalidDateRangeError(RoomServiceError):
+    """Raised when a requested date or time range is reversed or too long."""
+
+
+def _check_date_range(first: date, last: date, max_days: int) -> None:
+    if last < first:
+        raise InvalidDateRangeError("The end date must not precede the start date.")
+    if last - first >= timedelta(days=max_days):
+        raise InvalidDateRangeError(f"Date ranges are limited to {max_days} days.")
+
+
 async def get_rooms_with_availability(
     target_date: date, session: AsyncSession
-) -> List[Room]:
+) -> List[RoomRead]:
     """
-    Query all Room records, then for each room, separately query the TimeSlots
-    whose date matches the requested date. Return each room with its capacity
-    and the list of slots (with their statuses).
+    Return every room with its capacity and the list of slots (with their
+    statuses) on the requested date.
     If no TimeSlots exist yet for a room on that date, returns the room with an empty slot list.
+
+    Answered from the in-memory availability index; the date is loaded from
+    the database with a single query the first time it is requested.
     """
-    stmt = (
-        select(Room)
-        .outerjoin(
-            TimeSlot,
-            and_(Room.id == TimeSlot.room_id, TimeSlot.slot_date == target_date),  # type: ignore[arg-type]
-        )
-        .options(contains_eager(Room.time_slots))  # type: ignore[arg-type]
-    )
-    result = await session.exec(stmt)
-    return list(result.unique().all())
+    return await availability_index.rooms_on(target_date, session)
+
+
+async def get_rooms_with_availability_json(
+    target_date: date, session: AsyncSession
+) -> bytes:
+    """
+    Return the JSON-encoded `get_rooms_with_availability` list for the date,
+    served from the room listing cache when possible. Concurrent misses for
+    the same date share one build.
+    """
+    payload = rooms_cache.get(target_date)
+    if payload is not None:
+        return payload
+
+    async def build() -> bytes:
+        token = rooms_cache.token(target_date)
+        rooms = await get_rooms_with_availability(target_date, session)
+        payload = _ROOM_LIST.dump_json(rooms)
+        rooms_cache.put(target_date, payload, token)
+        return payload
+
+    return await rooms_flight.run(get_rooms_etag(target_date), build)
+
+
+def get_room_cache_stats() -> CacheStats:
+    """
+    Return the hit, miss, eviction and invalidation counters of the room
+    listing cache.
+    """
+    return rooms_cache.stats()
+
+
+def get_coalescing_stats() -> dict[str, FlightStats]:
+    """
+    Return how many room listing builds and available-date lookups ran, and
+    how many concurrent requests shared them instead.
+    """
+    return {"rooms": rooms_flight.stats(), "dates": dates_flight.stats()}
+
+
+def get_rooms_etag(target_date: date) -> str:
+    """
+    Return the strong ETag of the room listing for `target_date`.
+    """
+    return availability_versions.date_etag(target_date)
+
+
+def get_available_dates_etag(year: int, month: int) -> str:
+    """
+    Return the strong ETag of the available dates in `year`/`month`.
+    """
+    return availability_versions.month_etag(year, month)
 
 
 async def get_available_dates(
@@ -50,19 +124,95 @@ async def get_available_dates(
     """
     Return a sorted list of distinct dates within the given year/month
     that have at least one AVAILABLE time slot.
+
+    Read from the per-day summary table, one row per date of the month.
+    Concurrent requests for the same month share one query.
+    """
+    return await dates_flight.run(
+        get_available_dates_etag(year, month),
+        lambda: get_summary_available_dates(year, month, session),
+    )
+
+
+async def get_availability_matrix(
+    first: date, last: date, session: AsyncSession
+) -> AvailabilityMatrixRead:
+    """
+    Return the availability of every room for each date from `first` to `last`
+    in a compact matrix, instead of one `RoomRead` list per date.
+
+    Raises:
+        InvalidDateRangeError: If `last` precedes `first` or the range spans
+        more than `MAX_MATRIX_DAYS` days.
+    """
+    _check_date_range(first, last, MAX_MATRIX_DAYS)
+    return await build_availability_matrix(first, last, session)
+
+
+async def search_rooms(
+    first: date,
+    last: date,
+    capacity_min: int,
+    duration_minutes: int,
+    start_after: time | None,
+    end_before: time | None,
+    limit: int,
+    session: AsyncSession,
+) -> List[RoomSearchResult]:
     """
-    stmt = (
-        select(TimeSlot.slot_date)  # type: ignore
-        .where(
-            extract("year", TimeSlot.slot_date) == year,  # type: ignore
-            extract("month", TimeSlot.slot_date) == month,  # type: ignore
-            TimeSlot.status == TimeslotStatus.AVAILABLE,
-        )
-        .distinct()
-        .order_by(TimeSlot.slot_date)
+    Return the rooms seating at least `capacity_min` that have
+    `duration_minutes` of back-to-back available slots on a date from `first`
+    to `last`, optionally within the `start_after`/`end_before` window.
+
+    Each room contributes its earliest fit per date; results are ranked by
+    date, then start time, and each lists the slot ids to book.
+
+    Raises:
+        InvalidDateRangeError: If the date range is reversed or spans more than
+        `MAX_SEARCH_DAYS` days, or the time window is empty.
+    """
+    _check_date_range(first, last, MAX_SEARCH_DAYS)
+    start_after = start_after or time.min
+    end_before = end_before or time.max
+    if end_before <= start_after:
+        raise InvalidDateRangeError("end_before must be later than start_after.")
+    return await find_free_rooms(
+        first,
+        last,
+        capacity_min,
+        timedelta(minutes=duration_minutes),
+        start_after,
+        end_before,
+        limit,
+        session,
     )
-    result = await session.exec(stmt)
-    return list(result.all())
+
+
+async def verify_availability_index(session: AsyncSession) -> IndexVerification:
+    """
+    Compare the in-memory availability index against the database, dropping
+    any day that disagrees so it is reloaded on the next request.
+    """
+    return await availability_index.verify(session)
+
+
+async def get_rooms_by_ids(
+    room_ids: Iterable[int], session: AsyncSession
+) -> List[RoomBasicRead]:
+    """
+    Return the basic details of every existing room in `room_ids`, in the
+    order requested, from the in-memory room metadata cache. Unknown ids are
+    left out.
+    """
+    rooms = {
+        room_id: (name, capacity)
+        for room_id, name, capacity in await availability_index.load_rooms(session)
+    }
+    return [
+        RoomBasicRead(id=room_id, name=rooms[room_id][0], capacity=rooms[room_id][1])
+        for room_id in dict.fromkeys(room_ids)
+        if room_id in rooms
+    ]
 
 
 async def get_room(room_id: int, session: AsyncSession) -> Room:
@@ -0,0 +1,99 @@
+"""
+Single-Flight Module.
+
+Coalesces concurrent identical reads: while one request (the leader) runs a
+query for a key, every other request for the same key awaits the leader's
+result instead of issuing its own query. Nothing is kept once the leader
+finishes, so this only collapses bursts, such as the whole class opening the
+dashboard at the top of the hour; `app.services.room_cache` handles reuse
+over time.
+
+Callers put a version token in the key (see `app.services.availability_versions`),
+so a request that arrives after a committed write never joins a flight that
+started before it.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+
+class FlightStats(NamedTuple):
+    """
+    Counters describing how often reads were coalesced since start-up.
+    """
+
+    executed: int
+    """Reads that ran their query as the leader."""
+    coalesced: int
+    """Reads answered with another request's in-flight result."""
+    in_flight: int
+    """Keys with a query currently running."""
+
+
+class _LeaderCancelled(Exception):
+    """Tells followers that the leader went away, so one of them must lead."""
+
+
+class SingleFlight(Generic[T]):
+    """
+    Shares one in-flight call per key between concurrent callers.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[T]] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Returns the result of `call`, or of the identical call already running
+        for `key`. Errors raised by the leader are raised to every follower; if
+        the leader is cancelled, a follower takes over.
+        """
+        while (flight := self._calls.get(key)) is not None:
+            try:
+                # Shielded so a cancelled follower does not cancel the flight.
+                result = await asyncio.shield(flight)
+            except _LeaderCancelled:
+                continue
+            self.coalesced += 1
+            return result
+
+        flight = asyncio.get_running_loop().create_future()
+        self._calls[key] = flight
+        self.executed += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            self._fail(flight, _LeaderCancelled())
+            raise
+        except Exception as exc:
+            self._fail(flight, exc)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is flight:
+                del self._calls[key]
+
+    @staticmethod
+    def _fail(flight: asyncio.Future, exc: Exception) -> None:
+        flight.set_exception(exc)
+        # Marks the exception as retrieved when no follower is waiting.
+        flight.exception()
+
+    def stats(self) -> FlightStats:
+        """
+        Returns a snapshot of the coalescing counters.
+        """
+        return FlightStats(self.executed, self.coalesced, len(self._calls))
+
+
+rooms_flight: SingleFlight[bytes] = SingleFlight()
+"""Coalesces room listing builds for the same date and version."""
+
+dates_flight: SingleFlight[list] = SingleFlight()
+"""Coalesces available-date lookups for the same month and version."""
@@ -0,0 +1,167 @@
+"""
+Slot Change Events Module.
+
+Publishes committed `TimeSlot` status changes to in-process listeners such as
+the availability index, so derived in-memory state stays in sync with the
+database without re-reading it.
+
+Changes made through the ORM are picked up automatically from each flush.
+Bulk statements that bypass the unit of work (for example the conditional
+hold in `async_booking_service`) report their changes with `record_slot_changes`.
+Nothing is published until the surrounding transaction commits, and pending
+changes are discarded on rollback.
+
+Creating or dropping the schema, and any change to a `Room`, is published as a
+reset so listeners can drop everything they derived.
+"""
+
+from datetime import date, time
+from typing import Callable, Iterable, NamedTuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlmodel import SQLModel
+
+from app.models import Room, TimeSlot, TimeslotStatus
+
+_PENDING_KEY = "slot_changes"
+_RESET_KEY = "slot_reset"
+
+
+class SlotChange(NamedTuple):
+    """
+    The committed state of one `TimeSlot` after a write.
+    """
+
+    slot_id: int
+    """The primary key of the slot."""
+    room_id: int
+    """The room the slot belongs to."""
+    slot_date: date
+    """The date of the slot."""
+    start_time: time
+    """The start of the slot window."""
+    end_time: time
+    """The end of the slot window."""
+    status: TimeslotStatus | None
+    """The new status, or `None` if the slot was deleted."""
+
+
+SlotListener = Callable[[list[SlotChange]], None]
+ResetListener = Callable[[], None]
+
+_slot_listeners: list[SlotListener] = []
+_reset_listeners: list[ResetListener] = []
+
+
+def on_slot_changes(listener: SlotListener) -> SlotListener:
+    """
+    Registers `listener` to receive each committed batch of slot changes.
+    """
+    _slot_listeners.append(listener)
+    return listener
+
+
+def on_reset(listener: ResetListener) -> ResetListener:
+    """
+    Registers `listener` to be called when derived state must be discarded.
+    """
+    _reset_listeners.append(listener)
+    return listener
+
+
+def _info(session) -> dict:
+    return getattr(session, "sync_session", session).info
+
+
+def record_slot_changes(session, changes: Iterable[SlotChange]) -> None:
+    """
+    Queues changes made by a bulk statement for publication on commit.
+
+    Accepts either a synchronous `Session` or an `AsyncSession`.
+    """
+    _info(session).setdefault(_PENDING_KEY, []).extend(changes)
+
+
+def pending_slot_changes(session) -> list[SlotChange]:
+    """
+    Returns the changes queued in the session's current transaction so far.
+    """
+    return list(_info(session).get(_PENDING_KEY, ()))
+
+
+def changes_for(
+    slots: Iterable[TimeSlot], status: TimeslotStatus | None = None
+) -> list[SlotChange]:
+    """
+    Builds `SlotChange` records for loaded slots, optionally overriding the status.
+    """
+    return [
+        SlotChange(
+            slot.id,  # type: ignore[arg-type]
+            slot.room_id,
+            slot.slot_date,
+            slot.start_time,
+            slot.end_time,
+            slot.status if status is None else status,
+        )
+        for slot in slots
+    ]
+
+
+def publish_reset() -> None:
+    """
+    Tells every listener to drop all derived state.
+    """
+    for listener in _reset_listeners:
+        listener()
+
+
+def _publish(changes: list[SlotChange]) -> None:
+    for listener in _slot_listeners:
+        try:
+            listener(changes)
+        except Exception:
+            logger.exception("Slot change listener failed; resetting derived state.")
+            publish_reset()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed_slots(session: Session, flush_context) -> None:
+    changed = [
+        obj for obj in (*session.new, *session.dirty) if isinstance(obj, TimeSlot)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, TimeSlot)]
+    if changed or deleted:
+        removed = [change._replace(status=None) for change in changes_for(deleted)]
+        record_slot_changes(session, changes_for(changed) + removed)
+
+    touched = (*session.new, *session.dirty, *session.deleted)
+    if any(isinstance(obj, Room) for obj in touched):
+        session.info[_RESET_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if session.info.pop(_RESET_KEY, False):
+        publish_reset()
+    elif changes:
+        _publish(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_RESET_KEY, None)
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _reset_after_create(target, connection, **kw) -> None:
+    publish_reset()
+
+
+@event.listens_for(SQLModel.metadata, "after_drop")
+def _reset_after_drop(target, connection, **kw) -> None:
+    publish_reset()
@@ -0,0 +1,168 @@
+"""
+Unread Counters Module.
+
+Keeps each recently active user's number of unread notifications in memory,
+so the notification badge is answered without a query.
+
+A user's counter is loaded with one `COUNT(*)` the first time it is needed,
+then kept current from every commit: new unread notifications add to it, and
+notifications marked read (or deleted) subtract from it. ORM writes are picked
+up from each flush; bulk statements that bypass the unit of work report their
+changes with `record_unread_changes`. Like the other in-memory caches, the
+counters only see writes made by this process. They are cleared whenever the
+notification table is created or dropped.
+"""
+
+from collections import OrderedDict
+from typing import Mapping, NamedTuple
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, attributes
+
+from app.models import Notification
+from app.services.change_versions import ChangeVersions
+
+_PENDING_KEY = "unread_changes"
+
+UNREAD_CACHE_SIZE = 10_000
+"""Maximum number of users whose unread count is kept."""
+
+
+class CounterToken(NamedTuple):
+    """
+    Identifies the state of one user's counter when a count query started.
+    """
+
+    epoch: int
+    version: int
+
+
+class UnreadCounters:
+    """
+    Bounded, user-keyed LRU cache of unread notification counts.
+    """
+
+    def __init__(self, capacity: int = UNREAD_CACHE_SIZE) -> None:
+        self.capacity = capacity
+        self._counts: OrderedDict[UUID, int] = OrderedDict()
+        self._versions: ChangeVersions[UUID] = ChangeVersions(capacity)
+        self._epoch = 0
+
+    def get(self, user_id: UUID) -> int | None:
+        """
+        Returns the cached unread count of `user_id`, if it is known.
+        """
+        count = self._counts.get(user_id)
+        if count is not None:
+            self._counts.move_to_end(user_id)
+        return count
+
+    def token(self, user_id: UUID) -> CounterToken:
+        """
+        Captures the current state of `user_id` before counting from the database.
+        """
+        return CounterToken(self._epoch, self._versions.get(user_id))
+
+    def put(self, user_id: UUID, count: int, token: CounterToken) -> None:
+        """
+        Stores `count` unless a commit changed the user's count since `token`.
+        """
+        if token != self.token(user_id):
+            return
+        self._counts[user_id] = count
+        self._counts.move_to_end(user_id)
+        while len(self._counts) > self.capacity:
+            evicted, _ = self._counts.popitem(last=False)
+            self._versions.forget(evicted)
+
+    def apply(self, changes: Mapping[UUID, int | None]) -> None:
+        """
+        Adds each committed change to the counter of its user; a `None` change
+        drops the counter so it is counted again.
+        """
+        for user_id, delta in changes.items():
+            self._versions.bump(user_id)
+            count = self._counts.get(user_id)
+            if delta is None:
+                self._counts.pop(user_id, None)
+            elif count is not None:
+                self._counts[user_id] = max(0, count + delta)
+
+    def clear(self) -> None:
+        """
+        Drops every counter; counts being loaded concurrently are not stored.
+        """
+        self._epoch += 1
+        self._counts.clear()
+        self._versions.clear()
+
+
+def record_unread_changes(session, changes: Mapping[UUID, int | None]) -> None:
+    """
+    Queues unread count changes made by a bulk statement until commit.
+
+    A `None` change means the user's count is unknown and must be recounted.
+    Accepts either a synchronous `Session` or an `AsyncSession`.
+    """
+    pending = getattr(session, "sync_session", session).info.setdefault(
+        _PENDING_KEY, {}
+    )
+    for user_id, delta in changes.items():
+        total = pending.get(user_id, 0)
+        pending[user_id] = None if None in (total, delta) else total + delta
+
+
+def pending_unread_changes(session) -> dict[UUID, int | None]:
+    """
+    Returns the changes queued in the session's current transaction so far.
+    """
+    return dict(getattr(session, "sync_session", session).info.get(_PENDING_KEY, {}))
+
+
+def _read_change(notification: Notification) -> int | None:
+    history = attributes.get_history(notification, "isRead")
+    if not history.added:
+        return 0
+    if not history.deleted:
+        # The previous value was never loaded.
+        return None
+    return int(bool(history.deleted[0])) - int(bool(history.added[0]))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_unread_changes(session: Session, flush_context) -> None:
+    changes: list[tuple[UUID, int | None]] = []
+    for obj in session.new:
+        if isinstance(obj, Notification) and not obj.isRead:
+            changes.append((obj.userID, 1))
+    for obj in session.dirty:
+        if isinstance(obj, Notification) and (delta := _read_change(obj)) != 0:
+            changes.append((obj.userID, delta))
+    for obj in session.deleted:
+        if isinstance(obj, Notification) and not obj.isRead:
+            changes.append((obj.userID, -1))
+    for user_id, delta in changes:
+        record_unread_changes(session, {user_id: delta})
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if changes:
+        unread_counters.apply(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+@event.listens_for(Notification.__table__, "after_create")
+@event.listens_for(Notification.__table__, "after_drop")
+def _clear_on_schema_change(target, connection, **kw) -> None:
+    unread_counters.clear()
+
+
+unread_counters = UnreadCounters()
+"""The process-wide unread counters."""
@@ -0,0 +1,7 @@
+"""
+Benchmark scripts for the room-booking backend.
+
+Each module is runnable on its own from the `backend/` directory, e.g.
+`python -m benchmarks.async_booking`, and works against a throwaway SQLite
+database so it never touches the application database.
+"""
@@ -0,0 +1,122 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Provides a throwaway file-backed SQLite engine, synthetic data seeding and
+latency summaries so every benchmark reports numbers the same way.
+"""
+
+import os
+import statistics
+import tempfile
+import time as clock
+from contextlib import asynccontextmanager
+from datetime import date, time, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+import app.models  # noqa: F401 - registers every table with SQLModel metadata
+from app.models import Room, TimeSlot, User, UserRole
+from app.services.day_summary import rebuild_day_summary
+
+SLOT_HOURS = [(time(h, 0), time(h + 1, 0)) for h in range(8, 18)]
+"""Hourly slots from 08:00 to 18:00, matching `app.seed`."""
+
+
+@asynccontextmanager
+async def temporary_engine():
+    """
+    Yields an async engine bound to a fresh SQLite file that is deleted afterwards.
+    """
+    directory = tempfile.mkdtemp(prefix="bench-")
+    path = os.path.join(directory, "bench.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+        os.remove(path)
+        os.rmdir(directory)
+
+
+async def seed(
+    engine: AsyncEngine,
+    rooms: int,
+    days: int,
+    start: date = date(2026, 1, 5),
+    users: int = 1,
+) -> tuple[list[User], list[Room]]:
+    """
+    Creates `users` students and `rooms` rooms with hourly slots for `days` days,
+    and rebuilds the day summary for them.
+    """
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        user_rows = [
+            User(
+                email=f"bench{index}@example.com",
+                hashed_password="hash",
+                role=UserRole.STUDENT,
+            )  # type: ignore[call-arg]
+            for index in range(users)
+        ]
+        room_rows = [
+            Room(name=f"R-{index:03d}", capacity=10 + index % 40)
+            for index in range(rooms)
+        ]
+        session.add_all(user_rows + room_rows)
+        await session.flush()
+
+        slots = [
+            {
+                "room_id": room.id,
+                "slot_date": start + timedelta(days=offset),
+                "start_time": slot_start,
+                "end_time": slot_end,
+            }
+            for room in room_rows
+            for offset in range(days)
+            for slot_start, slot_end in SLOT_HOURS
+        ]
+        await session.exec(insert(TimeSlot), params=slots)
+        await session.commit()
+        # The bulk insert bypasses the unit of work, so summarize it explicitly.
+        await rebuild_day_summary(session)
+        return user_rows, room_rows
+
+
+def summarize(label: str, latencies: list[float], elapsed: float | None = None) -> str:
+    """
+    Formats p50/p99/max latencies (in milliseconds) and optional throughput.
+    """
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    line = (
+        f"{label:<32} n={len(ordered):<6} p50={p50:8.3f}ms "
+        f"p99={p99:8.3f}ms max={ordered[-1] * 1000:8.3f}ms"
+    )
+    if elapsed is not None:
+        line += f" throughput={len(ordered) / elapsed:9.1f}/s"
+    return line
+
+
+class Timer:
+    """
+    Context manager recording wall-clock duration in seconds.
+    """
+
+    def __enter__(self) -> "Timer":
+        self.started = clock.perf_counter()
+        self.elapsed = 0.0
+        """Elapsed seconds, set when the block exits."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.elapsed = clock.perf_counter() - self.started
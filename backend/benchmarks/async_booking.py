@@ -0,0 +1,83 @@
+"""
+Async booking service benchmark.
+
+Compares the native `async_booking_service` against the previous route path,
+which bridged into the synchronous `booking_service` through
+`AsyncSession.run_sync`. Each request submits a booking for its own slot and
+then lists the user's bookings, with `--concurrency` requests in flight.
+
+Usage:
+    python -m benchmarks.async_booking --requests 400 --concurrency 32
+"""
+
+import argparse
+import asyncio
+from typing import cast
+
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import TimeSlot
+from app.services import async_booking_service, booking_service
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+
+async def _run_sync_bridge(engine, user, room_id: int, slot_id: int) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await session.run_sync(
+            lambda sync_session: booking_service.submit_booking(
+                user, room_id, [slot_id], "none", None, cast(Session, sync_session)
+            )
+        )
+        await session.run_sync(
+            lambda sync_session: booking_service.get_user_bookings(
+                user.id, cast(Session, sync_session)
+            )
+        )
+
+
+async def _run_async(engine, user, room_id: int, slot_id: int) -> None:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await async_booking_service.submit_booking(
+            user, room_id, [slot_id], "none", None, session
+        )
+        await async_booking_service.get_user_bookings(user.id, session)
+
+
+async def _measure(label: str, runner, requests: int, concurrency: int) -> str:
+    async with temporary_engine() as engine:
+        users, _ = await seed(engine, rooms=20, days=30, users=concurrency)
+        async with AsyncSession(engine) as session:
+            statement = select(TimeSlot.room_id, TimeSlot.id).limit(requests)
+            targets = (await session.exec(statement)).all()
+
+        gate = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+
+        async def one(index: int, room_id: int, slot_id: int) -> None:
+            async with gate:
+                with Timer() as timer:
+                    await runner(engine, users[index % len(users)], room_id, slot_id)
+                latencies.append(timer.elapsed)
+
+        with Timer() as total:
+            await asyncio.gather(
+                *(
+                    one(index, room_id, slot_id)
+                    for index, (room_id, slot_id) in enumerate(targets)
+                )
+            )
+        return summarize(label, latencies, total.elapsed)
+
+
+async def main(requests: int, concurrency: int) -> None:
+    print(await _measure("run_sync bridge", _run_sync_bridge, requests, concurrency))
+    print(await _measure("async service", _run_async, requests, concurrency))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
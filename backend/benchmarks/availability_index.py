@@ -0,0 +1,106 @@
+"""
+Availability index benchmark.
+
+Compares the previous database-backed room listing and calendar queries with
+the in-memory availability index (calendar from the day summary), cold (first
+request for the month) and warm (every later request). Each query is repeated
+`--repeat` times.
+
+Usage:
+    python -m benchmarks.availability_index --rooms 50 --days 120
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import and_, extract
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot, TimeslotStatus
+from app.services.availability_index import availability_index
+from app.services.room_service import get_available_dates
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2026, 1, 5)
+
+
+async def _rooms_from_database(target_date: date, session: AsyncSession):
+    statement = (
+        select(Room)
+        .outerjoin(
+            TimeSlot,
+            and_(Room.id == TimeSlot.room_id, TimeSlot.slot_date == target_date),  # type: ignore[arg-type]
+        )
+        .options(contains_eager(Room.time_slots))  # type: ignore[arg-type]
+    )
+    return list((await session.exec(statement)).unique().all())
+
+
+async def _dates_from_database(year: int, month: int, session: AsyncSession):
+    statement = (
+        select(TimeSlot.slot_date)  # type: ignore
+        .where(
+            extract("year", TimeSlot.slot_date) == year,  # type: ignore
+            extract("month", TimeSlot.slot_date) == month,  # type: ignore
+            TimeSlot.status == TimeslotStatus.AVAILABLE,
+        )
+        .distinct()
+    )
+    return list((await session.exec(statement)).all())
+
+
+async def _time(label: str, query, repeat: int) -> None:
+    latencies = []
+    for _ in range(repeat):
+        with Timer() as timer:
+            await query()
+        latencies.append(timer.elapsed)
+    print(summarize(label, latencies))
+
+
+async def main(rooms: int, days: int, repeat: int) -> None:
+    async with temporary_engine() as engine:
+        await seed(engine, rooms=rooms, days=days, start=START, users=1)
+        target = START + timedelta(days=30)
+        print(f"dataset: {rooms * days * 10} slots\n")
+
+        async with AsyncSession(engine) as session:
+
+            async def database_rooms():
+                await _rooms_from_database(target, session)
+                session.expunge_all()
+
+            async def cold_index():
+                availability_index.reset()
+                await get_available_dates(target.year, target.month, session)
+                await availability_index.rooms_on(target, session)
+
+            async def warm_index():
+                await get_available_dates(target.year, target.month, session)
+                await availability_index.rooms_on(target, session)
+
+            async def database_both():
+                await _dates_from_database(target.year, target.month, session)
+                await database_rooms()
+
+            await _time("database: dates + rooms", database_both, repeat)
+            await _time("index cold: dates + rooms", cold_index, repeat)
+            await _time("index warm: dates + rooms", warm_index, repeat)
+            taken = list(range(1, 11))
+            with Timer() as timer:
+                for _ in range(repeat):
+                    availability_index.unavailable(taken)
+            per_call = timer.elapsed / repeat * 1e6
+            print(f"index pre-check of 10 slots: {per_call:.2f} µs per call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.days, args.repeat))
@@ -0,0 +1,88 @@
+"""
+Availability matrix benchmark.
+
+Compares loading a week and a month of availability as one
+`GET /api/rooms/availability` matrix against one `GET /api/rooms?date=`
+listing per day: response bytes, statements executed on a cold index, and
+latency of both paths with the index cold and warm.
+
+Usage:
+    python -m benchmarks.availability_matrix --rooms 50 --repeat 50
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.schemas.room import AvailabilityMatrixRead, RoomRead
+from app.services.availability_index import availability_index
+from app.services.room_service import get_availability_matrix
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2026, 1, 5)
+ROOM_LIST = TypeAdapter(List[RoomRead])
+MATRIX = TypeAdapter(AvailabilityMatrixRead)
+
+
+async def _per_day(days: int, session: AsyncSession) -> int:
+    size = 0
+    for offset in range(days):
+        target_date = START + timedelta(days=offset)
+        rooms = await availability_index.rooms_on(target_date, session)
+        size += len(ROOM_LIST.dump_json(rooms))
+    return size
+
+
+async def _matrix(days: int, session: AsyncSession) -> int:
+    last = START + timedelta(days=days - 1)
+    return len(MATRIX.dump_json(await get_availability_matrix(START, last, session)))
+
+
+async def _compare(engine, label: str, days: int, repeat: int) -> None:
+    statements: list[str] = []
+
+    def _count(conn, cursor, sql, parameters, context, executemany):
+        statements.append(sql)
+
+    print(f"\n{label} ({days} days)")
+    async with AsyncSession(engine) as session:
+        for name, load in (("per-day listings", _per_day), ("matrix", _matrix)):
+            availability_index.reset()
+            event.listen(engine.sync_engine, "before_cursor_execute", _count)
+            try:
+                statements.clear()
+                with Timer() as cold:
+                    size = await load(days, session)
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", _count)
+            print(
+                f"  {name}: {size} bytes, {len(statements)} statements cold, "
+                f"{cold.elapsed * 1000:.1f} ms cold"
+            )
+            latencies = []
+            for _ in range(repeat):
+                with Timer() as timer:
+                    await load(days, session)
+                latencies.append(timer.elapsed)
+            print("  " + summarize(f"{name} warm", latencies))
+
+
+async def main(rooms: int, repeat: int) -> None:
+    async with temporary_engine() as engine:
+        await seed(engine, rooms=rooms, days=31, start=START, users=1)
+        print(f"{rooms} rooms")
+        await _compare(engine, "week", 7, repeat)
+        await _compare(engine, "month", 31, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.repeat))
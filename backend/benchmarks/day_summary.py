@@ -0,0 +1,141 @@
+"""
+Day summary benchmark.
+
+Seeds several years of slots and compares three ways of answering the month
+calendar (`GET /api/rooms/dates`): the original `extract()` year/month filter
+with `DISTINCT`, a `slot_date` range with `DISTINCT`, and the `DaySummary`
+range read. Prints each query plan and its latency, the time a full rebuild
+takes, and what keeping the summary current adds to a one-slot commit.
+
+Usage:
+    python -m benchmarks.day_summary --rooms 50 --years 3 --repeat 50
+"""
+
+import argparse
+import asyncio
+import calendar
+from datetime import date
+
+from sqlalchemy import event, extract
+from sqlalchemy.orm import Session
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import TimeSlot, TimeslotStatus
+from app.services import day_summary
+from app.services.room_service import get_available_dates
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2024, 1, 1)
+
+
+def _extract_statement(year: int, month: int):
+    return (
+        select(TimeSlot.slot_date)
+        .where(
+            extract("year", TimeSlot.slot_date) == year,  # type: ignore
+            extract("month", TimeSlot.slot_date) == month,  # type: ignore
+            TimeSlot.status == TimeslotStatus.AVAILABLE,
+        )
+        .distinct()
+    )
+
+
+def _range_statement(year: int, month: int):
+    first = date(year, month, 1)
+    last = date(year, month, calendar.monthrange(year, month)[1])
+    return (
+        select(TimeSlot.slot_date)
+        .where(
+            TimeSlot.slot_date >= first,
+            TimeSlot.slot_date <= last,
+            TimeSlot.status == TimeslotStatus.AVAILABLE,
+        )
+        .distinct()
+    )
+
+
+async def _measure(engine, label: str, query, repeat: int) -> None:
+    captured: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, sql, parameters, context, executemany):
+        captured.append((sql, parameters))
+
+    async with AsyncSession(engine) as session:
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            await query(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+        latencies = []
+        for _ in range(repeat):
+            with Timer() as timer:
+                await query(session)
+            latencies.append(timer.elapsed)
+
+    print(summarize(label, latencies))
+    async with engine.connect() as conn:
+        for sql, parameters in captured:
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {sql}", parameters  # type: ignore[arg-type]
+            )
+            for row in plan:
+                print(f"    {row[-1]}")
+
+
+async def _commit_cost(engine, repeat: int) -> list[float]:
+    latencies = []
+    async with AsyncSession(engine) as session:
+        slot = (await session.exec(select(TimeSlot).limit(1))).one()
+        for index in range(repeat):
+            slot.status = (
+                TimeslotStatus.HELD if index % 2 == 0 else TimeslotStatus.AVAILABLE
+            )
+            session.add(slot)
+            with Timer() as timer:
+                await session.commit()
+            latencies.append(timer.elapsed)
+    return latencies
+
+
+async def main(rooms: int, years: int, repeat: int) -> None:
+    async with temporary_engine() as engine:
+        days = (date(START.year + years, 1, 1) - START).days
+        await seed(engine, rooms=rooms, days=days, start=START, users=1)
+        print(f"dataset: {rooms * days * 10} slots over {days} days\n")
+        year, month = START.year + years // 2, 6
+
+        async def by_extract(session):
+            return (await session.exec(_extract_statement(year, month))).all()
+
+        async def by_range(session):
+            return (await session.exec(_range_statement(year, month))).all()
+
+        async def by_summary(session):
+            return await get_available_dates(year, month, session)
+
+        await _measure(engine, "extract + distinct", by_extract, repeat)
+        await _measure(engine, "slot_date range + distinct", by_range, repeat)
+        await _measure(engine, "day summary", by_summary, repeat)
+
+        async with AsyncSession(engine) as session:
+            with Timer() as timer:
+                rows = await day_summary.rebuild_day_summary(session)
+        print(f"\nrebuild: {rows} dates in {timer.elapsed * 1000:.1f} ms")
+
+        print(summarize("one-slot commit", await _commit_cost(engine, repeat)))
+        event.remove(Session, "before_commit", day_summary._refresh_touched_days)
+        try:
+            without = await _commit_cost(engine, repeat)
+        finally:
+            event.listen(Session, "before_commit", day_summary._refresh_touched_days)
+        print(summarize("one-slot commit, no summary", without))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.years, args.repeat))
@@ -0,0 +1,97 @@
+"""
+Idempotency key benchmark.
+
+Measures what a retried `POST /api/bookings` costs with an `Idempotency-Key`:
+the first request claims the key, submits the booking and stores the
+response, while every duplicate only looks the key up. Prints the latency of
+both paths, the statements a duplicate executes, and their query plans.
+
+Usage:
+    python -m benchmarks.idempotency --keys 2000 --duplicates 5
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import event
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import TimeSlot
+from app.services.async_booking_service import submit_booking
+from app.services.idempotency_service import (
+    StoredResponse,
+    claim_key,
+    complete_key,
+    request_fingerprint,
+)
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+TTL = timedelta(hours=24)
+
+
+async def _first(session, user, room_id: int, slot_id: int, key: str) -> None:
+    fingerprint = request_fingerprint({"slot_ids": [slot_id]})
+    assert await claim_key(user.id, key, fingerprint, TTL, session) is None
+    booking = await submit_booking(user, room_id, [slot_id], "none", None, session)
+    stored = StoredResponse(201, f'{{"id": {booking.id}}}')
+    await complete_key(user.id, key, stored, session)
+
+
+async def _duplicate(session, user, slot_id: int, key: str) -> None:
+    fingerprint = request_fingerprint({"slot_ids": [slot_id]})
+    assert await claim_key(user.id, key, fingerprint, TTL, session) is not None
+
+
+async def main(keys: int, duplicates: int) -> None:
+    async with temporary_engine() as engine:
+        users, _ = await seed(engine, rooms=20, days=max(1, keys // 200 + 1), users=1)
+        user = users[0]
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            statement = select(TimeSlot.room_id, TimeSlot.id).limit(keys)
+            targets = (await session.exec(statement)).all()
+
+            first_latencies = []
+            for room_id, slot_id in targets:
+                with Timer() as timer:
+                    await _first(session, user, room_id, slot_id, f"key-{slot_id}")
+                first_latencies.append(timer.elapsed)
+            print(summarize("first request", first_latencies))
+
+            duplicate_latencies = []
+            for _ in range(duplicates):
+                for _, slot_id in targets:
+                    with Timer() as timer:
+                        await _duplicate(session, user, slot_id, f"key-{slot_id}")
+                    duplicate_latencies.append(timer.elapsed)
+            print(summarize("duplicate request", duplicate_latencies))
+
+            captured: list[tuple[str, object]] = []
+
+            def _capture(conn, cursor, sql, parameters, context, executemany):
+                captured.append((sql, parameters))
+
+            event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+            try:
+                await _duplicate(session, user, targets[0][1], f"key-{targets[0][1]}")
+            finally:
+                event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        print(f"\nstatements per duplicate: {len(captured)}")
+        async with engine.connect() as conn:
+            for sql, parameters in captured:
+                print(f"  {' '.join(sql.split())}")
+                plan = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {sql}", parameters  # type: ignore[arg-type]
+                )
+                for row in plan:
+                    print(f"    {row[-1]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=2000)
+    parser.add_argument("--duplicates", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.keys, args.duplicates))
@@ -0,0 +1,239 @@
+"""
+Secondary index benchmark.
+
+Seeds a large synthetic dataset, then runs the hot booking, availability and
+notification queries twice: once with every declared secondary index dropped
+and once with them in place. For each query it prints the SQLite query plan
+and the latency distribution, so the effect of each index is visible.
+
+Usage:
+    python -m benchmarks.indexes --rooms 50 --days 730 --bookings 50000
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import and_, event, insert, update
+from sqlalchemy.orm import contains_eager
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    Booking,
+    BookingStatus,
+    Notification,
+    NotificationType,
+    Room,
+    TimeSlot,
+    TimeslotStatus,
+)
+from app.services.booking_workflow import (
+    all_bookings_statement,
+    recurrence_statement,
+    user_bookings_statement,
+)
+from app.services.notification_service import (
+    get_notifications_after,
+    get_unread_count,
+)
+from app.services.unread_counters import unread_counters
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2026, 1, 5)
+SLOT_START = time(9, 0)
+
+
+async def _seed_history(engine, users, rooms, bookings: int) -> None:
+    """
+    Adds bookings that each hold one slot, plus one notification per booking.
+    """
+    rng = random.Random(2026)
+    created = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with AsyncSession(engine) as session:
+        slot_ids = list(
+            (await session.exec(select(TimeSlot.id).limit(bookings))).all()
+        )
+        # Each booking reuses its slot's id, so the slot can point straight back.
+        booking_rows = [
+            {
+                "id": slot_id,
+                "userID": rng.choice(users).id,
+                "roomID": rng.choice(rooms).id,
+                "status": rng.choice(list(BookingStatus)),
+                "createdAt": created + timedelta(minutes=index),
+            }
+            for index, slot_id in enumerate(slot_ids)
+        ]
+        await session.exec(insert(Booking), params=booking_rows)
+        await session.exec(
+            update(TimeSlot)
+            .where(TimeSlot.id.in_(slot_ids))
+            .values(status=TimeslotStatus.HELD, booking_id=TimeSlot.id)
+        )
+        await session.exec(
+            insert(Notification),
+            params=[
+                {
+                    "userID": row["userID"],
+                    "bookingID": row["id"],
+                    "message": "seed",
+                    "type": rng.choice(list(NotificationType)),
+                    "isRead": rng.random() < 0.8,
+                    "createdAt": row["createdAt"],
+                }
+                for row in booking_rows
+            ],
+        )
+        await session.commit()
+
+
+def _room_availability_statement(target_date: date):
+    # The SQL shape the room listing ran before the availability index served it.
+    return (
+        select(Room)
+        .outerjoin(
+            TimeSlot,
+            and_(Room.id == TimeSlot.room_id, TimeSlot.slot_date == target_date),  # type: ignore[arg-type]
+        )
+        .options(contains_eager(Room.time_slots))  # type: ignore[arg-type]
+    )
+
+
+def _available_dates_statement(first: date, last: date):
+    # The SQL shape the calendar ran before it read `DaySummary`.
+    return (
+        select(TimeSlot.slot_date)
+        .where(
+            TimeSlot.slot_date >= first,
+            TimeSlot.slot_date <= last,
+            TimeSlot.status == TimeslotStatus.AVAILABLE,
+        )
+        .distinct()
+        .order_by(TimeSlot.slot_date)
+    )
+
+
+def _queries(users, rooms):
+    """
+    Returns `(label, coroutine factory)` pairs for the hot query shapes.
+
+    Room availability and available dates are now answered from memory, so
+    their raw SQL is timed instead of the service functions.
+    """
+    user_id = users[0].id
+    room = rooms[0]
+    anchor = TimeSlot(room_id=room.id, slot_date=START, start_time=SLOT_START)
+    weeks = {START + timedelta(weeks=week) for week in range(1, 15)}
+
+    async def user_bookings(session):
+        statement = user_bookings_statement(user_id, None, limit=20)
+        return (await session.exec(statement)).all()
+
+    async def pending_queue(session):
+        statement = all_bookings_statement(BookingStatus.PENDING, limit=50)
+        return (await session.exec(statement)).all()
+
+    async def recurrence(session):
+        return (await session.exec(recurrence_statement([anchor], weeks))).all()
+
+    async def room_availability(session):
+        statement = _room_availability_statement(START + timedelta(days=30))
+        return (await session.exec(statement)).unique().all()
+
+    async def available_dates(session):
+        statement = _available_dates_statement(date(2026, 3, 1), date(2026, 3, 31))
+        return (await session.exec(statement)).all()
+
+    async def unread_count(session):
+        # Bypass the in-memory counter so the COUNT(*) runs every time.
+        unread_counters.clear()
+        return await session.run_sync(lambda sync: get_unread_count(user_id, sync))
+
+    async def notification_feed(session):
+        return await session.run_sync(
+            lambda sync: get_notifications_after(user_id, 0, sync, 50)
+        )
+
+    return [
+        ("user bookings page", user_bookings),
+        ("pending queue page", pending_queue),
+        ("recurrence lookup", recurrence),
+        ("room availability", room_availability),
+        ("available dates", available_dates),
+        ("unread notifications", unread_count),
+        ("notification feed", notification_feed),
+    ]
+
+
+async def _measure(engine, label: str, query, repeat: int) -> None:
+    captured: list[tuple[str, object]] = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    async with AsyncSession(engine) as session:
+        event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+        try:
+            await query(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+
+        latencies = []
+        for _ in range(repeat):
+            with Timer() as timer:
+                await query(session)
+            latencies.append(timer.elapsed)
+            session.expunge_all()
+
+    print(summarize(label, latencies))
+    async with engine.connect() as conn:
+        for statement, parameters in captured:
+            plan = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters  # type: ignore[arg-type]
+            )
+            for row in plan:
+                print(f"    {row[-1]}")
+
+
+async def _drop_indexes(engine) -> None:
+    async with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def _create_indexes(engine) -> None:
+    # Mirrors `app.database.create_missing_indexes`, which needs the app's env.
+    async with engine.begin() as conn:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                await conn.run_sync(index.create, checkfirst=True)
+        await conn.exec_driver_sql("ANALYZE")
+
+
+async def main(rooms: int, days: int, bookings: int, repeat: int) -> None:
+    async with temporary_engine() as engine:
+        users, room_rows = await seed(engine, rooms=rooms, days=days, users=500)
+        await _seed_history(engine, users, room_rows, bookings)
+        print(f"dataset: {rooms * days * 10} slots, {bookings} bookings/notifications\n")
+
+        phases = (("without indexes", _drop_indexes), ("with indexes", _create_indexes))
+        for phase, prepare in phases:
+            await prepare(engine)
+            print(f"── {phase} ──")
+            for label, query in _queries(users, room_rows):
+                await _measure(engine, label, query, repeat)
+            print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--bookings", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.days, args.bookings, args.repeat))
@@ -0,0 +1,108 @@
+"""
+Notification stream load test.
+
+Holds `--streams` concurrent idle notification streams in one event loop,
+spread over `--users` users, then commits `--notifications` notifications
+and measures how long each takes to reach every open stream of its
+recipient. Also reports the memory held per idle stream and the heartbeats
+sent while they sit idle.
+
+Streams are driven through `stream_notifications`, the generator behind
+`GET /api/notifications/stream`, so the numbers cover the worker's own
+per-connection cost without sockets or HTTP framing.
+
+Usage:
+    python -m benchmarks.notification_stream --streams 5000 --users 1000
+"""
+
+import argparse
+import asyncio
+import random
+import time as clock
+import tracemalloc
+from collections import Counter, defaultdict
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Notification, NotificationType
+from app.services.notification_hub import (
+    NotificationMessage,
+    notification_hub,
+    stream_notifications,
+)
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+
+async def _no_replay(after_id: int) -> list[NotificationMessage]:
+    return []
+
+
+async def main(streams: int, users: int, notifications: int, heartbeat: float) -> None:
+    async with temporary_engine() as engine:
+        user_rows, _ = await seed(engine, rooms=1, days=1, users=users)
+        user_ids = [user.id for user in user_rows]
+        recipients = [user_ids[index % users] for index in range(streams)]
+        streams_per_user = Counter(recipients)
+        received: dict[int, list[float]] = defaultdict(list)
+        heartbeats = 0
+
+        async def consume(user_id) -> None:
+            nonlocal heartbeats
+            async for message in stream_notifications(
+                user_id, None, _no_replay, heartbeat, 3600.0
+            ):
+                if message is None:
+                    heartbeats += 1
+                else:
+                    received[message.id].append(clock.perf_counter())
+
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        with Timer() as opening:
+            tasks = [asyncio.create_task(consume(user_id)) for user_id in recipients]
+            while notification_hub.connections() < streams:
+                await asyncio.sleep(0.01)
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{streams} idle streams over {users} users")
+        print(f"    opened in {opening.elapsed * 1000:.1f}ms")
+        print(f"    memory per idle stream: {(held - before) / streams / 1024:.2f} KiB")
+
+        with Timer() as idle:
+            await asyncio.sleep(heartbeat * 3.5)
+        print(f"    {heartbeats} heartbeats in {idle.elapsed:.2f}s")
+
+        latencies: list[float] = []
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            with Timer() as total:
+                for _ in range(notifications):
+                    notification = Notification(
+                        userID=random.choice(user_ids),
+                        bookingID=1,
+                        message="Your booking #1 has been approved",
+                        type=NotificationType.APPROVED,
+                    )
+                    session.add(notification)
+                    committed = clock.perf_counter()
+                    await session.commit()
+                    expected = streams_per_user[notification.userID]
+                    while len(received[notification.id]) < expected:
+                        await asyncio.sleep(0)
+                    latencies.extend(
+                        arrived - committed for arrived in received[notification.id]
+                    )
+        print(summarize("commit to stream delivery", latencies, total.elapsed))
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--notifications", type=int, default=200)
+    parser.add_argument("--heartbeat", type=float, default=1.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.streams, args.users, args.notifications, args.heartbeat))
@@ -0,0 +1,100 @@
+"""
+Room listing cache benchmark.
+
+Runs `--readers` concurrent dashboard readers that each request the room
+listing for a handful of dates, and reports p50/p99 latency for three paths:
+the previous ORM outer join plus JSON encoding, the availability index plus
+JSON encoding, and the warm serialized-response cache.
+
+Usage:
+    python -m benchmarks.room_cache --rooms 50 --readers 32 --requests 200
+"""
+
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import and_
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot
+from app.schemas.room import RoomRead
+from app.services.availability_index import availability_index
+from app.services.room_cache import rooms_cache
+from app.services.room_service import get_rooms_with_availability_json
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2026, 1, 5)
+ROOM_LIST = TypeAdapter(List[RoomRead])
+
+
+async def _orm_join(target_date: date, session: AsyncSession) -> bytes:
+    statement = (
+        select(Room)
+        .outerjoin(
+            TimeSlot,
+            and_(Room.id == TimeSlot.room_id, TimeSlot.slot_date == target_date),  # type: ignore[arg-type]
+        )
+        .options(contains_eager(Room.time_slots))  # type: ignore[arg-type]
+    )
+    rooms = list((await session.exec(statement)).unique().all())
+    reads = ROOM_LIST.validate_python(rooms, from_attributes=True)
+    payload = ROOM_LIST.dump_json(reads)
+    session.expunge_all()
+    return payload
+
+
+async def _index(target_date: date, session: AsyncSession) -> bytes:
+    return ROOM_LIST.dump_json(await availability_index.rooms_on(target_date, session))
+
+
+async def _measure(label: str, engine, query, readers: int, requests: int) -> None:
+    dates = [START + timedelta(days=offset) for offset in range(7)]
+    latencies: list[float] = []
+
+    async def reader(index: int) -> None:
+        async with AsyncSession(engine) as session:
+            for request in range(requests):
+                with Timer() as timer:
+                    await query(dates[(index + request) % len(dates)], session)
+                latencies.append(timer.elapsed)
+
+    with Timer() as total:
+        await asyncio.gather(*(reader(index) for index in range(readers)))
+    print(summarize(label, latencies, total.elapsed))
+
+
+async def main(rooms: int, readers: int, requests: int) -> None:
+    async with temporary_engine() as engine:
+        await seed(engine, rooms=rooms, days=30, start=START, users=1)
+        print(f"{rooms} rooms, {readers} concurrent readers x {requests} requests\n")
+
+        await _measure("orm join + encode", engine, _orm_join, readers, requests)
+        await _measure("index + encode", engine, _index, readers, requests)
+        async with AsyncSession(engine) as session:
+            for offset in range(7):
+                await get_rooms_with_availability_json(
+                    START + timedelta(days=offset), session
+                )
+        await _measure(
+            "warm response cache",
+            engine,
+            get_rooms_with_availability_json,
+            readers,
+            requests,
+        )
+        stats = rooms_cache.stats()
+        print(f"\ncache: {stats.hits} hits, {stats.misses} misses, size {stats.size}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.readers, args.requests))
@@ -0,0 +1,124 @@
+"""
+Free-slot search benchmark.
+
+Answers "rooms for `--capacity` people with `--duration` contiguous minutes
+over the next `--days` days" two ways: the client-side approach of fetching
+one `GET /api/rooms?date=` listing per day from the database and scanning it,
+and `search_rooms` over the availability index, cold and warm. A share of the
+slots is booked at random so runs are fragmented.
+
+Usage:
+    python -m benchmarks.room_search --rooms 50 --days 14 --repeat 50
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, update
+from sqlalchemy.orm import contains_eager
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot, TimeslotStatus
+from app.services.availability_index import availability_index
+from app.services.room_service import search_rooms
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+START = date(2026, 1, 5)
+
+
+async def _per_day_scan(
+    days: int, capacity: int, duration: timedelta, session: AsyncSession
+) -> list[tuple[date, int]]:
+    fits = []
+    for offset in range(days):
+        target_date = START + timedelta(days=offset)
+        statement = (
+            select(Room)
+            .outerjoin(
+                TimeSlot,
+                and_(Room.id == TimeSlot.room_id, TimeSlot.slot_date == target_date),  # type: ignore[arg-type]
+            )
+            .options(contains_eager(Room.time_slots))  # type: ignore[arg-type]
+        )
+        rooms = (await session.exec(statement)).unique().all()
+        for room in rooms:
+            if room.capacity < capacity:
+                continue
+            slots = sorted(room.time_slots, key=lambda slot: slot.start_time)
+            run_start = None
+            previous_end = None
+            for slot in slots:
+                if slot.status != TimeslotStatus.AVAILABLE:
+                    run_start = None
+                    continue
+                if run_start is None or slot.start_time != previous_end:
+                    run_start = slot.start_time
+                previous_end = slot.end_time
+                opened = datetime.combine(target_date, run_start)
+                if datetime.combine(target_date, slot.end_time) - opened >= duration:
+                    fits.append((target_date, room.id))
+                    break
+        session.expunge_all()
+    return fits
+
+
+async def main(
+    rooms: int, days: int, capacity: int, duration: int, repeat: int
+) -> None:
+    async with temporary_engine() as engine:
+        await seed(engine, rooms=rooms, days=days, start=START, users=1)
+        rng = random.Random(2026)
+        async with AsyncSession(engine) as session:
+            slot_ids = list((await session.exec(select(TimeSlot.id))).all())
+            booked = rng.sample(slot_ids, len(slot_ids) // 3)
+            await session.exec(
+                update(TimeSlot)
+                .where(TimeSlot.id.in_(booked))  # type: ignore[union-attr]
+                .values(status=TimeslotStatus.BOOKED)
+            )
+            await session.commit()
+        print(f"{rooms} rooms x {days} days, one third of the slots booked\n")
+
+        window = timedelta(minutes=duration)
+        last = START + timedelta(days=days - 1)
+        async with AsyncSession(engine) as session:
+
+            async def per_day():
+                await _per_day_scan(days, capacity, window, session)
+
+            async def index(limit: int = 100):
+                await search_rooms(
+                    START, last, capacity, duration, None, None, limit, session
+                )
+
+            async def cold_index():
+                availability_index.reset()
+                await index()
+
+            for label, query in (
+                ("per-day listings + scan", per_day),
+                ("index search cold", cold_index),
+                ("index search warm", index),
+            ):
+                latencies = []
+                for _ in range(repeat):
+                    with Timer() as timer:
+                        await query()
+                    latencies.append(timer.elapsed)
+                print(summarize(label, latencies))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--capacity", type=int, default=25)
+    parser.add_argument("--duration", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(
+        main(args.rooms, args.days, args.capacity, args.duration, args.repeat)
+    )
@@ -0,0 +1,86 @@
+"""
+Request coalescing benchmark.
+
+Simulates the top-of-the-hour burst: `--readers` concurrent requests, each
+with its own session, ask for the same day's room listing and the same
+month's available dates while nothing is cached. Reports latency and the
+number of statements executed with and without single-flight coalescing.
+
+Usage:
+    python -m benchmarks.single_flight --rooms 50 --readers 200
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from sqlalchemy import event
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.services.availability_index import availability_index
+from app.services.day_summary import get_summary_available_dates
+from app.services.room_cache import rooms_cache
+from app.services.room_service import (
+    _ROOM_LIST,
+    get_available_dates,
+    get_coalescing_stats,
+    get_rooms_with_availability,
+    get_rooms_with_availability_json,
+)
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+TODAY = date(2026, 1, 12)
+
+
+async def _uncoalesced(session: AsyncSession) -> None:
+    rooms = await get_rooms_with_availability(TODAY, session)
+    _ROOM_LIST.dump_json(rooms)
+    await get_summary_available_dates(TODAY.year, TODAY.month, session)
+
+
+async def _coalesced(session: AsyncSession) -> None:
+    await get_rooms_with_availability_json(TODAY, session)
+    await get_available_dates(TODAY.year, TODAY.month, session)
+
+
+async def _burst(engine, label: str, request, readers: int) -> None:
+    availability_index.reset()
+    rooms_cache.clear()
+    statements: list[str] = []
+    latencies: list[float] = []
+
+    def _count(conn, cursor, sql, parameters, context, executemany):
+        statements.append(sql)
+
+    async def reader() -> None:
+        async with AsyncSession(engine) as session:
+            with Timer() as timer:
+                await request(session)
+            latencies.append(timer.elapsed)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        with Timer() as total:
+            await asyncio.gather(*(reader() for _ in range(readers)))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _count)
+    print(summarize(label, latencies, total.elapsed))
+    print(f"    statements executed: {len(statements)}")
+
+
+async def main(rooms: int, readers: int) -> None:
+    async with temporary_engine() as engine:
+        await seed(engine, rooms=rooms, days=30, start=date(2026, 1, 1), users=1)
+        print(f"{rooms} rooms, burst of {readers} identical requests\n")
+        await _burst(engine, "without coalescing", _uncoalesced, readers)
+        await _burst(engine, "single-flight", _coalesced, readers)
+        for name, stats in get_coalescing_stats().items():
+            print(f"{name}: {stats.executed} executed, {stats.coalesced} coalesced")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--readers", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.rooms, args.readers))
@@ -0,0 +1,99 @@
+"""
+Unread count benchmark.
+
+Gives one user `--unread` unread notifications and times the badge count
+three ways: loading every unread row (the previous implementation), a
+`COUNT(*)` over the notification index, and the in-memory unread counter.
+
+Usage:
+    python -m benchmarks.unread_count --unread 5000 --reads 500
+"""
+
+import argparse
+import asyncio
+from typing import cast
+
+from sqlalchemy import func, insert
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Notification, NotificationType
+from app.services.notification_service import get_unread_count, peek_unread_count
+from app.services.unread_counters import unread_counters
+from benchmarks._common import Timer, seed, summarize, temporary_engine
+
+
+def _load_rows(user_id, session: Session) -> int:
+    statement = select(Notification).where(
+        Notification.userID == user_id, Notification.isRead.is_(False)
+    )
+    return len(list(session.exec(statement)))
+
+
+def _count_rows(user_id, session: Session) -> int:
+    statement = (
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.userID == user_id, Notification.isRead.is_(False))
+    )
+    return session.exec(statement).one()
+
+
+async def _time(label: str, read, reads: int) -> None:
+    latencies: list[float] = []
+    with Timer() as total:
+        for _ in range(reads):
+            with Timer() as timer:
+                await read()
+            latencies.append(timer.elapsed)
+    print(summarize(label, latencies, total.elapsed))
+
+
+def _query(session: AsyncSession, count, user_id):
+    async def read() -> int:
+        return await session.run_sync(
+            lambda sync_session: count(user_id, cast(Session, sync_session))
+        )
+
+    return read
+
+
+async def main(unread: int, reads: int) -> None:
+    async with temporary_engine() as engine:
+        (user,), _ = await seed(engine, rooms=1, days=1, users=1)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            await session.exec(
+                insert(Notification),
+                params=[
+                    {
+                        "userID": user.id,
+                        "bookingID": 1,
+                        "message": "Your booking #1 has been approved",
+                        "type": NotificationType.APPROVED,
+                    }
+                    for _ in range(unread)
+                ],
+            )
+            await session.commit()
+            unread_counters.clear()
+
+            print(f"one user with {unread} unread notifications\n")
+            load_rows = _query(session, _load_rows, user.id)
+            count_rows = _query(session, _count_rows, user.id)
+            count_cached = _query(session, get_unread_count, user.id)
+
+            async def badge() -> int:
+                count = peek_unread_count(user.id)
+                return count if count is not None else await count_cached()
+
+            await _time("load every unread row", load_rows, reads)
+            await _time("COUNT(*)", count_rows, reads)
+            await _time("cached counter", badge, reads)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--unread", type=int, default=5000)
+    parser.add_argument("--reads", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.unread, args.reads))
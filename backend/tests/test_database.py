@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.database import engine, get_session
+from app.database import create_missing_indexes, engine, get_session
 
 
 def test_database_url_configurable(monkeypatch):
@@ -47,6 +47,38 @@ async def test_create_all():
     assert "notification" in tables
 
 
+@pytest.mark.asyncio
+async def test_create_missing_indexes_backfills_existing_database():
+    """Test that declared indexes are added to tables created without them."""
+    test_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with test_engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.exec_driver_sql("DROP INDEX ix_timeslot_room_date_time")
+        await conn.run_sync(create_missing_indexes)
+
+    def get_index_names(sync_conn):
+        inspector = inspect(sync_conn)
+        return {
+            table: {index["name"] for index in inspector.get_indexes(table)}
+            for table in ("booking", "timeslot", "notification")
+        }
+
+    async with test_engine.connect() as conn:
+        indexes = await conn.run_sync(get_index_names)
+
+    assert {"ix_booking_user_created", "ix_booking_status_created"} <= indexes["booking"]
+    assert {
+        "ix_timeslot_room_date_time",
+        "ix_timeslot_date_status",
+        "ix_timeslot_booking",
+    } <= indexes["timeslot"]
+    assert {
+        "ix_notification_user_read_created",
+        "ix_notification_user_id",
+    } <= indexes["notification"]
+
+
 @pytest.mark.asyncio
 async def test_get_session():
     """Test that get_session yields a sqlmodel.ext.asyncio.session.AsyncSession."""
@@ -4,16 +4,18 @@ Covers:
     -Instantiation
     -Status validation
     -Recurrence validation
+    -Recurrence rule expansion
     -Default vals
     -No dependency on routes or services
 """
 
 import uuid
 from datetime import date, datetime, timezone
+from itertools import islice
 
 import pytest
 
-from app.models import Booking, BookingStatus, RecurrenceFrequency
+from app.models import Booking, BookingStatus, RecurrenceFrequency, RecurrenceRule
 
 
 def _make_booking(**overrides) -> Booking:
@@ -134,10 +136,12 @@ class TestBookingStatusValidation:
 
 
 class TestBookingRecurrenceValidation:
-    @pytest.mark.parametrize("freq_str", ["none", "weekly"])
+    @pytest.mark.parametrize(
+        "freq_str", ["none", "weekly", "biweekly", "monthly_by_weekday"]
+    )
     def test_valid_recurrence_freq_string(self, freq_str: str):
         kwargs = {"recurrenceFrequency": freq_str}
-        if freq_str == "weekly":
+        if freq_str != "none":
             kwargs["recurrenceEndDate"] = date(2026, 12, 31)  # type: ignore
         b = _make_booking(**kwargs)
         assert b.recurrenceFrequency == freq_str
@@ -159,3 +163,63 @@ class TestBookingRecurrenceValidation:
     def test_invalid_recurrence_freq_raises(self, bad_freq: str):
         with pytest.raises(Exception, match="Invalid recurrence"):
             _make_booking(recurrenceFrequency=bad_freq)
+
+
+# Recurrence rules
+
+
+class TestRecurrenceRule:
+    def test_none_yields_only_anchor(self):
+        rule = RecurrenceRule(RecurrenceFrequency.NONE, date(2026, 12, 31))
+        assert list(rule.occurrences(date(2026, 4, 1))) == [date(2026, 4, 1)]
+
+    def test_weekly_repeats_anchor_weekday_until_end(self):
+        rule = RecurrenceRule(RecurrenceFrequency.WEEKLY, date(2026, 4, 15))
+        assert list(rule.occurrences(date(2026, 4, 1))) == [
+            date(2026, 4, 1),
+            date(2026, 4, 8),
+            date(2026, 4, 15),
+        ]
+
+    def test_biweekly_on_weekdays_skips_exclusions(self):
+        rule = RecurrenceRule(
+            RecurrenceFrequency.BIWEEKLY,
+            date(2026, 4, 30),
+            weekdays=frozenset({0, 3}),
+            exclusions=frozenset({date(2026, 4, 16)}),
+        )
+        # Wednesday anchor; repeats on Mondays and Thursdays every other week.
+        assert list(rule.occurrences(date(2026, 4, 1))) == [
+            date(2026, 4, 1),
+            date(2026, 4, 2),
+            date(2026, 4, 13),
+            date(2026, 4, 27),
+            date(2026, 4, 30),
+        ]
+
+    def test_monthly_by_weekday_keeps_week_of_month(self):
+        rule = RecurrenceRule(RecurrenceFrequency.MONTHLY_BY_WEEKDAY, date(2026, 7, 31))
+        # 2026-04-14 is the second Tuesday of April.
+        assert list(rule.occurrences(date(2026, 4, 14))) == [
+            date(2026, 4, 14),
+            date(2026, 5, 12),
+            date(2026, 6, 9),
+            date(2026, 7, 14),
+        ]
+
+    def test_monthly_by_weekday_skips_months_without_that_week(self):
+        rule = RecurrenceRule(RecurrenceFrequency.MONTHLY_BY_WEEKDAY, date(2026, 8, 31))
+        # 2026-05-29 is the fifth Friday of May; June and August have none.
+        assert list(rule.occurrences(date(2026, 5, 29))) == [
+            date(2026, 5, 29),
+            date(2026, 7, 31),
+        ]
+
+    def test_occurrences_are_generated_lazily(self):
+        rule = RecurrenceRule(RecurrenceFrequency.WEEKLY, date(9999, 12, 31))
+        occurrences = rule.occurrences(date(2026, 1, 5))
+        assert list(islice(occurrences, 3)) == [
+            date(2026, 1, 5),
+            date(2026, 1, 12),
+            date(2026, 1, 19),
+        ]
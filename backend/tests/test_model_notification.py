@@ -156,12 +156,14 @@ class TestNotificationEnumTypeIntegrity:
             NotificationType.APPROVED,
             NotificationType.DENIED,
             NotificationType.CANCELLED,
+            NotificationType.EXPIRED,
         }
 
     def test_enum_values(self):
         assert NotificationType.APPROVED.value == "approved"
         assert NotificationType.DENIED.value == "denied"
         assert NotificationType.CANCELLED.value == "cancelled"
+        assert NotificationType.EXPIRED.value == "expired"
 
     def test_enum_str(self):
         # Enum vals should be usable as plain text strings'
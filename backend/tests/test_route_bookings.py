@@ -1,4 +1,7 @@
-from datetime import date, time
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
 import pytest_asyncio
@@ -8,6 +11,7 @@ from sqlmodel import SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.models  # noqa: F401
+from app.routes import bookings as bookings_routes
 from app.database import get_session
 from app.main import app
 from app.models import (
@@ -19,6 +23,7 @@ from app.models import (
     TimeSlot,
     TimeslotStatus,
 )
+from app.services.booking_service import EXPORT_FIELDS
 
 test_engine = create_async_engine(
     "sqlite+aiosqlite:///:memory:",
@@ -468,3 +473,535 @@ async def test_patch_cancel_on_approved_booking_releases_booked_slots(
     booking = await session.get(Booking, booking_id)
     assert booking is not None
     assert booking.status == BookingStatus.CANCELLED
+
+
+async def _submit(client: AsyncClient, token: str, room_id: int, slot: TimeSlot) -> int:
+    response = await client.post(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "room_id": room_id,
+            "date": slot.slot_date.isoformat(),
+            "slot_ids": [slot.id],
+            "recurrence_freq": "none",
+            "recurrence_end_date": None,
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_post_actions_applies_batch_with_per_item_results(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "admin-bulk@example.com", role="admin")
+    student = await _register_and_login(client, "student-bulk@example.com")
+    room = await _create_room(session, "A-212")
+    slots = [
+        await _create_slot(session, room.id, date(2026, 4, 8), time(h, 0), time(h + 1, 0))
+        for h in (9, 10, 11)
+    ]
+    approve_id, deny_id, pending_id = [
+        await _submit(client, student["token"], room.id, slot) for slot in slots
+    ]
+
+    response = await client.post(
+        "/api/bookings/actions",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+        json=[
+            {"booking_id": approve_id, "action": "approve"},
+            {"booking_id": deny_id, "action": "deny"},
+            {"booking_id": pending_id, "action": "cancel"},
+            {"booking_id": 9999, "action": "approve"},
+        ],
+    )
+
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status_code"] for r in results] == [200, 200, 400, 404]
+    assert results[0]["booking"]["status"] == "approved"
+    assert results[1]["booking"]["status"] == "denied"
+    assert results[2]["booking"] is None
+    assert "approved" in results[2]["detail"]
+
+    statuses = {}
+    for slot in slots:
+        await session.refresh(slot)
+        statuses[slot.id] = slot.status
+    assert [statuses[slot.id] for slot in slots] == [
+        TimeslotStatus.BOOKED,
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.HELD,
+    ]
+
+    notifications = (await session.exec(select(Notification))).all()
+    assert sorted((n.bookingID, n.type) for n in notifications) == [
+        (approve_id, NotificationType.APPROVED),
+        (deny_id, NotificationType.DENIED),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_post_actions_rejects_duplicate_and_oversized_batches(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "admin-bulk3@example.com", role="admin")
+    headers = {"Authorization": f"Bearer {admin['token']}"}
+
+    duplicate = await client.post(
+        "/api/bookings/actions",
+        headers=headers,
+        json=[
+            {"booking_id": 1, "action": "approve"},
+            {"booking_id": 2, "action": "approve"},
+            {"booking_id": 1, "action": "deny"},
+        ],
+    )
+    assert duplicate.status_code == 422
+    assert "repeated: 1" in duplicate.json()["detail"]
+
+    oversized = await client.post(
+        "/api/bookings/actions",
+        headers=headers,
+        json=[
+            {"booking_id": booking_id, "action": "approve"}
+            for booking_id in range(bookings_routes.MAX_BATCH_ACTIONS + 1)
+        ],
+    )
+    assert oversized.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_post_actions_as_non_admin_returns_403(
+    client: AsyncClient, session: AsyncSession
+):
+    student = await _register_and_login(client, "student-bulk2@example.com")
+
+    response = await client.post(
+        "/api/bookings/actions",
+        headers={"Authorization": f"Bearer {student['token']}"},
+        json=[{"booking_id": 1, "action": "approve"}],
+    )
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_get_bookings_paginates_with_cursor_header(
+    client: AsyncClient, session: AsyncSession
+):
+    student = await _register_and_login(client, "student-pages@example.com")
+    headers = {"Authorization": f"Bearer {student['token']}"}
+    room = await _create_room(session, "A-213")
+    booking_ids = []
+    for hour in range(9, 14):
+        slot = await _create_slot(
+            session, room.id, date(2026, 4, 9), time(hour, 0), time(hour + 1, 0)
+        )
+        booking_ids.append(await _submit(client, student["token"], room.id, slot))
+
+    seen: list[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 2}
+        if cursor is not None:
+            params["cursor"] = cursor
+        response = await client.get("/api/bookings", headers=headers, params=params)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(item["id"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == list(reversed(booking_ids))
+
+    unpaged = await client.get("/api/bookings", headers=headers)
+    assert "X-Next-Cursor" not in unpaged.headers
+    assert [item["id"] for item in unpaged.json()] == seen
+
+
+@pytest.mark.asyncio
+async def test_admin_queue_is_paginated_by_default(
+    client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(bookings_routes, "DEFAULT_ADMIN_PAGE_SIZE", 2)
+    admin = await _register_and_login(client, "admin-pages@example.com", role="admin")
+    student = await _register_and_login(client, "student-queue@example.com")
+    headers = {"Authorization": f"Bearer {admin['token']}"}
+    room = await _create_room(session, "A-216")
+    for hour in range(9, 12):
+        slot = await _create_slot(
+            session, room.id, date(2026, 4, 12), time(hour, 0), time(hour + 1, 0)
+        )
+        await _submit(client, student["token"], room.id, slot)
+
+    first = await client.get("/api/bookings?status=pending", headers=headers)
+    assert len(first.json()) == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    rest = await client.get(
+        "/api/bookings", headers=headers, params={"status": "pending", "cursor": cursor}
+    )
+    assert len(rest.json()) == 1
+    assert "X-Next-Cursor" not in rest.headers
+
+
+@pytest.mark.asyncio
+async def test_get_bookings_include_room_embeds_room_summary(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "admin-embed@example.com", role="admin")
+    student = await _register_and_login(client, "student-embed@example.com")
+    first_room = await _create_room(session, "A-214")
+    second_room = await _create_room(session, "B-214")
+    for room in (first_room, second_room):
+        slot = await _create_slot(
+            session, room.id, date(2026, 4, 10), time(9, 0), time(10, 0)
+        )
+        await _submit(client, student["token"], room.id, slot)
+
+    response = await client.get(
+        "/api/bookings?include=room&limit=10",
+        headers={"Authorization": f"Bearer {student['token']}"},
+    )
+    assert response.status_code == 200
+    assert [item["room"] for item in response.json()] == [
+        {"id": second_room.id, "name": "B-214", "capacity": 30},
+        {"id": first_room.id, "name": "A-214", "capacity": 30},
+    ]
+
+    queue = await client.get(
+        "/api/bookings?status=pending&include=room",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+    )
+    assert {item["room"]["name"] for item in queue.json()} == {"A-214", "B-214"}
+
+    plain = await client.get(
+        "/api/bookings", headers={"Authorization": f"Bearer {student['token']}"}
+    )
+    assert all(item["room"] is None for item in plain.json())
+
+    unknown = await client.get(
+        "/api/bookings?include=user",
+        headers={"Authorization": f"Bearer {student['token']}"},
+    )
+    assert unknown.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_get_booking_by_id_checks_owner_and_revalidates_with_etag(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "admin-one@example.com", role="admin")
+    owner = await _register_and_login(client, "owner-one@example.com")
+    other = await _register_and_login(client, "other-one@example.com")
+    room = await _create_room(session, "A-215")
+    slot = await _create_slot(session, room.id, date(2026, 4, 11), time(9, 0), time(10, 0))
+    booking_id = await _submit(client, owner["token"], room.id, slot)
+    owner_headers = {"Authorization": f"Bearer {owner['token']}"}
+
+    response = await client.get(f"/api/bookings/{booking_id}", headers=owner_headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == booking_id
+    assert response.json()["timeSlots"][0]["id"] == slot.id
+    etag = response.headers["etag"]
+
+    cached = await client.get(
+        f"/api/bookings/{booking_id}",
+        headers={**owner_headers, "If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    hidden = await client.get(
+        f"/api/bookings/{booking_id}",
+        headers={"Authorization": f"Bearer {other['token']}"},
+    )
+    assert hidden.status_code == 404
+    missing = await client.get(f"/api/bookings/{booking_id + 1}", headers=owner_headers)
+    assert missing.status_code == 404
+
+    approve = await client.patch(
+        f"/api/bookings/{booking_id}",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+        json={"action": "approve"},
+    )
+    assert approve.status_code == 200
+
+    changed = await client.get(
+        f"/api/bookings/{booking_id}",
+        headers={**owner_headers, "If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "approved"
+    assert changed.headers["etag"] != etag
+
+    as_admin = await client.get(
+        f"/api/bookings/{booking_id}",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+    )
+    assert as_admin.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_bookings_with_invalid_cursor_returns_400(
+    client: AsyncClient, session: AsyncSession
+):
+    student = await _register_and_login(client, "student-badcursor@example.com")
+
+    response = await client.get(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {student['token']}"},
+        params={"limit": 2, "cursor": "not-a-cursor"},
+    )
+
+    assert response.status_code == 400
+
+
+async def _post_with_key(
+    client: AsyncClient, token: str, key: str, room_id: int, slot_ids: list[int]
+):
+    return await client.post(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {token}", "Idempotency-Key": key},
+        json={
+            "room_id": room_id,
+            "date": "2026-04-01",
+            "slot_ids": slot_ids,
+            "recurrence_freq": "none",
+            "recurrence_end_date": None,
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_post_bookings_replays_response_for_repeated_idempotency_key(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "retry@example.com")
+    room = await _create_room(session)
+    slot = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+
+    first = await _post_with_key(client, user["token"], "retry-1", room.id, [slot.id])
+    second = await _post_with_key(client, user["token"], "retry-1", room.id, [slot.id])
+
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    bookings = (await session.exec(select(Booking))).all()
+    assert len(bookings) == 1
+
+
+@pytest.mark.asyncio
+async def test_post_bookings_replays_stored_error_for_idempotency_key(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "retry-error@example.com")
+    room = await _create_room(session)
+    slot = await _create_slot(
+        session,
+        room.id,
+        date(2026, 4, 1),
+        time(9, 0),
+        time(10, 0),
+        status=TimeslotStatus.BOOKED,
+    )
+
+    first = await _post_with_key(client, user["token"], "retry-2", room.id, [slot.id])
+    slot.status = TimeslotStatus.AVAILABLE
+    session.add(slot)
+    await session.commit()
+    second = await _post_with_key(client, user["token"], "retry-2", room.id, [slot.id])
+
+    assert first.status_code == second.status_code == 409
+    assert second.json() == first.json()
+    assert (await session.exec(select(Booking))).all() == []
+
+
+@pytest.mark.asyncio
+async def test_post_bookings_rejects_idempotency_key_reused_for_other_body(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "retry-reuse@example.com")
+    room = await _create_room(session)
+    first_slot = await _create_slot(
+        session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0)
+    )
+    second_slot = await _create_slot(
+        session, room.id, date(2026, 4, 1), time(10, 0), time(11, 0)
+    )
+
+    first = await _post_with_key(
+        client, user["token"], "retry-3", room.id, [first_slot.id]
+    )
+    second = await _post_with_key(
+        client, user["token"], "retry-3", room.id, [second_slot.id]
+    )
+
+    assert first.status_code == 201
+    assert second.status_code == 422
+    await session.refresh(second_slot)
+    assert second_slot.status == TimeslotStatus.AVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_streams_one_ndjson_row_per_slot(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "export-admin@example.com", role="admin")
+    student = await _register_and_login(client, "export-student@example.com")
+    room = await _create_room(session, "A-210")
+    first = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    week_two = await _create_slot(
+        session, room.id, date(2026, 4, 8), time(9, 0), time(10, 0)
+    )
+    other = await _create_slot(session, room.id, date(2026, 4, 2), time(9, 0), time(10, 0))
+
+    recurring = await client.post(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {student['token']}"},
+        json={
+            "room_id": room.id,
+            "date": "2026-04-01",
+            "slot_ids": [first.id],
+            "recurrence_freq": "weekly",
+            "recurrence_end_date": "2026-04-08",
+        },
+    )
+    assert recurring.status_code == 201
+    single_id = await _submit(client, student["token"], room.id, other)
+
+    response = await client.get(
+        "/api/bookings/export",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [(row["booking_id"], row["slot_id"]) for row in rows] == [
+        (recurring.json()["id"], first.id),
+        (recurring.json()["id"], week_two.id),
+        (single_id, other.id),
+    ]
+    assert rows[0]["user_id"] == student["id"]
+    assert rows[0]["booking_status"] == "pending"
+    assert rows[0]["slot_date"] == "2026-04-01"
+    assert rows[0]["start_time"] == "09:00:00"
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_as_csv_filters_by_status_and_dates(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "export-csv@example.com", role="admin")
+    room = await _create_room(session, "A-211")
+    slot = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    booking_id = await _submit(client, admin["token"], room.id, slot)
+    headers = {"Authorization": f"Bearer {admin['token']}"}
+    today = datetime.now(timezone.utc).date()
+
+    response = await client.get(
+        "/api/bookings/export",
+        headers=headers,
+        params={"format": "csv", "status": "pending", "from": today.isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(row["booking_id"], row["slot_id"]) for row in rows] == [
+        (str(booking_id), str(slot.id))
+    ]
+
+    empty = await client.get(
+        "/api/bookings/export",
+        headers=headers,
+        params={"format": "csv", "status": "approved"},
+    )
+    assert empty.text.splitlines() == [",".join(EXPORT_FIELDS)]
+
+    past = await client.get(
+        "/api/bookings/export",
+        headers=headers,
+        params={"to": (today - timedelta(days=2)).isoformat()},
+    )
+    assert past.text == ""
+
+
+@pytest.mark.asyncio
+async def test_export_bookings_rejects_invalid_requests(
+    client: AsyncClient, session: AsyncSession
+):
+    admin = await _register_and_login(client, "export-bad@example.com", role="admin")
+    student = await _register_and_login(client, "export-denied@example.com")
+
+    denied = await client.get(
+        "/api/bookings/export",
+        headers={"Authorization": f"Bearer {student['token']}"},
+    )
+    inverted = await client.get(
+        "/api/bookings/export",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+        params={"from": "2026-05-01", "to": "2026-04-01"},
+    )
+    bad_status = await client.get(
+        "/api/bookings/export",
+        headers={"Authorization": f"Bearer {admin['token']}"},
+        params={"status": "unknown"},
+    )
+
+    assert denied.status_code == 403
+    assert inverted.status_code == 400
+    assert bad_status.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_post_bookings_accepts_weekday_recurrence_with_exclusions(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "rrule@example.com")
+    room = await _create_room(session, "A-212")
+    monday = await _create_slot(session, room.id, date(2026, 3, 2), time(9, 0), time(10, 0))
+    thursday = await _create_slot(
+        session, room.id, date(2026, 3, 5), time(9, 0), time(10, 0)
+    )
+    await _create_slot(session, room.id, date(2026, 3, 9), time(9, 0), time(10, 0))
+
+    response = await client.post(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {user['token']}"},
+        json={
+            "room_id": room.id,
+            "date": "2026-03-02",
+            "slot_ids": [monday.id],
+            "recurrence_freq": "weekly",
+            "recurrence_end_date": "2026-03-09",
+            "recurrence_weekdays": ["mon", "thu"],
+            "recurrence_exclusions": ["2026-03-09"],
+        },
+    )
+    invalid = await client.post(
+        "/api/bookings",
+        headers={"Authorization": f"Bearer {user['token']}"},
+        json={
+            "room_id": room.id,
+            "date": "2026-03-02",
+            "slot_ids": [monday.id],
+            "recurrence_freq": "weekly",
+            "recurrence_end_date": "2026-03-09",
+            "recurrence_weekdays": ["funday"],
+        },
+    )
+
+    assert response.status_code == 201
+    assert [slot["id"] for slot in response.json()["timeSlots"]] == [
+        monday.id,
+        thursday.id,
+    ]
+    assert invalid.status_code == 422
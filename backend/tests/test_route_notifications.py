@@ -1,3 +1,5 @@
+import asyncio
+import json
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
@@ -12,6 +14,8 @@ import app.models  # noqa: F401
 from app.database import get_session
 from app.main import app
 from app.models import Notification, NotificationType
+from app.routes import notifications as notification_routes
+from app.services.notification_hub import notification_hub
 
 test_engine = create_async_engine(
     "sqlite+aiosqlite:///:memory:",
@@ -145,6 +149,78 @@ async def test_get_notifications_does_not_return_other_users_notifications(
     assert [item["id"] for item in payload] == [own_notification.id]
 
 
+@pytest.mark.asyncio
+async def test_get_notifications_after_id_returns_only_newer_rows_oldest_first(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "feed@example.com")
+    other_user = await _register_and_login(client, "feed-other@example.com")
+    base_time = datetime(2026, 4, 1, 12, 0, tzinfo=timezone.utc)
+    created = [
+        await _create_notification(
+            session, user["id"], booking_id, NotificationType.APPROVED, base_time
+        )
+        for booking_id in (1, 2, 3)
+    ]
+    await _create_notification(
+        session, other_user["id"], 4, NotificationType.DENIED, base_time
+    )
+    ids = [notification.id for notification in created]
+    headers = {"Authorization": f"Bearer {user['token']}"}
+
+    response = await client.get(
+        f"/api/notifications?after_id={ids[0]}", headers=headers
+    )
+    limited = await client.get(
+        f"/api/notifications?after_id={ids[0]}&limit=1", headers=headers
+    )
+    caught_up = await client.get(
+        f"/api/notifications?after_id={ids[-1] + 1}", headers=headers
+    )
+
+    assert [item["id"] for item in response.json()] == ids[1:]
+    assert [item["id"] for item in limited.json()] == ids[1:2]
+    assert caught_up.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_notifications_long_poll_returns_when_a_notification_arrives(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _register_and_login(client, "longpoll@example.com")
+    base_time = datetime(2026, 4, 1, 12, 0, tzinfo=timezone.utc)
+    seen = await _create_notification(
+        session, user["id"], 1, NotificationType.APPROVED, base_time
+    )
+    seen_id = seen.id
+    headers = {"Authorization": f"Bearer {user['token']}"}
+
+    empty = await client.get(
+        f"/api/notifications?after_id={seen_id}&wait=0.05", headers=headers
+    )
+    assert empty.status_code == 200
+    assert empty.json() == []
+
+    request = asyncio.create_task(
+        client.get(f"/api/notifications?after_id={seen_id}&wait=10", headers=headers)
+    )
+    while notification_hub.connections() == 0:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    arrived = await _create_notification(
+        session, user["id"], 2, NotificationType.DENIED, base_time
+    )
+    arrived_id = arrived.id
+    response = await asyncio.wait_for(request, 5)
+
+    assert [item["id"] for item in response.json()] == [arrived_id]
+
+    too_long = await client.get(
+        f"/api/notifications?after_id={seen_id}&wait=31", headers=headers
+    )
+    assert too_long.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_get_unread_count_returns_correct_count(
     client: AsyncClient, session: AsyncSession
@@ -222,12 +298,70 @@ async def test_patch_read_other_users_notification_returns_404(
 
 
 @pytest.mark.asyncio
+def _sse_events(body: str) -> list[dict]:
+    return [
+        json.loads(line.removeprefix("data: "))
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_resumes_after_last_event_id_and_pushes_new_notifications(
+    client: AsyncClient, session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(notification_routes, "HEARTBEAT_SECONDS", 0.05)
+    monkeypatch.setattr(notification_routes, "STREAM_LIFETIME_SECONDS", 0.5)
+    user = await _register_and_login(client, "stream@example.com")
+    other_user = await _register_and_login(client, "stream-other@example.com")
+    base_time = datetime(2026, 4, 1, 12, 0, tzinfo=timezone.utc)
+    seen = await _create_notification(
+        session, user["id"], 1, NotificationType.APPROVED, base_time
+    )
+    missed = await _create_notification(
+        session, user["id"], 2, NotificationType.DENIED, base_time
+    )
+    seen_id, missed_id = seen.id, missed.id
+
+    request = asyncio.create_task(
+        client.get(
+            "/api/notifications/stream",
+            headers={
+                "Authorization": f"Bearer {user['token']}",
+                "Last-Event-ID": str(seen_id),
+            },
+        )
+    )
+    while notification_hub.connections() == 0:
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.05)
+    await _create_notification(
+        session, other_user["id"], 3, NotificationType.APPROVED, base_time
+    )
+    pushed = await _create_notification(
+        session, user["id"], 4, NotificationType.CANCELLED, base_time
+    )
+    pushed_id = pushed.id
+    response = await request
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [event["id"] for event in _sse_events(response.text)] == [
+        missed_id,
+        pushed_id,
+    ]
+    assert f"id: {pushed_id}\nevent: notification\n" in response.text
+    assert ": keep-alive" in response.text
+    assert notification_hub.connections() == 0
+
+
 @pytest.mark.parametrize(
     ("method", "path"),
     [
         ("GET", "/api/notifications"),
         ("GET", "/api/notifications/unread-count"),
         ("PATCH", "/api/notifications/1/read"),
+        ("GET", "/api/notifications/stream"),
     ],
 )
 async def test_notification_endpoints_without_auth_return_401(
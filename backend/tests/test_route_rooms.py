@@ -174,3 +174,243 @@ async def test_get_available_dates_empty(client: AsyncClient, session: AsyncSess
     response = await client.get("/api/rooms/dates?year=2026&month=3")
     assert response.status_code == 200
     assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_verify_availability_index_requires_admin(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    response = await client.post("/api/rooms/availability-index/verify")
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_verify_availability_index_reports_loaded_days(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    target_date = date(2026, 5, 1)
+    await _create_slot(session, room.id, target_date, time(9, 0), time(10, 0))
+
+    admin = await _create_user(session)
+    admin.role = UserRole.ADMIN
+    app.dependency_overrides[current_active_user] = lambda: admin
+    await client.get(f"/api/rooms?date={target_date.isoformat()}")
+
+    response = await client.post("/api/rooms/availability-index/verify")
+    assert response.status_code == 200
+    assert response.json() == {"checked_days": 1, "mismatches": []}
+
+
+@pytest.mark.asyncio
+async def test_room_cache_stats_count_hits_for_repeated_dates(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    target_date = date(2026, 5, 1)
+    await _create_slot(session, room.id, target_date, time(9, 0), time(10, 0))
+
+    admin = await _create_user(session)
+    admin.role = UserRole.ADMIN
+    app.dependency_overrides[current_active_user] = lambda: admin
+
+    first = await client.get(f"/api/rooms?date={target_date.isoformat()}")
+    second = await client.get(f"/api/rooms?date={target_date.isoformat()}")
+    assert first.json() == second.json()
+
+    response = await client.get("/api/rooms/cache/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["size"] == 1
+    assert stats["hits"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_get_rooms_returns_304_for_matching_etag(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    target_date = date(2026, 5, 1)
+    await _create_slot(session, room.id, target_date, time(9, 0), time(10, 0))
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    url = f"/api/rooms?date={target_date.isoformat()}"
+    first = await client.get(url)
+    etag = first.headers["ETag"]
+    assert etag.startswith('"')
+
+    cached = await client.get(url, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    other_day = await client.get(
+        "/api/rooms?date=2026-05-02", headers={"If-None-Match": etag}
+    )
+    assert other_day.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_rooms_etag_changes_when_slot_on_date_changes(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    target_date = date(2026, 5, 1)
+    slot = await _create_slot(session, room.id, target_date, time(9, 0), time(10, 0))
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    url = f"/api/rooms?date={target_date.isoformat()}"
+    etag = (await client.get(url)).headers["ETag"]
+    dates_url = "/api/rooms/dates?year=2026&month=5"
+    dates_etag = (await client.get(dates_url)).headers["ETag"]
+
+    slot.status = TimeslotStatus.BOOKED
+    await session.commit()
+
+    refreshed = await client.get(url, headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["ETag"] != etag
+    assert refreshed.json()[0]["time_slots"][0]["status"] == "booked"
+
+    dates = await client.get(dates_url, headers={"If-None-Match": dates_etag})
+    assert dates.status_code == 200
+    assert dates.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_available_dates_returns_304_for_matching_etag(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    await _create_slot(session, room.id, date(2026, 5, 1), time(9, 0), time(10, 0))
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    url = "/api/rooms/dates?year=2026&month=5"
+    first = await client.get(url)
+    assert first.json() == ["2026-05-01"]
+
+    cached = await client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+    assert cached.status_code == 304
+
+    other_month = await client.get(
+        "/api/rooms/dates?year=2026&month=6",
+        headers={"If-None-Match": first.headers["ETag"]},
+    )
+    assert other_month.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_availability_matrix_covers_requested_range(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    await _create_slot(session, room.id, date(2026, 5, 2), time(9, 0), time(10, 0))
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    response = await client.get("/api/rooms/availability?from=2026-05-01&to=2026-05-03")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["slot_times"] == [["09:00:00", "10:00:00"]]
+    assert data["rooms"] == [
+        {"id": room.id, "name": "A-203", "capacity": 25, "days": ["-", "a", "-"]}
+    ]
+
+    reversed_range = await client.get(
+        "/api/rooms/availability?from=2026-05-03&to=2026-05-01"
+    )
+    assert reversed_range.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_returns_bookable_contiguous_slots(
+    client: AsyncClient, session: AsyncSession
+):
+    room = await _create_room(session)
+    assert room.id is not None
+    target_date = date(2026, 5, 5)
+    first = await _create_slot(session, room.id, target_date, time(9, 0), time(10, 0))
+    first_id = first.id
+    second = await _create_slot(
+        session, room.id, target_date, time(10, 0), time(11, 0)
+    )
+    second_id = second.id
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    response = await client.get(
+        "/api/rooms/search?capacity_min=25&duration=120"
+        "&from=2026-05-05&to=2026-05-08&start_after=08:00&end_before=12:00"
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "room_id": room.id,
+            "room_name": "A-203",
+            "capacity": 25,
+            "slot_date": "2026-05-05",
+            "start_time": "09:00:00",
+            "end_time": "11:00:00",
+            "slot_ids": [first_id, second_id],
+        }
+    ]
+
+    too_big = await client.get(
+        "/api/rooms/search?capacity_min=26&duration=60&from=2026-05-05&to=2026-05-05"
+    )
+    assert too_big.json() == []
+
+    reversed_range = await client.get(
+        "/api/rooms/search?duration=60&from=2026-05-08&to=2026-05-05"
+    )
+    assert reversed_range.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_coalescing_stats_require_admin(
+    client: AsyncClient, session: AsyncSession
+):
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+    response = await client.get("/api/rooms/coalescing/stats")
+    assert response.status_code == 403
+
+    user.role = UserRole.ADMIN
+    response = await client.get("/api/rooms/coalescing/stats")
+    assert response.status_code == 200
+    assert set(response.json()) == {"rooms", "dates"}
+    assert set(response.json()["rooms"]) == {"executed", "coalesced", "in_flight"}
+
+
+@pytest.mark.asyncio
+async def test_lookup_rooms_resolves_many_ids_in_request_order(
+    client: AsyncClient, session: AsyncSession
+):
+    first = await _create_room(session, name="A-101", capacity=10)
+    second = await _create_room(session, name="B-202", capacity=20)
+    user = await _create_user(session)
+    app.dependency_overrides[current_active_user] = lambda: user
+
+    response = await client.post(
+        "/api/rooms/lookup", json={"ids": [second.id, 999, first.id, second.id]}
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"id": second.id, "name": "B-202", "capacity": 20},
+        {"id": first.id, "name": "A-101", "capacity": 10},
+    ]
+
+    too_many = await client.post("/api/rooms/lookup", json={"ids": list(range(501))})
+    assert too_many.status_code == 422
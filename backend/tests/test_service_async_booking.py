@@ -0,0 +1,249 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import (
+    Booking,
+    BookingStatus,
+    Notification,
+    NotificationType,
+    Room,
+    TimeSlot,
+    TimeslotStatus,
+    User,
+    UserRole,
+)
+from app.services import hold_sweeper
+from app.services.async_booking_service import (
+    get_all_bookings,
+    get_user_bookings,
+    process_booking_action,
+    submit_booking,
+)
+from app.services.booking_service import BookingConflictError, BookingStateError
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+async def _create_user(session: AsyncSession, email: str = "student@example.com") -> User:
+    user = User(email=email, hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    session.add(user)
+    await session.commit()
+    await session.refresh(user)
+    return user
+
+
+async def _create_room(session: AsyncSession, name: str = "A-203") -> Room:
+    room = Room(name=name, capacity=25)
+    session.add(room)
+    await session.commit()
+    await session.refresh(room)
+    return room
+
+
+async def _create_slot(
+    session: AsyncSession,
+    room_id: int,
+    slot_date: date,
+    start: time,
+    end: time,
+    status: TimeslotStatus = TimeslotStatus.AVAILABLE,
+) -> TimeSlot:
+    slot = TimeSlot(
+        room_id=room_id,
+        slot_date=slot_date,
+        start_time=start,
+        end_time=end,
+        status=status,
+    )
+    session.add(slot)
+    await session.commit()
+    await session.refresh(slot)
+    return slot
+
+
+async def test_submit_booking_holds_slots_and_returns_loaded_booking(
+    session: AsyncSession,
+):
+    user = await _create_user(session)
+    room = await _create_room(session)
+    anchor = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    week_two = await _create_slot(session, room.id, date(2026, 4, 8), time(9, 0), time(10, 0))
+
+    booking = await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[anchor.id],
+        recurrence_freq="weekly",
+        recurrence_end_date=date(2026, 4, 8),
+        session=session,
+    )
+
+    assert booking.status == BookingStatus.PENDING
+    assert {slot.id for slot in booking.timeSlots} == {anchor.id, week_two.id}
+    assert all(slot.status == TimeslotStatus.HELD for slot in booking.timeSlots)
+
+
+async def test_submit_booking_with_unavailable_slot_raises_conflict(
+    session: AsyncSession,
+):
+    user = await _create_user(session)
+    room = await _create_room(session)
+    slot = await _create_slot(
+        session,
+        room.id,
+        date(2026, 4, 1),
+        time(9, 0),
+        time(10, 0),
+        status=TimeslotStatus.BOOKED,
+    )
+
+    with pytest.raises(BookingConflictError, match="unavailable"):
+        await submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slot.id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        )
+
+
+async def test_process_booking_action_approves_and_notifies(session: AsyncSession):
+    user = await _create_user(session)
+    room = await _create_room(session)
+    slot = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    booking = await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session.bind.sync_engine, "before_cursor_execute", _record)
+    try:
+        approved = await process_booking_action(booking.id, "approve", session)
+    finally:
+        event.remove(session.bind.sync_engine, "before_cursor_execute", _record)
+
+    assert sum(1 for s in statements if s.lstrip().startswith("SELECT")) == 1
+
+    assert approved.status == BookingStatus.APPROVED
+    assert [s.status for s in approved.timeSlots] == [TimeslotStatus.BOOKED]
+    notifications = (
+        await session.exec(
+            select(Notification).where(Notification.bookingID == booking.id)
+        )
+    ).all()
+    assert [n.type for n in notifications] == [NotificationType.APPROVED]
+
+
+async def test_process_booking_action_rejects_invalid_transition(
+    session: AsyncSession,
+):
+    user = await _create_user(session)
+    room = await _create_room(session)
+    slot = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    booking = await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+
+    with pytest.raises(BookingStateError, match="approved"):
+        await process_booking_action(booking.id, "cancel", session)
+
+
+async def test_get_user_and_all_bookings_filter_by_status(session: AsyncSession):
+    owner = await _create_user(session, "owner@example.com")
+    other = await _create_user(session, "other@example.com")
+    room = await _create_room(session)
+    owner_slot = await _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    other_slot = await _create_slot(session, room.id, date(2026, 4, 1), time(10, 0), time(11, 0))
+    owner_booking = await submit_booking(
+        user=owner,
+        room_id=room.id,
+        slot_ids=[owner_slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    await submit_booking(
+        user=other,
+        room_id=room.id,
+        slot_ids=[other_slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+
+    owned = await get_user_bookings(owner.id, session)
+    pending = await get_all_bookings(session, "pending")
+    approved = await get_all_bookings(session, BookingStatus.APPROVED)
+
+    assert [b.id for b in owned] == [owner_booking.id]
+    assert len(pending) == 2
+    assert approved == []
+    assert isinstance(owned[0], Booking)
+
+
+async def test_sweep_expired_holds_drains_every_batch(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(hold_sweeper, "SWEEP_BATCH_SIZE", 1)
+    user = await _create_user(session)
+    room = await _create_room(session)
+    slots = [
+        await _create_slot(session, room.id, date(2026, 4, 1), time(h, 0), time(h + 1, 0))
+        for h in (9, 10, 11)
+    ]
+    for slot in slots:
+        booking = await submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slot.id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        )
+        booking.createdAt = datetime.now(timezone.utc) - timedelta(days=10)
+        session.add(booking)
+    await session.commit()
+
+    expired = await hold_sweeper.sweep_expired_holds(timedelta(days=3), session)
+
+    assert expired == 3
+    statuses = (await session.exec(select(Booking.status))).all()
+    assert statuses == [BookingStatus.EXPIRED] * 3
+    slot_statuses = (await session.exec(select(TimeSlot.status))).all()
+    assert slot_statuses == [TimeslotStatus.AVAILABLE] * 3
@@ -0,0 +1,393 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot, TimeslotStatus, User, UserRole
+from app.services.async_booking_service import (
+    expire_stale_bookings,
+    process_booking_action,
+    submit_booking,
+)
+from app.services.availability_index import (
+    AvailabilityIndex,
+    DayAvailability,
+    availability_index,
+)
+from app.services.booking_service import BookingConflictError
+from app.services.room_service import (
+    MAX_MATRIX_DAYS,
+    InvalidDateRangeError,
+    get_availability_matrix,
+    get_available_dates,
+    get_rooms_by_ids,
+    get_rooms_with_availability,
+    search_rooms,
+    verify_availability_index,
+)
+from app.services.slot_events import SlotChange
+
+DAY = date(2026, 4, 1)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+@pytest.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def statements(engine):
+    recorded: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    yield recorded
+    event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+
+async def _seed(session: AsyncSession) -> tuple[User, Room, list[TimeSlot]]:
+    user = User(email="student@example.com", hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    room = Room(name="A-203", capacity=25)
+    session.add_all([user, room])
+    await session.commit()
+    slots = [
+        TimeSlot(
+            room_id=room.id,
+            slot_date=DAY,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+        )
+        for hour in (11, 9, 10)
+    ]
+    session.add_all(slots)
+    await session.commit()
+    return user, room, sorted(slots, key=lambda slot: slot.start_time)
+
+
+def _statuses(rooms) -> list[TimeslotStatus]:
+    return [slot.status for slot in rooms[0].time_slots]
+
+
+def test_day_availability_tracks_each_state_in_its_own_bit():
+    slots = [
+        SlotChange(7, 1, DAY, time(10, 0), time(11, 0), TimeslotStatus.HELD),
+        SlotChange(5, 1, DAY, time(9, 0), time(10, 0), TimeslotStatus.AVAILABLE),
+        SlotChange(9, 1, DAY, time(11, 0), time(12, 0), TimeslotStatus.BOOKED),
+    ]
+
+    day = DayAvailability(1, DAY, slots)
+
+    assert day.slot_ids == [5, 7, 9]
+    assert (day.available, day.held) == (0b001, 0b010)
+    day.set(2, TimeslotStatus.AVAILABLE)
+    assert day.status(2) == TimeslotStatus.AVAILABLE
+    assert sorted(day.slots()) == sorted(
+        slots[:2] + [slots[2]._replace(status=TimeslotStatus.AVAILABLE)]
+    )
+
+
+async def test_search_ranks_fits_and_follows_changes(session: AsyncSession):
+    user, room, slots = await _seed(session)
+    small = Room(name="B-101", capacity=4)
+    session.add(small)
+    await session.commit()
+    session.add_all(
+        TimeSlot(
+            room_id=small.id,
+            slot_date=DAY,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+        )
+        for hour in (8, 9)
+    )
+    await session.commit()
+
+    async def search(capacity_min: int):
+        return await search_rooms(
+            DAY, DAY + timedelta(days=6), capacity_min, 120, None, None, 20, session
+        )
+
+    assert [(r.room_name, r.start_time) for r in await search(1)] == [
+        ("B-101", time(8, 0)),
+        ("A-203", time(9, 0)),
+    ]
+    results = await search(10)
+    assert [(r.room_id, r.slot_date, r.start_time, r.end_time) for r in results] == [
+        (room.id, DAY, time(9, 0), time(11, 0))
+    ]
+    assert results[0].slot_ids == [slots[0].id, slots[1].id]
+
+    await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[1].id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    assert await search(10) == []
+
+
+async def test_search_rejects_empty_time_window(session: AsyncSession):
+    with pytest.raises(InvalidDateRangeError):
+        await search_rooms(DAY, DAY, 1, 60, time(12, 0), time(9, 0), 20, session)
+
+
+async def test_rooms_are_served_from_memory_after_first_load(
+    session: AsyncSession, statements: list[str]
+):
+    _, room, slots = await _seed(session)
+
+    statements.clear()
+    first = await get_rooms_with_availability(DAY, session)
+    loads = len(statements)
+    second = await get_rooms_with_availability(DAY, session)
+
+    assert loads == 2
+    assert len(statements) == loads
+    assert first == second
+    assert [slot.id for slot in first[0].time_slots] == [slot.id for slot in slots]
+    assert first[0].name == room.name
+
+
+async def test_index_evicts_least_recently_used_dates(session: AsyncSession):
+    _, _, slots = await _seed(session)
+    index = AvailabilityIndex(capacity=2)
+    later = [DAY + timedelta(days=offset) for offset in (1, 2, 3)]
+
+    await index.rooms_on(DAY, session)
+    await index.rooms_on(later[0], session)
+    await index.rooms_on(DAY, session)
+    await index.rooms_on(later[1], session)
+    assert list(index._days) == [DAY, later[1]]
+
+    await index.rooms_on(later[2], session)
+    index.apply(
+        [
+            SlotChange(1000 + day, 1, DAY + timedelta(days=day), time(9), time(10), None)
+            for day in range(10, 20)
+        ]
+    )
+
+    assert index.loaded_days == 2
+    assert not index._positions.keys() & {slot.id for slot in slots}
+    assert len(index._versions) == 2
+
+
+async def test_committed_orm_changes_update_loaded_days(
+    session: AsyncSession, statements: list[str]
+):
+    _, _, slots = await _seed(session)
+    await get_rooms_with_availability(DAY, session)
+
+    slots[1].status = TimeslotStatus.BOOKED
+    session.add(slots[1])
+    await session.commit()
+    extra = TimeSlot(
+        room_id=slots[0].room_id,
+        slot_date=DAY,
+        start_time=time(8, 0),
+        end_time=time(9, 0),
+    )
+    session.add(extra)
+    await session.commit()
+
+    statements.clear()
+    rooms = await get_rooms_with_availability(DAY, session)
+
+    assert statements == []
+    assert [slot.id for slot in rooms[0].time_slots][0] == extra.id
+    assert _statuses(rooms) == [
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.BOOKED,
+        TimeslotStatus.AVAILABLE,
+    ]
+
+
+async def test_rolled_back_changes_are_not_applied(session: AsyncSession):
+    _, _, slots = await _seed(session)
+    await get_rooms_with_availability(DAY, session)
+
+    slots[0].status = TimeslotStatus.BOOKED
+    session.add(slots[0])
+    await session.flush()
+    await session.rollback()
+
+    rooms = await get_rooms_with_availability(DAY, session)
+    assert _statuses(rooms)[0] == TimeslotStatus.AVAILABLE
+
+
+async def test_booking_lifecycle_keeps_index_in_sync(session: AsyncSession):
+    user, room, slots = await _seed(session)
+    await get_rooms_with_availability(DAY, session)
+
+    booking = await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[0].id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    assert availability_index.unavailable([slot.id for slot in slots]) == [
+        slots[0].id
+    ]
+
+    await process_booking_action(booking.id, "approve", session)
+    rooms = await get_rooms_with_availability(DAY, session)
+    assert _statuses(rooms)[0] == TimeslotStatus.BOOKED
+
+    await process_booking_action(booking.id, "cancel", session)
+    assert availability_index.unavailable([slots[0].id]) == []
+
+
+async def test_expired_holds_are_released_in_index(session: AsyncSession):
+    user, room, slots = await _seed(session)
+    await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[1].id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    rooms = await get_rooms_with_availability(DAY, session)
+    assert _statuses(rooms)[1] == TimeslotStatus.HELD
+
+    cutoff = datetime.now(timezone.utc) + timedelta(minutes=1)
+    await expire_stale_bookings(cutoff, session)
+
+    rooms = await get_rooms_with_availability(DAY, session)
+    assert _statuses(rooms)[1] == TimeslotStatus.AVAILABLE
+
+
+async def test_submit_precheck_rejects_known_taken_slot_without_queries(
+    session: AsyncSession, statements: list[str]
+):
+    user, room, slots = await _seed(session)
+    slots[2].status = TimeslotStatus.BOOKED
+    session.add(slots[2])
+    await session.commit()
+    await get_rooms_with_availability(DAY, session)
+
+    statements.clear()
+    with pytest.raises(BookingConflictError, match=str(slots[2].id)):
+        await submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slots[2].id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        )
+    assert statements == []
+
+
+async def test_available_dates_reflect_committed_changes(session: AsyncSession):
+    _, _, slots = await _seed(session)
+    assert await get_available_dates(2026, 4, session) == [DAY]
+
+    for slot in slots:
+        slot.status = TimeslotStatus.HELD
+        session.add(slot)
+    await session.commit()
+
+    assert await get_available_dates(2026, 4, session) == []
+
+
+async def test_verify_reports_and_drops_out_of_band_changes(session: AsyncSession):
+    _, _, slots = await _seed(session)
+    await get_rooms_with_availability(DAY, session)
+    assert await verify_availability_index(session) == (1, [])
+
+    await session.exec(
+        text("UPDATE timeslot SET status = 'BOOKED' WHERE id = :id").bindparams(
+            id=slots[0].id
+        )
+    )
+    await session.commit()
+
+    checked, mismatches = await verify_availability_index(session)
+
+    assert checked == 1
+    assert [(m.slot_id, m.indexed, m.actual) for m in mismatches] == [
+        (slots[0].id, TimeslotStatus.AVAILABLE, TimeslotStatus.BOOKED)
+    ]
+    assert availability_index.loaded_days == 0
+    rooms = await get_rooms_with_availability(DAY, session)
+    assert _statuses(rooms)[0] == TimeslotStatus.BOOKED
+
+
+async def test_matrix_encodes_range_with_one_slot_query(
+    session: AsyncSession, statements: list[str]
+):
+    _, room, slots = await _seed(session)
+    slots[1].status = TimeslotStatus.HELD
+    session.add(slots[1])
+    session.add(
+        TimeSlot(
+            room_id=room.id,
+            slot_date=DAY + timedelta(days=2),
+            start_time=time(8, 0),
+            end_time=time(9, 0),
+            status=TimeslotStatus.BOOKED,
+        )
+    )
+    await session.commit()
+
+    statements.clear()
+    matrix = await get_availability_matrix(DAY, DAY + timedelta(days=2), session)
+
+    assert [s for s in statements if "FROM timeslot" in s] == [statements[0]]
+    hours = (8, 9, 10, 11)
+    assert matrix.slot_times == [(time(hour, 0), time(hour + 1, 0)) for hour in hours]
+    assert [(row.id, row.days) for row in matrix.rooms] == [
+        (room.id, ["-aha", "----", "b---"])
+    ]
+
+
+async def test_matrix_rejects_reversed_and_oversized_ranges(session: AsyncSession):
+    with pytest.raises(InvalidDateRangeError):
+        await get_availability_matrix(DAY, DAY - timedelta(days=1), session)
+    with pytest.raises(InvalidDateRangeError):
+        await get_availability_matrix(
+            DAY, DAY + timedelta(days=MAX_MATRIX_DAYS), session
+        )
+
+
+async def test_room_lookup_is_cached_until_a_room_changes(
+    session: AsyncSession, statements: list[str]
+):
+    _, room, _ = await _seed(session)
+    assert [r.name for r in await get_rooms_by_ids([room.id], session)] == ["A-203"]
+
+    statements.clear()
+    assert [r.id for r in await get_rooms_by_ids([room.id, 404], session)] == [room.id]
+    assert statements == []
+
+    room.name = "A-204"
+    session.add(room)
+    await session.commit()
+    assert [r.name for r in await get_rooms_by_ids([room.id], session)] == ["A-204"]
@@ -0,0 +1,62 @@
+from datetime import date, time
+
+from app.models import TimeslotStatus
+from app.services.availability_versions import (
+    DATE_VERSIONS_SIZE,
+    AvailabilityVersions,
+    etag_matches,
+)
+from app.services.slot_events import SlotChange
+
+DAY = date(2026, 5, 1)
+
+
+def _change(slot_date: date) -> SlotChange:
+    return SlotChange(1, 1, slot_date, time(9, 0), time(10, 0), TimeslotStatus.HELD)
+
+
+def test_bump_changes_only_the_touched_date_and_month():
+    versions = AvailabilityVersions()
+    day_tag = versions.date_etag(DAY)
+    other_day_tag = versions.date_etag(date(2026, 5, 2))
+    month_tag = versions.month_etag(2026, 5)
+    other_month_tag = versions.month_etag(2026, 6)
+
+    versions.bump([_change(DAY), _change(DAY)])
+
+    assert versions.date_etag(DAY) != day_tag
+    assert versions.date_etag(date(2026, 5, 2)) == other_day_tag
+    assert versions.month_etag(2026, 5) != month_tag
+    assert versions.month_etag(2026, 6) == other_month_tag
+
+
+def test_reset_never_reissues_an_earlier_tag():
+    versions = AvailabilityVersions()
+    before = versions.date_etag(DAY)
+    versions.reset()
+    assert versions.date_etag(DAY) != before
+    assert AvailabilityVersions().date_etag(DAY) != before
+
+
+def test_counters_stay_bounded_and_never_reissue_a_stale_tag():
+    versions = AvailabilityVersions()
+    versions.bump([_change(DAY)])
+    tag = versions.date_etag(DAY)
+    versions.bump([_change(DAY)])
+    changed = versions.date_etag(DAY)
+
+    for offset in range(1, DATE_VERSIONS_SIZE + 1):
+        versions.bump([_change(date.fromordinal(DAY.toordinal() + offset))])
+
+    assert len(versions._dates) == DATE_VERSIONS_SIZE
+    assert versions.date_etag(DAY) != tag
+    versions.bump([_change(DAY)])
+    assert versions.date_etag(DAY) not in (tag, changed)
+
+
+def test_etag_matches_lists_weak_tags_and_wildcard():
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches(None, '"b"')
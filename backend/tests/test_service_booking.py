@@ -1,12 +1,16 @@
-from datetime import date, time
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine, select
 
 from app.models import (
     Booking,
     BookingStatus,
+    Notification,
+    NotificationType,
     RecurrenceFrequency,
     Room,
     TimeSlot,
@@ -14,13 +18,18 @@ from app.models import (
     User,
     UserRole,
 )
+from app.services import booking_workflow
 from app.services.booking_service import (
     BookingConflictError,
+    BookingNotFoundError,
+    BookingServiceError,
     BookingStateError,
     approve_booking,
     cancel_booking,
     deny_booking,
+    expire_stale_bookings,
     get_pending_bookings,
+    process_booking_actions,
     submit_booking,
 )
 
@@ -348,3 +357,434 @@ def test_booking_role_is_persisted_on_record(session: Session):
 
     stored_booking = session.exec(select(Booking).where(Booking.id == booking.id)).one()
     assert stored_booking.submittedByRole == UserRole.ADMIN
+
+
+
+@contextmanager
+def _recorded_statements(session: Session):
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)
+
+
+def _timeslot_selects(statements: list[str]) -> int:
+    return sum(
+        1
+        for statement in statements
+        if statement.lstrip().upper().startswith("SELECT") and "FROM timeslot" in statement
+    )
+
+
+def test_weekly_recurrence_query_count_does_not_grow_with_weeks(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    short_anchor = _create_slot(session, room.id, date(2026, 1, 5), time(9, 0), time(10, 0))
+    _create_slot(session, room.id, date(2026, 1, 12), time(9, 0), time(10, 0))
+    long_anchor = _create_slot(session, room.id, date(2026, 1, 5), time(11, 0), time(12, 0))
+    for week in range(1, 20):
+        _create_slot(
+            session,
+            room.id,
+            date(2026, 1, 5) + timedelta(weeks=week),
+            time(11, 0),
+            time(12, 0),
+        )
+
+    with _recorded_statements(session) as short_statements:
+        short_booking = submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[short_anchor.id],
+            recurrence_freq="weekly",
+            recurrence_end_date=date(2026, 1, 12),
+            session=session,
+        )
+    with _recorded_statements(session) as long_statements:
+        long_booking = submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[long_anchor.id],
+            recurrence_freq="weekly",
+            recurrence_end_date=date(2026, 1, 5) + timedelta(weeks=19),
+            session=session,
+        )
+
+    assert len(short_booking.timeSlots) == 2
+    assert len(long_booking.timeSlots) == 20
+    assert _timeslot_selects(long_statements) == _timeslot_selects(short_statements)
+
+
+def test_weekly_recurrence_reports_all_missing_dates(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    anchor_slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    _create_slot(session, room.id, date(2026, 4, 15), time(9, 0), time(10, 0))
+
+    with pytest.raises(BookingNotFoundError) as exc_info:
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[anchor_slot.id],
+            recurrence_freq="weekly",
+            recurrence_end_date=date(2026, 4, 29),
+            session=session,
+        )
+
+    message = str(exc_info.value)
+    assert "2026-04-08" in message
+    assert "2026-04-22" in message
+    assert "2026-04-29" in message
+    assert "2026-04-15" not in message
+
+
+def test_submit_booking_loses_race_to_concurrent_hold(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    stale_slot = session.get(TimeSlot, slot.id)
+
+    with Session(session.get_bind()) as other_session:
+        competing_slot = other_session.get(TimeSlot, slot.id)
+        competing_slot.hold()
+        other_session.add(competing_slot)
+        other_session.commit()
+
+    assert stale_slot.status == TimeslotStatus.AVAILABLE
+    with pytest.raises(BookingConflictError, match="unavailable"):
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slot.id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        )
+
+    assert session.exec(select(Booking)).all() == []
+
+
+def test_process_booking_actions_commits_batch_once(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    first_slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    second_slot = _create_slot(session, room.id, date(2026, 4, 1), time(10, 0), time(11, 0))
+    first = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[first_slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    second = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[second_slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+
+    actions = [(first.id, "approve"), (second.id, "deny"), (first.id, "deny")]
+
+    with _recorded_statements(session) as statements:
+        outcomes = process_booking_actions(actions, session)
+
+    assert [outcome.error is None for outcome in outcomes] == [True, True, False]
+    assert "more than once" in str(outcomes[2].error)
+    assert sum(1 for s in statements if s.lstrip().upper().startswith("SELECT")) == 1
+    assert len(session.exec(select(Notification)).all()) == 2
+
+
+def test_approve_booking_records_notification_in_same_commit(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    booking = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    booking_id = booking.id
+
+    commits: list[Session] = []
+    record_commit = commits.append
+    event.listen(session, "after_commit", record_commit)
+    try:
+        approved = approve_booking(booking_id, session)
+    finally:
+        event.remove(session, "after_commit", record_commit)
+
+    notifications = session.exec(select(Notification)).all()
+    assert len(commits) == 1
+    assert approved.status == BookingStatus.APPROVED
+    assert [(n.bookingID, n.userID) for n in notifications] == [(booking_id, user.id)]
+
+
+def test_expire_stale_bookings_releases_holds_and_notifies(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    stale_slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    fresh_slot = _create_slot(session, room.id, date(2026, 4, 1), time(10, 0), time(11, 0))
+    approved_slot = _create_slot(session, room.id, date(2026, 4, 1), time(11, 0), time(12, 0))
+    bookings = [
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slot.id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        )
+        for slot in (stale_slot, fresh_slot, approved_slot)
+    ]
+    stale, fresh, approved = bookings
+    approve_booking(approved.id, session)
+    now = datetime.now(timezone.utc)
+    for booking, age in ((stale, 100), (fresh, 1), (approved, 100)):
+        booking.createdAt = now - timedelta(hours=age)
+        session.add(booking)
+    session.commit()
+    stale_id, approved_id = stale.id, approved.id
+
+    expired = expire_stale_bookings(now - timedelta(hours=72), session)
+
+    assert expired == [stale_id]
+    assert session.get(Booking, stale_id).status == BookingStatus.EXPIRED
+    session.refresh(stale_slot)
+    session.refresh(fresh_slot)
+    session.refresh(approved_slot)
+    assert stale_slot.status == TimeslotStatus.AVAILABLE
+    assert fresh_slot.status == TimeslotStatus.HELD
+    assert approved_slot.status == TimeslotStatus.BOOKED
+    expiry_notes = session.exec(
+        select(Notification).where(Notification.type == NotificationType.EXPIRED)
+    ).all()
+    assert [n.bookingID for n in expiry_notes] == [stale_id]
+    assert expire_stale_bookings(now - timedelta(hours=72), session) == []
+    assert approved_id not in expired
+
+
+def _load_then_expire(session: Session, booking_id: int) -> Booking:
+    """
+    Loads the oldest pending booking, then lets the sweeper expire it elsewhere.
+
+    Keep the returned booking referenced, or the session drops its stale copy.
+    """
+    stale = session.get(Booking, booking_id)
+    assert [slot.status for slot in stale.timeSlots] == [TimeslotStatus.HELD]
+    with Session(session.get_bind()) as sweeper_session:
+        cutoff = datetime.now(timezone.utc) + timedelta(hours=1)
+        assert expire_stale_bookings(cutoff, sweeper_session, 1) == [booking_id]
+    assert stale.status == BookingStatus.PENDING
+    return stale
+
+
+def test_approve_fails_if_booking_expired_after_it_was_loaded(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    booking_id = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slot.id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    ).id
+    stale = _load_then_expire(session, booking_id)
+
+    with pytest.raises(BookingStateError, match="changed by another request"):
+        approve_booking(booking_id, session)
+
+    session.expire_all()
+    assert stale.status == BookingStatus.EXPIRED
+    assert session.get(TimeSlot, slot.id).status == TimeslotStatus.AVAILABLE
+    notes = session.exec(select(Notification)).all()
+    assert [n.type for n in notes] == [NotificationType.EXPIRED]
+
+
+def test_process_booking_actions_skips_bookings_expired_after_loading(
+    session: Session,
+):
+    user = _create_user(session)
+    room = _create_room(session)
+    expired_slot = _create_slot(session, room.id, date(2026, 4, 1), time(9, 0), time(10, 0))
+    kept_slot = _create_slot(session, room.id, date(2026, 4, 1), time(10, 0), time(11, 0))
+    expired_id, kept_id = (
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[slot.id],
+            recurrence_freq="none",
+            recurrence_end_date=None,
+            session=session,
+        ).id
+        for slot in (expired_slot, kept_slot)
+    )
+    stale = _load_then_expire(session, expired_id)
+
+    outcomes = process_booking_actions(
+        [(expired_id, "approve"), (kept_id, "approve")], session
+    )
+
+    assert isinstance(outcomes[0].error, BookingStateError)
+    assert outcomes[1].error is None
+    assert outcomes[1].booking.status == BookingStatus.APPROVED
+    session.expire_all()
+    assert stale.status == BookingStatus.EXPIRED
+    assert session.get(TimeSlot, expired_slot.id).status == TimeslotStatus.AVAILABLE
+    assert session.get(TimeSlot, kept_slot.id).status == TimeslotStatus.BOOKED
+    approvals = session.exec(
+        select(Notification).where(Notification.type == NotificationType.APPROVED)
+    ).all()
+    assert [n.bookingID for n in approvals] == [kept_id]
+
+
+def test_biweekly_recurrence_on_weekdays_skips_excluded_dates(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    start = date(2026, 2, 2)  # Monday
+    slots = {
+        start + timedelta(days=offset): _create_slot(
+            session,
+            room.id,
+            start + timedelta(days=offset),
+            time(9, 0),
+            time(10, 0),
+        )
+        for offset in (0, 2, 14, 16, 28, 30)
+    }
+
+    booking = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[start].id],
+        recurrence_freq="biweekly",
+        recurrence_end_date=start + timedelta(days=30),
+        session=session,
+        recurrence_weekdays=["mon", "wed"],
+        recurrence_exclusions=[start + timedelta(days=16)],
+    )
+
+    booked_dates = sorted(slot.slot_date for slot in booking.timeSlots)
+    assert booked_dates == [
+        start,
+        start + timedelta(days=2),
+        start + timedelta(days=14),
+        start + timedelta(days=28),
+        start + timedelta(days=30),
+    ]
+    assert booking.recurrenceFrequency == RecurrenceFrequency.BIWEEKLY
+    excluded = slots[start + timedelta(days=16)]
+    session.refresh(excluded)
+    assert excluded.status == TimeslotStatus.AVAILABLE
+
+
+def test_monthly_by_weekday_recurrence_books_same_week_of_month(session: Session):
+    user = _create_user(session)
+    room = _create_room(session)
+    anchor = _create_slot(session, room.id, date(2026, 4, 14), time(9, 0), time(10, 0))
+    may = _create_slot(session, room.id, date(2026, 5, 12), time(9, 0), time(10, 0))
+    _create_slot(session, room.id, date(2026, 5, 19), time(9, 0), time(10, 0))
+
+    booking = submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[anchor.id],
+        recurrence_freq="monthly_by_weekday",
+        recurrence_end_date=date(2026, 5, 31),
+        session=session,
+    )
+
+    assert {slot.id for slot in booking.timeSlots} == {anchor.id, may.id}
+
+
+def test_recurrence_resolves_occurrences_in_bounded_batches(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(booking_workflow, "RECURRENCE_BATCH_DAYS", 4)
+    user = _create_user(session)
+    room = _create_room(session)
+    anchor = _create_slot(session, room.id, date(2026, 1, 5), time(9, 0), time(10, 0))
+    for week in range(1, 10):
+        _create_slot(
+            session,
+            room.id,
+            date(2026, 1, 5) + timedelta(weeks=week),
+            time(9, 0),
+            time(10, 0),
+        )
+
+    with _recorded_statements(session) as statements:
+        booking = submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[anchor.id],
+            recurrence_freq="weekly",
+            recurrence_end_date=date(2026, 1, 5) + timedelta(weeks=9),
+            session=session,
+        )
+
+    assert len(booking.timeSlots) == 10
+    # The anchor lookup, three batches of at most four dates, then the reload.
+    assert _timeslot_selects(statements) == 1 + 3 + 1
+
+
+def test_recurrence_rejects_rules_with_too_many_occurrences(
+    session: Session, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(booking_workflow, "MAX_RECURRENCE_OCCURRENCES", 3)
+    user = _create_user(session)
+    room = _create_room(session)
+    anchor = _create_slot(session, room.id, date(2026, 1, 5), time(9, 0), time(10, 0))
+
+    with pytest.raises(BookingServiceError, match="more than 3 occurrences"):
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[anchor.id],
+            recurrence_freq="weekly",
+            recurrence_end_date=date(2030, 1, 1),
+            session=session,
+        )
+
+
+@pytest.mark.parametrize(
+    ("freq", "weekdays", "exclusions", "message"),
+    [
+        ("none", ["mon"], [], "only be provided for recurring bookings"),
+        ("none", [], [date(2026, 1, 12)], "only be provided for recurring bookings"),
+        ("monthly_by_weekday", ["mon"], [], "weekly or biweekly"),
+        ("weekly", ["someday"], [], "Invalid weekday"),
+    ],
+)
+def test_recurrence_options_are_validated(
+    session: Session, freq, weekdays, exclusions, message
+):
+    user = _create_user(session)
+    room = _create_room(session)
+    anchor = _create_slot(session, room.id, date(2026, 1, 5), time(9, 0), time(10, 0))
+
+    with pytest.raises(BookingServiceError, match=message):
+        submit_booking(
+            user=user,
+            room_id=room.id,
+            slot_ids=[anchor.id],
+            recurrence_freq=freq,
+            recurrence_end_date=None if freq == "none" else date(2026, 2, 1),
+            session=session,
+            recurrence_weekdays=weekdays,
+            recurrence_exclusions=exclusions,
+        )
@@ -0,0 +1,159 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import DaySummary, Room, TimeSlot, TimeslotStatus, User, UserRole
+from app.services.async_booking_service import (
+    expire_stale_bookings,
+    process_booking_action,
+    submit_booking,
+)
+from app.services.day_summary import ensure_day_summary, rebuild_day_summary
+from app.services.room_service import get_available_dates
+
+DAY = date(2026, 4, 1)
+NEXT_DAY = date(2026, 4, 2)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+@pytest.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def _seed(session: AsyncSession) -> tuple[User, Room, list[TimeSlot]]:
+    user = User(email="student@example.com", hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    room = Room(name="A-203", capacity=25)
+    session.add_all([user, room])
+    await session.commit()
+    slots = [
+        TimeSlot(
+            room_id=room.id,
+            slot_date=slot_date,
+            start_time=time(hour, 0),
+            end_time=time(hour + 1, 0),
+        )
+        for slot_date in (DAY, NEXT_DAY)
+        for hour in (9, 10)
+    ]
+    session.add_all(slots)
+    await session.commit()
+    return user, room, slots
+
+
+async def _summary(session: AsyncSession) -> dict[date, int]:
+    rows = await session.exec(select(DaySummary.slot_date, DaySummary.available_count))
+    return dict(rows.all())  # type: ignore[arg-type]
+
+
+async def test_slot_generation_fills_summary(session: AsyncSession):
+    await _seed(session)
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+    assert await get_available_dates(2026, 4, session) == [DAY, NEXT_DAY]
+
+
+async def test_booking_lifecycle_keeps_summary_in_sync(session: AsyncSession):
+    user, room, slots = await _seed(session)
+
+    booking = await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[0].id, slots[1].id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    assert await _summary(session) == {NEXT_DAY: 2}
+    assert await get_available_dates(2026, 4, session) == [NEXT_DAY]
+
+    await process_booking_action(booking.id, "deny", session)
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+
+
+async def test_expired_holds_are_released_in_summary(session: AsyncSession):
+    user, room, slots = await _seed(session)
+    await submit_booking(
+        user=user,
+        room_id=room.id,
+        slot_ids=[slots[2].id],
+        recurrence_freq="none",
+        recurrence_end_date=None,
+        session=session,
+    )
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 1}
+
+    cutoff = datetime.now(timezone.utc) + timedelta(minutes=1)
+    await expire_stale_bookings(cutoff, session)
+
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+
+
+async def test_rolled_back_changes_leave_summary_untouched(session: AsyncSession):
+    _, _, slots = await _seed(session)
+    slots[0].status = TimeslotStatus.BOOKED
+    session.add(slots[0])
+    await session.flush()
+    await session.rollback()
+
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+
+
+async def test_rebuild_repairs_out_of_band_changes(session: AsyncSession):
+    await _seed(session)
+    await session.exec(
+        text("UPDATE timeslot SET status = 'BOOKED' WHERE slot_date = :day").bindparams(
+            day=DAY.isoformat()
+        )
+    )
+    await session.commit()
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+
+    assert await rebuild_day_summary(session) == 1
+    assert await _summary(session) == {NEXT_DAY: 2}
+
+
+async def test_ensure_rebuilds_missing_summary(session: AsyncSession):
+    await _seed(session)
+    await session.exec(text("DELETE FROM daysummary"))
+    await session.commit()
+
+    await ensure_day_summary(session)
+
+    assert await _summary(session) == {DAY: 2, NEXT_DAY: 2}
+
+
+async def test_month_calendar_reads_only_the_summary(engine, session: AsyncSession):
+    await _seed(session)
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        await get_available_dates(2026, 4, session)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    assert len(statements) == 1
+    assert "FROM daysummary" in statements[0]
+    assert "timeslot" not in statements[0]
@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import IdempotencyKey, User, UserRole
+from app.services import idempotency_service
+from app.services.idempotency_service import (
+    IdempotencyInProgressError,
+    IdempotencyKeyReusedError,
+    StoredResponse,
+    claim_key,
+    complete_key,
+    release_key,
+    request_fingerprint,
+)
+
+TTL = timedelta(hours=24)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+async def _create_user(session: AsyncSession) -> User:
+    user = User(email="student@example.com", hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    session.add(user)
+    await session.commit()
+    return user
+
+
+def test_request_fingerprint_ignores_key_order():
+    assert request_fingerprint({"a": 1, "b": [2]}) == request_fingerprint(
+        {"b": [2], "a": 1}
+    )
+    assert request_fingerprint({"a": 1}) != request_fingerprint({"a": 2})
+
+
+async def test_claim_then_complete_replays_stored_response(session: AsyncSession):
+    user = await _create_user(session)
+    fingerprint = request_fingerprint({"slot_ids": [1]})
+
+    assert await claim_key(user.id, "k", fingerprint, TTL, session) is None
+    with pytest.raises(IdempotencyInProgressError):
+        await claim_key(user.id, "k", fingerprint, TTL, session)
+
+    stored = StoredResponse(201, '{"id": 1}')
+    await complete_key(user.id, "k", stored, session)
+
+    assert await claim_key(user.id, "k", fingerprint, TTL, session) == stored
+    with pytest.raises(IdempotencyKeyReusedError):
+        await claim_key(user.id, "k", request_fingerprint({}), TTL, session)
+
+
+async def test_keys_are_scoped_per_user(session: AsyncSession):
+    user = await _create_user(session)
+    other = User(email="other@example.com", hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    session.add(other)
+    await session.commit()
+
+    assert await claim_key(user.id, "k", "a", TTL, session) is None
+    assert await claim_key(other.id, "k", "b", TTL, session) is None
+
+
+async def test_released_key_can_be_claimed_again(session: AsyncSession):
+    user = await _create_user(session)
+
+    claimed_at = datetime.now(timezone.utc)
+    claimed = await claim_key(user.id, "k", "a", TTL, session, claimed_at=claimed_at)
+    assert claimed is None
+    await release_key(user.id, "k", "a", claimed_at, session)
+
+    assert await claim_key(user.id, "k", "a", TTL, session) is None
+
+
+async def test_release_leaves_a_retry_that_took_the_claim_over(session: AsyncSession):
+    user = await _create_user(session)
+    lease = timedelta(seconds=30)
+    first = datetime.now(timezone.utc) - timedelta(minutes=5)
+    assert await claim_key(user.id, "k", "a", TTL, session, lease, first) is None
+    assert await claim_key(user.id, "k", "a", TTL, session, lease) is None
+
+    await release_key(user.id, "k", "a", first, session)
+
+    with pytest.raises(IdempotencyInProgressError):
+        await claim_key(user.id, "k", "a", TTL, session, lease)
+
+
+async def test_abandoned_claim_is_taken_over_after_its_lease(session: AsyncSession):
+    user = await _create_user(session)
+    lease = timedelta(seconds=30)
+    claimed_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+    session.add_all(
+        [
+            IdempotencyKey(
+                userID=user.id, key="stuck", requestHash="a", createdAt=claimed_at
+            ),
+            IdempotencyKey(
+                userID=user.id,
+                key="done",
+                requestHash="a",
+                statusCode=201,
+                responseBody="{}",
+                createdAt=claimed_at,
+            ),
+        ]
+    )
+    await session.commit()
+
+    with pytest.raises(IdempotencyInProgressError):
+        await claim_key(user.id, "stuck", "a", TTL, session, timedelta(minutes=10))
+    assert await claim_key(user.id, "stuck", "a", TTL, session, lease) is None
+    with pytest.raises(IdempotencyInProgressError):
+        await claim_key(user.id, "stuck", "a", TTL, session, lease)
+    assert await claim_key(user.id, "done", "a", TTL, session, lease) == (201, "{}")
+
+
+async def test_complete_keeps_the_response_of_a_later_claim(session: AsyncSession):
+    user = await _create_user(session)
+    assert await claim_key(user.id, "k", "a", TTL, session) is None
+    await complete_key(user.id, "k", StoredResponse(201, "first"), session)
+    await complete_key(user.id, "k", StoredResponse(409, "second"), session)
+
+    assert await claim_key(user.id, "k", "a", TTL, session) == (201, "first")
+
+
+async def test_expired_key_is_taken_over_and_eviction_is_bounded(
+    session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(idempotency_service, "EVICTION_BATCH_SIZE", 2)
+    user = await _create_user(session)
+    expired_at = datetime.now(timezone.utc) - TTL - timedelta(minutes=1)
+    session.add_all(
+        IdempotencyKey(
+            userID=user.id,
+            key=f"old-{index}",
+            requestHash="old",
+            statusCode=201,
+            responseBody="{}",
+            createdAt=expired_at,
+        )
+        for index in range(5)
+    )
+    await session.commit()
+
+    assert await claim_key(user.id, "old-0", "new", TTL, session) is None
+
+    keys = set((await session.exec(select(IdempotencyKey.key))).all())
+    assert "old-0" in keys
+    assert len(keys) == 5 - 2
@@ -2,6 +2,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 
 import pytest
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
@@ -11,8 +12,12 @@ from app.services.notification_service import (
     get_notifications,
     get_unread_count,
     mark_read,
+    mark_read_for_user,
+    peek_unread_count,
     send_notification,
 )
+from app.services.slot_events import publish_reset
+from app.services.unread_counters import UnreadCounters
 
 
 @pytest.fixture
@@ -158,3 +163,114 @@ def test_get_unread_count_reflects_created_and_read_notifications(session: Sessi
     mark_read(first.id, session)
 
     assert get_unread_count(user.id, session) == 1
+
+
+def test_unread_count_is_cached_and_kept_current_by_commits(session: Session):
+    user = _create_user(session)
+    first = send_notification(
+        user_id=user.id,
+        booking_id=20,
+        notification_type="approved",
+        session=session,
+    )
+    assert peek_unread_count(user.id) is None
+
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql),
+    )
+    assert get_unread_count(user.id, session) == 1
+    assert len(statements) == 1 and "count(*)" in statements[0]
+
+    send_notification(
+        user_id=user.id,
+        booking_id=21,
+        notification_type="denied",
+        session=session,
+    )
+    assert peek_unread_count(user.id) == 2
+    mark_read(first.id, session)
+    assert peek_unread_count(user.id) == 1
+
+    session.add(
+        Notification(
+            userID=user.id,
+            bookingID=22,
+            message="rolled back",
+            type=NotificationType.EXPIRED,
+        )
+    )
+    assert get_unread_count(user.id, session) == 1
+    assert session.new
+
+    session.flush()
+    assert get_unread_count(user.id, session) == 2
+    session.rollback()
+    assert get_unread_count(user.id, session) == 1
+
+
+def test_mark_read_for_user_uses_one_update_and_checks_owner(session: Session):
+    owner = _create_user(session)
+    other = _create_user(session)
+    notification = send_notification(
+        user_id=owner.id,
+        booking_id=30,
+        notification_type="approved",
+        session=session,
+    )
+    notification_id, owner_id, other_id = notification.id, owner.id, other.id
+    assert get_unread_count(owner_id, session) == 1
+
+    statements: list[str] = []
+    event.listen(
+        session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql),
+    )
+    with pytest.raises(NotificationNotFoundError):
+        mark_read_for_user(notification_id, other_id, session)
+    session.rollback()
+    statements.clear()
+
+    updated = mark_read_for_user(notification_id, owner_id, session)
+
+    assert updated.id == notification_id and updated.isRead is True
+    assert len(statements) == 1 and statements[0].startswith("UPDATE notification")
+    assert peek_unread_count(owner_id) == 0
+    assert mark_read_for_user(notification_id, owner_id, session).isRead is True
+    assert get_unread_count(owner_id, session) == 0
+
+
+def test_unread_counters_bound_versions_without_accepting_stale_counts():
+    counters = UnreadCounters(capacity=2)
+    user_id = uuid.uuid4()
+    token = counters.token(user_id)
+    counters.apply({user_id: 1})
+    for _ in range(5):
+        counters.apply({uuid.uuid4(): 1})
+
+    counters.put(user_id, 0, token)
+
+    assert len(counters._versions) == 2
+    assert counters.get(user_id) is None
+    counters.put(user_id, 1, counters.token(user_id))
+    assert counters.get(user_id) == 1
+
+
+def test_unread_counters_ignore_slot_resets_but_clear_with_their_table(
+    session: Session,
+):
+    user = _create_user(session)
+    _create_notification(
+        session, user.id, 1, NotificationType.APPROVED, datetime.now(timezone.utc)
+    )
+    assert get_unread_count(user.id, session) == 1
+
+    publish_reset()
+    assert peek_unread_count(user.id) == 1
+
+    SQLModel.metadata.drop_all(session.get_bind())
+    assert peek_unread_count(user.id) is None
+    SQLModel.metadata.create_all(session.get_bind())
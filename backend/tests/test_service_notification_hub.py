@@ -0,0 +1,164 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Notification, NotificationType, User, UserRole
+from app.services.notification_hub import (
+    NotificationHub,
+    NotificationMessage,
+    notification_hub,
+    stream_notifications,
+)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+def _message(message_id: int, user_id) -> NotificationMessage:
+    return NotificationMessage(
+        message_id,
+        user_id,
+        1,
+        f"message {message_id}",
+        NotificationType.APPROVED,
+        False,
+        datetime.now(timezone.utc),
+    )
+
+
+def _replay_from(messages: list[NotificationMessage], calls: list[int]):
+    async def replay(after_id: int) -> list[NotificationMessage]:
+        calls.append(after_id)
+        return [m for m in messages if m.id > after_id]
+
+    return replay
+
+
+async def _take(stream, count: int) -> list:
+    return [await anext(stream) for _ in range(count)]
+
+
+async def test_committed_notifications_reach_only_their_recipient(
+    session: AsyncSession,
+):
+    user = User(email="hub@example.com", hashed_password="hash", role=UserRole.STUDENT)  # type: ignore[arg-type]
+    session.add(user)
+    await session.commit()
+    user_id = user.id
+
+    with notification_hub.subscribe(user_id) as mine, notification_hub.subscribe(
+        uuid.uuid4()
+    ) as other:
+        session.add(
+            Notification(
+                userID=user_id,
+                bookingID=7,
+                message="rolled back",
+                type=NotificationType.DENIED,
+            )
+        )
+        await session.flush()
+        await session.rollback()
+        assert await mine.next(0.01) is None
+
+        notification = Notification(
+            userID=user_id, bookingID=7, message="hi", type=NotificationType.APPROVED
+        )
+        session.add(notification)
+        await session.flush()
+        assert await mine.next(0.01) is None
+
+        await session.commit()
+        delivered = await mine.next(0.1)
+        assert delivered is not None
+        assert (delivered.id, delivered.message) == (notification.id, "hi")
+        assert await other.next(0.01) is None
+    assert notification_hub.connections() == 0
+
+
+async def test_stream_replays_after_id_and_skips_duplicates():
+    hub = NotificationHub()
+    user_id = uuid.uuid4()
+    stored = [_message(i, user_id) for i in (3, 4, 5)]
+    calls: list[int] = []
+    stream = stream_notifications(
+        user_id, 3, _replay_from(stored, calls), 10.0, 10.0, hub
+    )
+
+    assert [m.id for m in await _take(stream, 2)] == [4, 5]
+    hub.publish([stored[2], _message(6, user_id)])
+    assert (await anext(stream)).id == 6
+    assert calls == [3]
+    await stream.aclose()
+    assert hub.connections() == 0
+
+
+async def test_stream_sends_heartbeats_and_ends_after_lifetime():
+    hub = NotificationHub()
+    stream = stream_notifications(
+        uuid.uuid4(), None, _replay_from([], []), 0.02, 0.07, hub
+    )
+
+    items = [item async for item in stream]
+
+    assert items and all(item is None for item in items)
+    assert hub.connections() == 0
+
+
+async def test_lagging_stream_catches_up_from_replay():
+    hub = NotificationHub(queue_size=2)
+    user_id = uuid.uuid4()
+    stored = [_message(i, user_id) for i in range(1, 6)]
+    calls: list[int] = []
+    stream = stream_notifications(
+        user_id, None, _replay_from(stored, calls), 10.0, 10.0, hub
+    )
+    first = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+
+    hub.publish(stored[:1])
+    assert (await first).id == 1
+    hub.publish(stored[1:])
+
+    assert [m.id for m in await _take(stream, 4)] == [2, 3, 4, 5]
+    assert calls == [1]
+    await stream.aclose()
+
+
+async def test_lagged_stream_with_nothing_queued_skips_replay():
+    hub = NotificationHub()
+    user_id = uuid.uuid4()
+    calls: list[int] = []
+    stream = stream_notifications(
+        user_id, None, _replay_from([], calls), 0.02, 10.0, hub
+    )
+    first = asyncio.ensure_future(anext(stream))
+    await asyncio.sleep(0)
+    (subscription,) = hub._subscriptions[user_id]
+    subscription.lagged = True
+
+    assert await first is None
+    hub.publish([_message(1, user_id)])
+    assert (await anext(stream)).id == 1
+    assert calls == []
+    await stream.aclose()
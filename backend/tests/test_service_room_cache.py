@@ -0,0 +1,125 @@
+import json
+from datetime import date, time
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot, TimeslotStatus
+from app.services.room_cache import RoomsCache, rooms_cache
+from app.services.room_service import get_rooms_with_availability_json
+from app.services.slot_events import SlotChange
+
+DAY = date(2026, 5, 1)
+OTHER_DAY = date(2026, 5, 2)
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+def _change(slot_date: date) -> SlotChange:
+    return SlotChange(1, 1, slot_date, time(9, 0), time(10, 0), TimeslotStatus.HELD)
+
+
+def test_cache_evicts_least_recently_used_date():
+    cache = RoomsCache(capacity=2)
+    for day in (1, 2):
+        target = date(2026, 5, day)
+        cache.put(target, b"[]", cache.token(target))
+    cache.get(date(2026, 5, 1))
+
+    third = date(2026, 5, 3)
+    cache.put(third, b"[]", cache.token(third))
+
+    assert cache.get(date(2026, 5, 2)) is None
+    assert cache.get(date(2026, 5, 1)) == b"[]"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (2, 1, 1, 2)
+
+
+def test_cache_invalidates_only_changed_dates():
+    cache = RoomsCache()
+    cache.put(DAY, b"day", cache.token(DAY))
+    cache.put(OTHER_DAY, b"other", cache.token(OTHER_DAY))
+
+    cache.invalidate([_change(DAY), _change(DAY)])
+
+    assert cache.get(DAY) is None
+    assert cache.get(OTHER_DAY) == b"other"
+    assert cache.stats().invalidations == 1
+
+
+def test_cache_discards_payload_built_before_a_change():
+    cache = RoomsCache()
+    token = cache.token(DAY)
+    cache.invalidate([_change(DAY)])
+    cache.put(DAY, b"stale", token)
+
+    reset_token = cache.token(OTHER_DAY)
+    cache.clear()
+    cache.put(OTHER_DAY, b"stale", reset_token)
+
+    assert cache.stats().size == 0
+
+
+def test_cache_bounds_versions_without_accepting_stale_payloads():
+    cache = RoomsCache(capacity=2)
+    token = cache.token(DAY)
+    cache.invalidate([_change(DAY)])
+    for day in range(3, 10):
+        cache.invalidate([_change(date(2026, 5, day))])
+
+    cache.put(DAY, b"stale", token)
+
+    assert len(cache._versions) == 2
+    assert cache.get(DAY) is None
+    cache.put(DAY, b"fresh", cache.token(DAY))
+    assert cache.get(DAY) == b"fresh"
+
+
+async def test_room_listing_is_cached_until_a_slot_on_that_date_changes(
+    session: AsyncSession,
+):
+    room = Room(name="A-203", capacity=25)
+    session.add(room)
+    await session.commit()
+    slot = TimeSlot(
+        room_id=room.id, slot_date=DAY, start_time=time(9, 0), end_time=time(10, 0)
+    )
+    other = TimeSlot(
+        room_id=room.id, slot_date=OTHER_DAY, start_time=time(9, 0), end_time=time(10, 0)
+    )
+    session.add_all([slot, other])
+    await session.commit()
+
+    first = await get_rooms_with_availability_json(DAY, session)
+    await get_rooms_with_availability_json(OTHER_DAY, session)
+    before = rooms_cache.stats()
+    second = await get_rooms_with_availability_json(DAY, session)
+    assert second is first
+    assert rooms_cache.stats().hits == before.hits + 1
+
+    slot.status = TimeslotStatus.BOOKED
+    session.add(slot)
+    await session.commit()
+
+    assert rooms_cache.stats().size == 1
+    refreshed = json.loads(await get_rooms_with_availability_json(DAY, session))
+    assert refreshed[0]["time_slots"][0]["status"] == "booked"
+    assert rooms_cache.stats().misses == before.misses + 1
@@ -0,0 +1,35 @@
+from datetime import date, time, timedelta
+
+from app.models import TimeslotStatus
+from app.services.availability_index import DayAvailability
+from app.services.room_search import earliest_fit
+from app.services.slot_events import SlotChange
+
+DAY = date(2026, 4, 1)
+
+
+def test_earliest_fit_finds_earliest_contiguous_run():
+    statuses = [
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.BOOKED,
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.AVAILABLE,
+        TimeslotStatus.AVAILABLE,
+    ]
+    slots = [
+        SlotChange(hour, 1, DAY, time(hour, 0), time(hour + 1, 0), status)
+        for hour, status in zip(range(8, 13), statuses)
+    ]
+    slots.append(SlotChange(14, 1, DAY, time(14, 0), time(15, 0), statuses[0]))
+    day = DayAvailability(1, DAY, slots)
+
+    assert day.runs() == [(0, 0), (2, 4), (5, 5)]
+    two_hours = timedelta(hours=2)
+    assert earliest_fit(day, two_hours, time.min, time.max) == (2, 3)
+    assert earliest_fit(day, two_hours, time(10, 30), time.max) == (3, 4)
+    assert earliest_fit(day, two_hours, time.min, time(12, 0)) == (2, 3)
+    assert earliest_fit(day, timedelta(hours=4), time.min, time.max) is None
+
+    day.set(3, TimeslotStatus.HELD)
+    assert day.runs() == [(0, 0), (2, 2), (4, 4), (5, 5)]
+    assert earliest_fit(day, two_hours, time.min, time.max) is None
@@ -0,0 +1,141 @@
+import asyncio
+from datetime import date, time
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models import Room, TimeSlot
+from app.services.room_service import (
+    get_available_dates,
+    get_coalescing_stats,
+    get_rooms_with_availability_json,
+)
+from app.services.single_flight import SingleFlight
+
+DAY = date(2026, 4, 1)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield engine
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+
+
+@pytest.fixture
+async def session(engine):
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def _seed(session: AsyncSession) -> None:
+    room = Room(name="A-203", capacity=25)
+    session.add(room)
+    await session.commit()
+    session.add(
+        TimeSlot(
+            room_id=room.id,
+            slot_date=DAY,
+            start_time=time(9, 0),
+            end_time=time(10, 0),
+        )
+    )
+    await session.commit()
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+    calls = 0
+
+    async def query() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 42
+
+    callers = [asyncio.create_task(flight.run("key", query)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == [42] * 5
+    assert calls == 1
+    assert flight.stats() == (1, 4, 0)
+
+
+async def test_errors_reach_every_waiter_and_are_not_kept():
+    flight: SingleFlight[int] = SingleFlight()
+    release = asyncio.Event()
+
+    async def failing() -> int:
+        await release.wait()
+        raise RuntimeError("boom")
+
+    callers = [asyncio.create_task(flight.run("key", failing)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert await flight.run("key", lambda: asyncio.sleep(0, result=7)) == 7
+
+
+async def test_follower_takes_over_when_leader_is_cancelled():
+    flight: SingleFlight[str] = SingleFlight()
+    started = asyncio.Event()
+
+    async def slow() -> str:
+        started.set()
+        await asyncio.sleep(10)
+        return "leader"
+
+    leader = asyncio.create_task(flight.run("key", slow))
+    await started.wait()
+    follower = asyncio.create_task(
+        flight.run("key", lambda: asyncio.sleep(0, result="follower"))
+    )
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "follower"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+async def test_concurrent_room_reads_run_one_query(engine, session: AsyncSession):
+    await _seed(session)
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    before = get_coalescing_stats()
+    event.listen(engine.sync_engine, "before_cursor_execute", _record)
+    try:
+        dates = await asyncio.gather(
+            *(get_available_dates(2026, 4, session) for _ in range(10))
+        )
+        listings = await asyncio.gather(
+            *(get_rooms_with_availability_json(DAY, session) for _ in range(10))
+        )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", _record)
+
+    assert dates == [[DAY]] * 10
+    assert len(set(listings)) == 1
+    assert sum("FROM daysummary" in statement for statement in statements) == 1
+    assert sum("FROM timeslot" in statement for statement in statements) == 1
+    after = get_coalescing_stats()
+    assert after["dates"].coalesced - before["dates"].coalesced == 9
+    assert after["rooms"].coalesced - before["rooms"].coalesced == 9
@@ -20,16 +20,24 @@ export function setOnUnauthorized(fn: () => void) {
   onUnauthorized = fn;
 }
 
-export async function apiFetch<T = unknown>(
-  path: string,
-  options: RequestInit = {},
-): Promise<T> {
-  const headers = new Headers(options.headers);
+/** Returns `init` plus the Bearer token header when a user is signed in. */
+export function authHeaders(init?: HeadersInit): Headers {
+  const headers = new Headers(init);
 
   const token = getToken?.();
   if (token) {
     headers.set("Authorization", `Bearer ${token}`);
   }
+  return headers;
+}
+
+/** Runs the `onUnauthorized` hook for requests made outside `apiFetch`. */
+export function notifyUnauthorized() {
+  onUnauthorized?.();
+}
+
+async function send(path: string, options: RequestInit): Promise<Response> {
+  const headers = authHeaders(options.headers);
 
   const response = await fetch(path, {
     ...options,
@@ -37,7 +45,7 @@ export async function apiFetch<T = unknown>(
   });
 
   if (response.status === 401) {
-    onUnauthorized?.();
+    notifyUnauthorized();
   }
 
   if (!response.ok) {
@@ -54,6 +62,14 @@ export async function apiFetch<T = unknown>(
         : JSON.stringify(errorDetail),
     );
   }
+  return response;
+}
+
+export async function apiFetch<T = unknown>(
+  path: string,
+  options: RequestInit = {},
+): Promise<T> {
+  const response = await send(path, options);
 
   // Check if the response has content before parsing JSON
   const contentType = response.headers.get("content-type");
@@ -63,3 +79,30 @@ export async function apiFetch<T = unknown>(
 
   return null as T;
 }
+
+export interface Page<T> {
+  items: T[];
+  /** Pass back as `cursor` to read the next page; `null` on the last page. */
+  nextCursor: string | null;
+}
+
+/**
+ * Fetches one page of a keyset-paginated listing, which returns a JSON list
+ * and the cursor of the following page in the `X-Next-Cursor` header.
+ */
+export async function apiFetchPage<T = unknown>(
+  path: string,
+  cursor: string | null = null,
+  options: RequestInit = {},
+): Promise<Page<T>> {
+  if (cursor) {
+    const separator = path.includes("?") ? "&" : "?";
+    path = `${path}${separator}cursor=${encodeURIComponent(cursor)}`;
+  }
+
+  const response = await send(path, options);
+  return {
+    items: (await response.json()) as T[],
+    nextCursor: response.headers.get("X-Next-Cursor"),
+  };
+}
@@ -0,0 +1,127 @@
+/**
+ * Notification stream client.
+ *
+ * Reads the server-sent events of `GET /api/notifications/stream` through
+ * `fetch`, because `EventSource` cannot send the Bearer token. One stream is
+ * shared by every listener in the tab. When the server closes the stream or
+ * the network drops, it reconnects with `Last-Event-ID` so missed
+ * notifications are replayed and none is delivered twice. The auth state
+ * calls `restartNotifications` whenever the token changes, so the stream
+ * never outlives the session it was opened for.
+ */
+
+import { authHeaders, notifyUnauthorized } from "$lib/api";
+
+export interface NotificationEvent {
+  id: number;
+  userID: string;
+  bookingID: number;
+  message: string;
+  type: "approved" | "denied" | "cancelled" | "expired";
+  isRead: boolean;
+  createdAt: string;
+}
+
+type Listener = (notification: NotificationEvent) => void;
+
+const listeners = new Set<Listener>();
+let controller: AbortController | null = null;
+let lastEventId: string | null = null;
+let streamUser: string | null = null;
+let retryMs = 3000;
+
+/**
+ * Calls `listener` for every new notification of the signed-in user.
+ * Returns a function that removes the listener; the stream closes once no
+ * listener is left.
+ */
+export function onNotification(listener: Listener): () => void {
+  listeners.add(listener);
+  if (!controller) start();
+  return () => {
+    listeners.delete(listener);
+    if (listeners.size === 0) {
+      controller?.abort();
+      controller = null;
+    }
+  };
+}
+
+/**
+ * Closes the current stream and, if anyone is still listening, opens a new
+ * one with the current token. Call it on login, logout and token changes.
+ */
+export function restartNotifications() {
+  controller?.abort();
+  controller = null;
+  if (listeners.size > 0) start();
+}
+
+function start() {
+  controller = new AbortController();
+  run(controller.signal);
+}
+
+async function run(signal: AbortSignal) {
+  while (!signal.aborted) {
+    try {
+      // Signed out: stop until `restartNotifications` runs with a token.
+      if (!(await readStream(signal))) return;
+    } catch {
+      // Network errors and aborts end this attempt; retry below.
+    }
+    await new Promise((resolve) => setTimeout(resolve, retryMs));
+  }
+}
+
+/** Reads one connection; returns false once there is no valid token to send. */
+async function readStream(signal: AbortSignal): Promise<boolean> {
+  const headers = authHeaders();
+  const authorization = headers.get("Authorization");
+  if (!authorization) return false;
+
+  // Ids are shared by all users, so never resume another user's stream.
+  if (authorization !== streamUser) {
+    streamUser = authorization;
+    lastEventId = null;
+  }
+  if (lastEventId) headers.set("Last-Event-ID", lastEventId);
+
+  const response = await fetch("/api/notifications/stream", {
+    headers,
+    signal,
+  });
+  if (response.status === 401) {
+    notifyUnauthorized();
+    return false;
+  }
+  if (!response.ok || !response.body) return true;
+
+  const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return true;
+    buffer += value;
+    let end: number;
+    while ((end = buffer.indexOf("\n\n")) >= 0) {
+      dispatch(buffer.slice(0, end));
+      buffer = buffer.slice(end + 2);
+    }
+  }
+}
+
+function dispatch(block: string) {
+  let id: string | null = null;
+  let data = "";
+  for (const line of block.split("\n")) {
+    if (line.startsWith("id: ")) id = line.slice(4);
+    else if (line.startsWith("data: ")) data += line.slice(6);
+    else if (line.startsWith("retry: ")) retryMs = Number(line.slice(7)) || retryMs;
+  }
+  if (!data) return;
+  if (id) lastEventId = id;
+
+  const notification = JSON.parse(data) as NotificationEvent;
+  for (const listener of listeners) listener(notification);
+}
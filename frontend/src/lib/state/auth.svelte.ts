@@ -1,6 +1,7 @@
 import { goto } from "$app/navigation";
 import { browser } from "$app/environment";
 import { apiFetch, setTokenGetter, setOnUnauthorized } from "$lib/api";
+import { restartNotifications } from "$lib/notifications";
 
 export interface User {
   id: string;
@@ -39,8 +40,12 @@ class AuthState {
     }
   }
 
-  /** Sync token to both reactive state and localStorage. */
+  /**
+   * Sync token to both reactive state and localStorage, and reopen the
+   * notification stream so it never runs with a stale token.
+   */
   private set token(value: string | null) {
+    const changed = value !== this.#token;
     this.#token = value;
     if (browser) {
       if (value) {
@@ -48,6 +53,7 @@ class AuthState {
       } else {
         localStorage.removeItem("token");
       }
+      if (changed) restartNotifications();
     }
   }
 